@@ -1,5 +1,8 @@
 from django.contrib import admin
 from django.utils.html import format_html
+
+from users.estatisticas import ajustar_concluidas
+
 from .models import (
     Semestre, Materia, MaterialDidatico, 
     EventoAgenda, Tarefa, AcessoMateria, HorarioAula
@@ -136,11 +139,13 @@ class TarefaAdmin(admin.ModelAdmin):
     get_status_prazo.short_description = 'Status do Prazo'
     
     def marcar_como_concluida(self, request, queryset):
+        ajustar_concluidas(queryset.exclude(status='CONCLUIDA'), 1)
         updated = queryset.update(status='CONCLUIDA')
         self.message_user(request, f'{updated} tarefa(s) marcada(s) como concluída(s).')
     marcar_como_concluida.short_description = "Marcar como concluída"
     
     def marcar_como_pendente(self, request, queryset):
+        ajustar_concluidas(queryset.filter(status='CONCLUIDA'), -1)
         updated = queryset.update(status='PENDENTE')
         self.message_user(request, f'{updated} tarefa(s) marcada(s) como pendente(s).')
     marcar_como_pendente.short_description = "Marcar como pendente"
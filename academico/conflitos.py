@@ -0,0 +1,266 @@
+"""
+Detecção de conflitos de horário em memória.
+
+A base é uma árvore de intervalos (ArvoreIntervalos) montada a partir de
+uma única consulta ao banco. Sobre ela há dois índices:
+
+- GradeHorarios: os horários de aula semanais que valem num semestre,
+  por dia da semana, usados pelo HorarioAulaForm, pelo formset de horários
+  da matéria e pela importação em lote;
+- IndiceSemana: horários de aula e eventos do calendário (com
+  recorrências expandidas) de uma semana concreta, usados na página
+  "conflitos da semana" e no aviso ao criar eventos.
+
+itens_do_periodo() também alimenta o planejador de estudos
+(calendario.planejamento) com os horários ocupados.
+
+Verificar um intervalo custa O(log n + k), onde k é o número de itens
+sobrepostos encontrados.
+"""
+
+import heapq
+from datetime import datetime, time, timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import HorarioAula
+
+
+class ArvoreIntervalos:
+    """
+    Árvore de intervalos [inicio, fim) implícita sobre um vetor ordenado.
+
+    O vetor ordenado pelo início é visto como uma árvore binária
+    balanceada (o meio de cada faixa é a raiz) e cada nó guarda o maior
+    fim da sua subárvore, o que permite descartar subárvores inteiras na
+    consulta. Inserções vão para um buffer pequeno, varrido linearmente e
+    incorporado à árvore quando passa de LIMITE_BUFFER itens.
+    """
+
+    LIMITE_BUFFER = 32
+
+    def __init__(self, intervalos=()):
+        self._ordenados = list(intervalos)
+        self._buffer = []
+        self._reconstruir()
+
+    def __len__(self):
+        return len(self._ordenados) + len(self._buffer)
+
+    def __iter__(self):
+        return iter(self._ordenados + self._buffer)
+
+    def _reconstruir(self):
+        self._ordenados.extend(self._buffer)
+        self._buffer = []
+        self._ordenados.sort(key=lambda intervalo: (intervalo[0], intervalo[1]))
+        self._maximos = [None] * len(self._ordenados)
+
+        def montar(inicio, fim):
+            if inicio >= fim:
+                return None
+            meio = (inicio + fim) // 2
+            maior = self._ordenados[meio][1]
+            for sub in (montar(inicio, meio), montar(meio + 1, fim)):
+                if sub is not None and sub > maior:
+                    maior = sub
+            self._maximos[meio] = maior
+            return maior
+
+        montar(0, len(self._ordenados))
+
+    def adicionar(self, inicio, fim, item):
+        self._buffer.append((inicio, fim, item))
+        if len(self._buffer) > self.LIMITE_BUFFER:
+            self._reconstruir()
+
+    def sobrepostos(self, inicio, fim):
+        """Itens cujos intervalos se sobrepõem a [inicio, fim), na ordem de início."""
+        achados = []
+        pilha = [(0, len(self._ordenados))]
+        while pilha:
+            esquerda, direita = pilha.pop()
+            if esquerda >= direita:
+                continue
+            meio = (esquerda + direita) // 2
+            if self._maximos[meio] <= inicio:
+                continue  # nada nesta subárvore termina depois de `inicio`
+            comeco, termino, item = self._ordenados[meio]
+            if comeco < fim:
+                if termino > inicio:
+                    achados.append((comeco, item))
+                pilha.append((meio + 1, direita))
+            pilha.append((esquerda, meio))
+
+        achados.sort(key=lambda achado: achado[0])
+        resultado = [item for _, item in achados]
+        resultado.extend(item for comeco, termino, item in self._buffer if comeco < fim and termino > inicio)
+        return resultado
+
+
+def pares_sobrepostos(intervalos):
+    """
+    Todos os pares de itens sobrepostos entre si (varredura pelo início,
+    com um heap dos intervalos ainda abertos): O(n log n + k).
+    """
+    pares = []
+    abertos = []  # (fim, ordem, item)
+    for ordem, (inicio, fim, item) in enumerate(sorted(intervalos, key=lambda i: (i[0], i[1]))):
+        while abertos and abertos[0][0] <= inicio:
+            heapq.heappop(abertos)
+        pares.extend((aberto, item) for _, _, aberto in abertos)
+        heapq.heappush(abertos, (fim, ordem, item))
+    return pares
+
+
+class GradeHorarios:
+    """Horários de aula semanais de um usuário, indexados por dia da semana."""
+
+    def __init__(self, horarios=()):
+        por_dia = {dia: [] for dia, _ in HorarioAula.DIAS_SEMANA}
+        for horario in horarios:
+            por_dia[horario.dia_semana].append((horario.hora_inicio, horario.hora_fim, horario))
+        self.dias = {dia: ArvoreIntervalos(intervalos) for dia, intervalos in por_dia.items()}
+
+    @classmethod
+    def do_semestre(cls, semestre):
+        """
+        Carrega, numa única consulta, os horários ativos que valem junto com
+        os de `semestre`: matérias e semestres ativos do mesmo usuário cujo
+        período se sobrepõe ao dele. Semestres de outros períodos (como a
+        origem de uma virada) não entram.
+        """
+        horarios = HorarioAula.objects.filter(
+            ativo=True,
+            materia__ativo=True,
+            materia__semestre__ativo=True,
+            materia__semestre__usuario_id=semestre.usuario_id,
+            materia__semestre__data_inicio__lte=semestre.data_fim,
+            materia__semestre__data_fim__gte=semestre.data_inicio,
+        ).select_related('materia')
+        return cls(horarios)
+
+    def conflitos(self, horario):
+        """Horários já indexados que se sobrepõem a `horario` (exceto ele mesmo)."""
+        return [
+            outro for outro in self.dias[horario.dia_semana].sobrepostos(horario.hora_inicio, horario.hora_fim)
+            if outro is not horario and (horario.pk is None or outro.pk != horario.pk)
+        ]
+
+    def conflito(self, horario):
+        """Primeiro horário conflitante, ou None."""
+        conflitos = self.conflitos(horario)
+        return conflitos[0] if conflitos else None
+
+    def adicionar(self, horario):
+        self.dias[horario.dia_semana].adicionar(horario.hora_inicio, horario.hora_fim, horario)
+
+    def verificar_lote(self, horarios):
+        """
+        Verifica um lote de horários novos contra a grade e entre si.
+        Retorna {posição no lote: [conflitos]} apenas para os que conflitam
+        (posições porque horários ainda não salvos não são hasheáveis).
+        """
+        resultado = {}
+        for posicao, horario in enumerate(horarios):
+            conflitos = self.conflitos(horario)
+            if conflitos:
+                resultado[posicao] = conflitos
+        for dia in self.dias:
+            novos = [(h.hora_inicio, h.hora_fim, posicao) for posicao, h in enumerate(horarios) if h.dia_semana == dia]
+            for primeiro, segundo in pares_sobrepostos(novos):
+                resultado.setdefault(primeiro, []).append(horarios[segundo])
+                resultado.setdefault(segundo, []).append(horarios[primeiro])
+        return resultado
+
+
+class ItemSemana:
+    """Um horário de aula ou evento posicionado numa data da semana."""
+
+    __slots__ = ('inicio', 'fim', 'tipo', 'titulo', 'objeto')
+
+    def __init__(self, inicio, fim, tipo, titulo, objeto):
+        self.inicio = inicio
+        self.fim = fim
+        self.tipo = tipo  # 'horario' ou 'evento'
+        self.titulo = titulo
+        self.objeto = objeto
+
+    def __repr__(self):
+        return f'<ItemSemana {self.tipo} {self.titulo} {timezone.localtime(self.inicio):%d/%m %H:%M}>'
+
+
+def itens_do_periodo(usuario, inicio, fim):
+    """
+    Aulas (dentro das datas do semestre) e eventos do calendário do
+    usuário, com recorrências expandidas, que começam em [inicio, fim).
+    Duas consultas, independentemente do tamanho do período.
+    """
+    from calendario.models import EventoCalendario
+    from calendario.recorrencia import ocorrencias, ocorrencias_horario
+
+    primeiro_dia = timezone.localdate(inicio)
+    ultimo_dia = timezone.localdate(fim - timedelta(microseconds=1))
+    itens = []
+
+    horarios = HorarioAula.objects.filter(
+        ativo=True,
+        materia__ativo=True,
+        materia__semestre__usuario=usuario,
+        materia__semestre__data_inicio__lte=ultimo_dia,
+        materia__semestre__data_fim__gte=primeiro_dia,
+    ).select_related('materia__semestre')
+    for horario in horarios:
+        semestre = horario.materia.semestre
+        for comeco, termino in ocorrencias_horario(horario, inicio, fim):
+            if semestre.data_inicio <= timezone.localdate(comeco) <= semestre.data_fim:
+                itens.append(ItemSemana(comeco, termino, 'horario', horario.materia.nome, horario))
+
+    eventos = EventoCalendario.objects.filter(usuario=usuario, data_inicio__lt=fim).filter(
+        Q(recorrencia__isnull=True, data_fim__gt=inicio)
+        | Q(recorrencia__isnull=False, recorrencia__data_fim_recorrencia__isnull=True)
+        | Q(recorrencia__data_fim_recorrencia__gte=primeiro_dia)
+    ).select_related('materia', 'recorrencia')
+    for evento in eventos:
+        recorrencia = getattr(evento, 'recorrencia', None)
+        if recorrencia is None:
+            itens.append(ItemSemana(evento.data_inicio, evento.data_fim, 'evento', evento.titulo, evento))
+            continue
+        for comeco, termino in ocorrencias(evento, recorrencia, inicio - (evento.data_fim - evento.data_inicio), fim):
+            itens.append(ItemSemana(comeco, termino, 'evento', evento.titulo, evento))
+
+    return itens
+
+
+class IndiceSemana:
+    """Horários de aula e eventos do calendário de um usuário numa semana."""
+
+    def __init__(self, inicio_semana, itens):
+        self.inicio_semana = inicio_semana
+        self.fim_semana = inicio_semana + timedelta(days=7)
+        self.itens = sorted(itens, key=lambda item: (item.inicio, item.fim))
+        self.arvore = ArvoreIntervalos((item.inicio, item.fim, item) for item in self.itens)
+
+    @staticmethod
+    def segunda_feira(data):
+        return data - timedelta(days=data.weekday())
+
+    @classmethod
+    def do_usuario(cls, usuario, data):
+        """Monta o índice da semana (segunda a domingo) que contém `data`."""
+        segunda = cls.segunda_feira(data)
+        inicio = timezone.make_aware(datetime.combine(segunda, time.min))
+        fim = timezone.make_aware(datetime.combine(segunda + timedelta(days=7), time.min))
+        return cls(segunda, itens_do_periodo(usuario, inicio, fim))
+
+    def sobrepostos(self, inicio, fim, ignorar=None):
+        """Itens da semana sobrepostos a [inicio, fim), exceto os do objeto `ignorar`."""
+        return [
+            item for item in self.arvore.sobrepostos(inicio, fim)
+            if ignorar is None or item.objeto != ignorar
+        ]
+
+    def conflitos(self):
+        """Pares (item, item) que se sobrepõem dentro da semana."""
+        return pares_sobrepostos((item.inicio, item.fim, item) for item in self.itens)
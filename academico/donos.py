@@ -0,0 +1,63 @@
+"""
+Dono (usuario_id) de semestres e matérias, resolvido uma vez por exclusão.
+
+Na exclusão em cascata de um usuário, semestre ou matéria o Django dispara
+post_delete para cada linha dependente, todas com o mesmo `origin` (a
+instância ou o queryset que começou a exclusão). Os sinais que precisam do
+dono de uma matéria ou de um semestre passam esse origin: se ele já
+identifica o dono (usuário, semestre ou matéria) nenhuma linha faz
+consulta; senão cada semestre/matéria é consultado uma vez por exclusão.
+Fora de exclusões (origin None) é uma consulta simples.
+"""
+
+from .models import Materia, Semestre, User
+
+# Memória por exclusão, guardada no próprio origin (vive só durante ela)
+MEMORIA = '_donos_exclusao'
+
+
+def memoria(origin):
+    """Dicionário associado à exclusão `origin` (None fora de exclusões)."""
+    if origin is None or not hasattr(origin, '__dict__'):
+        return None
+    return origin.__dict__.setdefault(MEMORIA, {})
+
+
+def _resolver(origin, chave, consulta):
+    lembrados = memoria(origin)
+    if lembrados is None:
+        return consulta()
+    if chave not in lembrados:
+        lembrados[chave] = consulta()
+    return lembrados[chave]
+
+
+def _do_semestre(origin, semestre_id):
+    return _resolver(origin, ('semestre', semestre_id), lambda: (
+        Semestre.objects.filter(pk=semestre_id).values_list('usuario_id', flat=True).first()
+    ))
+
+
+def dono_da_origem(origin):
+    """Dono de tudo que a exclusão `origin` remove, se ela parte de um único dono."""
+    if isinstance(origin, User):
+        return origin.pk
+    if isinstance(origin, Semestre):
+        return origin.usuario_id
+    if isinstance(origin, Materia):
+        return _do_semestre(origin, origin.semestre_id)
+    return None
+
+
+def dono_semestre(semestre_id, origin=None):
+    dono = dono_da_origem(origin)
+    return dono if dono is not None else _do_semestre(origin, semestre_id)
+
+
+def dono_materia(materia_id, origin=None):
+    dono = dono_da_origem(origin)
+    if dono is not None:
+        return dono
+    return _resolver(origin, ('materia', materia_id), lambda: (
+        Materia.objects.filter(pk=materia_id).values_list('semestre__usuario_id', flat=True).first()
+    ))
@@ -5,8 +5,10 @@ Formulários para o app acadêmico.
 from django import forms
 from django.core.exceptions import ValidationError
 from django.utils import timezone
-from django.utils.text import slugify
 from .models import Materia, MaterialDidatico, EventoAgenda, Tarefa, Semestre, HorarioAula, HorarioAula
+from . import opcoes
+from .opcoes import aplicar_escolhas
+from .slugs import proximo_slug, salvar_materia
 import os
 
 
@@ -281,6 +283,7 @@ class MateriaForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
         # Mostrar apenas semestres ativos
         self.fields['semestre'].queryset = Semestre.objects.filter(ativo=True)
+        aplicar_escolhas(self.fields['semestre'], opcoes.semestres())
         self.fields['descricao'].required = False
     
     def clean_nome(self):
@@ -307,20 +310,11 @@ class MateriaForm(forms.ModelForm):
     def save(self, commit=True):
         instance = super().save(commit=False)
         
-        # Gerar slug único se não existe
-        if not instance.slug:
-            base_slug = slugify(instance.nome)
-            slug = base_slug
-            counter = 1
-            
-            while Materia.objects.filter(slug=slug).exclude(pk=instance.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            
-            instance.slug = slug
-        
+        # Gerar slug único se não existe (ver academico.slugs)
         if commit:
-            instance.save()
+            salvar_materia(instance)
+        elif not instance.slug:
+            instance.slug = proximo_slug(instance.nome, instance.pk)
         
         return instance
 
@@ -361,6 +355,12 @@ class HorarioAulaForm(forms.ModelForm):
             'observacoes': 'Observações'
         }
     
+    def __init__(self, *args, materia=None, **kwargs):
+        # Com a matéria informada, o clean() também verifica conflitos
+        # com os horários do semestre dela (academico.conflitos).
+        self.materia = materia
+        super().__init__(*args, **kwargs)
+    
     def clean(self):
         cleaned_data = super().clean()
         hora_inicio = cleaned_data.get('hora_inicio')
@@ -378,15 +378,87 @@ class HorarioAulaForm(forms.ModelForm):
             
             if duracao > timedelta(hours=8):
                 raise ValidationError('A aula não pode durar mais de 8 horas.')
+            
+            dia_semana = cleaned_data.get('dia_semana')
+            if self.materia is not None and dia_semana is not None:
+                from .conflitos import GradeHorarios
+                
+                candidato = HorarioAula(
+                    pk=self.instance.pk,
+                    materia=self.materia,
+                    dia_semana=dia_semana,
+                    hora_inicio=hora_inicio,
+                    hora_fim=hora_fim,
+                )
+                conflitos = GradeHorarios.do_semestre(self.materia.semestre).conflitos(candidato)
+                if conflitos:
+                    raise ValidationError(
+                        'Conflita com: ' + '; '.join(
+                            f'{c.materia.nome} ({c.hora_inicio:%H:%M}–{c.hora_fim:%H:%M})' for c in conflitos
+                        )
+                    )
         
         return cleaned_data
 
 
+class BaseHorarioAulaFormSet(forms.BaseInlineFormSet):
+    """
+    Horários de uma matéria editados juntos. Com o semestre informado (o
+    escolhido no formulário da matéria, que na criação ainda não existe),
+    o clean() carrega a grade do semestre uma vez e verifica todas as
+    linhas contra ela e entre si (GradeHorarios.verificar_lote).
+    """
+    
+    def __init__(self, *args, semestre=None, **kwargs):
+        self.semestre = semestre
+        super().__init__(*args, **kwargs)
+    
+    def clean(self):
+        super().clean()
+        if self.semestre is None or any(self.errors):
+            return
+        from .conflitos import GradeHorarios
+        
+        materia = self.instance if self.instance.pk else None
+        removidos, horarios, forms_horarios = set(), [], []
+        for form in self.forms:
+            if self.can_delete and self._should_delete_form(form):
+                if form.instance.pk:
+                    removidos.add(form.instance.pk)
+                continue
+            dados = form.cleaned_data
+            if not all(dados.get(campo) is not None for campo in ('dia_semana', 'hora_inicio', 'hora_fim')):
+                continue  # linha extra deixada em branco
+            horarios.append(HorarioAula(
+                pk=form.instance.pk,
+                materia=materia,
+                dia_semana=dados['dia_semana'],
+                hora_inicio=dados['hora_inicio'],
+                hora_fim=dados['hora_fim'],
+            ))
+            forms_horarios.append(form)
+        
+        conflitos_lote = GradeHorarios.do_semestre(self.semestre).verificar_lote(horarios)
+        for posicao, conflitos in sorted(conflitos_lote.items()):
+            conflitos = [c for c in conflitos if c.pk is None or c.pk not in removidos]
+            if conflitos:
+                forms_horarios[posicao].add_error(None, 'Conflita com: ' + '; '.join(
+                    f'{self._nome(c, horarios)} ({c.hora_inicio:%H:%M}–{c.hora_fim:%H:%M})' for c in conflitos
+                ))
+    
+    @staticmethod
+    def _nome(horario, lote):
+        if any(horario is outro for outro in lote):
+            return 'outro horário desta matéria'
+        return horario.materia.nome
+
+
 # FormSet para gerenciar múltiplos horários de uma vez
 HorarioAulaFormSet = forms.inlineformset_factory(
     Materia, 
     HorarioAula,
     form=HorarioAulaForm,
+    formset=BaseHorarioAulaFormSet,
     extra=2,  # Começar com 2 horários vazios
     can_delete=True,
     min_num=0,
@@ -427,6 +499,7 @@ class MateriaComHorariosForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
         # Mostrar apenas semestres ativos
         self.fields['semestre'].queryset = Semestre.objects.filter(ativo=True)
+        aplicar_escolhas(self.fields['semestre'], opcoes.semestres())
         self.fields['descricao'].required = False
     
     def clean_nome(self):
@@ -453,19 +526,10 @@ class MateriaComHorariosForm(forms.ModelForm):
     def save(self, commit=True):
         instance = super().save(commit=False)
         
-        # Gerar slug único se não existe
-        if not instance.slug:
-            base_slug = slugify(instance.nome)
-            slug = base_slug
-            counter = 1
-            
-            while Materia.objects.filter(slug=slug).exclude(pk=instance.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            
-            instance.slug = slug
-        
+        # Gerar slug único se não existe (ver academico.slugs)
         if commit:
-            instance.save()
+            salvar_materia(instance)
+        elif not instance.slug:
+            instance.slug = proximo_slug(instance.nome, instance.pk)
         
         return instance
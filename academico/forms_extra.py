@@ -5,8 +5,10 @@ Formulários adicionais para o app acadêmico.
 from django import forms
 from django.core.exceptions import ValidationError
 from django.utils import timezone
-from django.utils.text import slugify
 from .models import Materia, Semestre
+from . import opcoes
+from .opcoes import aplicar_escolhas
+from .slugs import proximo_slug, salvar_materia
 import os
 
 
@@ -44,6 +46,7 @@ class MateriaForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
         # Mostrar apenas semestres ativos
         self.fields['semestre'].queryset = Semestre.objects.filter(ativo=True)
+        aplicar_escolhas(self.fields['semestre'], opcoes.semestres())
         self.fields['descricao'].required = False
     
     def clean_nome(self):
@@ -70,20 +73,11 @@ class MateriaForm(forms.ModelForm):
     def save(self, commit=True):
         instance = super().save(commit=False)
         
-        # Gerar slug único se não existe
-        if not instance.slug:
-            base_slug = slugify(instance.nome)
-            slug = base_slug
-            counter = 1
-            
-            while Materia.objects.filter(slug=slug).exclude(pk=instance.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            
-            instance.slug = slug
-        
+        # Gerar slug único se não existe (ver academico.slugs)
         if commit:
-            instance.save()
+            salvar_materia(instance)
+        elif not instance.slug:
+            instance.slug = proximo_slug(instance.nome, instance.pk)
         
         return instance
 
@@ -146,3 +140,50 @@ class SemestreForm(forms.ModelForm):
                 raise ValidationError('Já existe um semestre para este ano e período.')
         
         return cleaned_data
+
+
+class VirarSemestreForm(forms.Form):
+    """Dados do novo semestre na virada (academico.virada)."""
+    
+    nome = forms.CharField(
+        label='Nome do Novo Semestre',
+        max_length=100,
+        widget=forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Ex: Semestre 2025.2'})
+    )
+    ano = forms.IntegerField(
+        label='Ano',
+        widget=forms.NumberInput(attrs={'class': 'form-control', 'min': 2020, 'max': 2030})
+    )
+    periodo = forms.ChoiceField(
+        label='Período',
+        choices=Semestre.PERIODO_CHOICES,
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    data_inicio = forms.DateField(
+        label='Data de Início',
+        widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'})
+    )
+    data_fim = forms.DateField(
+        label='Data de Término',
+        widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'})
+    )
+    eventos = forms.BooleanField(
+        label='Copiar também os eventos recorrentes das matérias',
+        required=False,
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
+    )
+    desativar_origem = forms.BooleanField(
+        label='Desativar o semestre atual depois da cópia',
+        required=False,
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
+    )
+    
+    def clean(self):
+        cleaned_data = super().clean()
+        data_inicio = cleaned_data.get('data_inicio')
+        data_fim = cleaned_data.get('data_fim')
+        
+        if data_inicio and data_fim and data_fim <= data_inicio:
+            raise ValidationError('A data de término deve ser posterior à data de início.')
+        
+        return cleaned_data
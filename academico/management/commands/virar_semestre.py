@@ -0,0 +1,93 @@
+"""
+Management command para a virada de semestre: copia as matérias, os
+horários de aula e, com --eventos, as séries recorrentes de eventos
+para um novo semestre (academico.virada).
+
+A origem é um semestre (--semestre) ou todos os semestres ativos de um
+ano/período (--ano/--periodo), o que vira a instituição inteira de uma
+vez, numa única transação.
+
+Exemplos:
+    python manage.py virar_semestre --semestre 12 2026 2 2026-08-03 2026-12-18
+    python manage.py virar_semestre --ano 2026 --periodo 1 2026 2 2026-08-03 2026-12-18 --eventos --desativar-origem
+    python manage.py virar_semestre --ano 2026 --periodo 1 2026 2 2026-08-03 2026-12-18 --simular
+"""
+
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from academico.models import Semestre
+from academico.virada import ErroVirada, virar_semestres
+
+PERIODOS = [valor for valor, _ in Semestre.PERIODO_CHOICES]
+
+
+class Simulacao(Exception):
+    """Desfaz a transação no modo --simular."""
+
+
+class Command(BaseCommand):
+    help = 'Copia matérias, horários e eventos recorrentes para um novo semestre'
+
+    def add_arguments(self, parser):
+        parser.add_argument('novo_ano', type=int)
+        parser.add_argument('novo_periodo', choices=PERIODOS)
+        parser.add_argument('inicio', type=date.fromisoformat, help='Início do novo semestre (AAAA-MM-DD)')
+        parser.add_argument('fim', type=date.fromisoformat, help='Término do novo semestre (AAAA-MM-DD)')
+        parser.add_argument('--semestre', type=int, action='append', help='Id do semestre de origem (repetível)')
+        parser.add_argument('--ano', type=int, help='Origem: todos os semestres ativos deste ano...')
+        parser.add_argument('--periodo', choices=PERIODOS, help='...e deste período')
+        parser.add_argument('--nome', help='Nome dos novos semestres (padrão: "ANO.PERIODO")')
+        parser.add_argument('--eventos', action='store_true', help='Copia também as séries de eventos recorrentes')
+        parser.add_argument('--desativar-origem', action='store_true', help='Desativa os semestres de origem')
+        parser.add_argument('--simular', action='store_true', help='Executa e desfaz, sem gravar nada')
+
+    def handle(self, *args, **options):
+        if options['fim'] <= options['inicio']:
+            raise CommandError('O término deve ser posterior ao início.')
+        if options['semestre']:
+            origens = Semestre.objects.filter(pk__in=options['semestre'])
+        elif options['ano'] and options['periodo']:
+            origens = Semestre.objects.filter(ano=options['ano'], periodo=options['periodo'], ativo=True)
+        else:
+            raise CommandError('Informe --semestre ou --ano e --periodo.')
+        origens = list(origens)
+        if not origens:
+            raise CommandError('Nenhum semestre de origem encontrado.')
+
+        inicio = time.perf_counter()
+        try:
+            with transaction.atomic():
+                resultado = virar_semestres(
+                    origens,
+                    options['novo_ano'],
+                    options['novo_periodo'],
+                    options['inicio'],
+                    options['fim'],
+                    nome=options['nome'],
+                    eventos=options['eventos'],
+                    desativar_origem=options['desativar_origem'],
+                )
+                if options['simular']:
+                    raise Simulacao
+        except ErroVirada as erro:
+            raise CommandError(str(erro))
+        except Simulacao:
+            pass
+        duracao = time.perf_counter() - inicio
+
+        resumo = resultado.resumo()
+        acao = 'simulados (nada gravado)' if options['simular'] else 'criados'
+        self.stdout.write(self.style.SUCCESS(
+            f'{resumo["semestres"]} semestre(s), {resumo["materias"]} matéria(s), '
+            f'{resumo["horarios"]} horário(s) e {resumo["eventos"]} evento(s) recorrente(s) '
+            f'{acao} em {duracao:.2f}s.'
+        ))
+        if resumo['series_sem_fim']:
+            self.stdout.write(
+                f'{resumo["series_sem_fim"]} série(s) sem data final não copiada(s): '
+                'elas já continuam no novo semestre.'
+            )
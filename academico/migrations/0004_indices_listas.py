@@ -0,0 +1,31 @@
+# Generated by Django 5.0.14 on 2026-10-19 03:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academico', '0003_alter_semestre_unique_together_semestre_usuario_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='eventoagenda',
+            index=models.Index(fields=['data_inicio', 'id'], name='eventoagenda_lista_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='materia',
+            index=models.Index(fields=['nome', 'id'], name='materia_lista_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='materialdidatico',
+            index=models.Index(fields=['-data_upload', 'id'], name='material_lista_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tarefa',
+            index=models.Index(fields=['prazo', '-criado_em', 'id'], name='tarefa_lista_idx'),
+        ),
+    ]
@@ -52,12 +52,16 @@ class Materia(models.Model):
         verbose_name = 'Matéria'
         verbose_name_plural = 'Matérias'
         ordering = ['nome']
+        indexes = [
+            # Paginação por cursor das listas (core.paginacao): ordenação + desempate
+            models.Index(fields=['nome', 'id'], name='materia_lista_idx'),
+        ]
     
     def __str__(self):
         return f"{self.nome} ({self.semestre})"
     
     def get_absolute_url(self):
-        return reverse('materia_detail', kwargs={'slug': self.slug})
+        return reverse('academico:materia_detail', kwargs={'slug': self.slug})
     
     def incrementar_acesso(self):
         """Incrementa o contador de acessos da matéria."""
@@ -110,6 +114,9 @@ class MaterialDidatico(models.Model):
         verbose_name = 'Material Didático'
         verbose_name_plural = 'Materiais Didáticos'
         ordering = ['-data_upload']
+        indexes = [
+            models.Index(fields=['-data_upload', 'id'], name='material_lista_idx'),
+        ]
     
     def __str__(self):
         return f"{self.titulo} ({self.materia})"
@@ -170,6 +177,9 @@ class EventoAgenda(models.Model):
         verbose_name = 'Evento da Agenda'
         verbose_name_plural = 'Eventos da Agenda'
         ordering = ['data_inicio']
+        indexes = [
+            models.Index(fields=['data_inicio', 'id'], name='eventoagenda_lista_idx'),
+        ]
     
     def __str__(self):
         return f"{self.titulo} - {self.data_inicio.strftime('%d/%m/%Y %H:%M')}"
@@ -221,6 +231,9 @@ class Tarefa(models.Model):
         verbose_name = 'Tarefa'
         verbose_name_plural = 'Tarefas'
         ordering = ['prazo', '-criado_em']
+        indexes = [
+            models.Index(fields=['prazo', '-criado_em', 'id'], name='tarefa_lista_idx'),
+        ]
     
     def __str__(self):
         return f"{self.titulo} ({self.materia}) - {self.get_status_display()}"
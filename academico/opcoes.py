@@ -0,0 +1,161 @@
+"""
+Opções de semestres e matérias para selects e filtros, em cache.
+
+Os selects de formulários e listas consultavam todos os semestres e
+matérias ativos a cada renderização. Aqui as listas ficam no cache como
+tuplas compactas e são reaproveitadas até mudar a versão: os sinais de
+academico.signals descartam a versão a cada save/delete de Semestre ou
+Materia, e as gravações em lote (que não disparam sinais) chamam
+invalidar_opcoes no commit. A versão faz parte da chave de cada lista,
+então as entradas antigas deixam de ser lidas e expiram sozinhas.
+
+A invalidação só alcança os outros workers com um cache compartilhado
+(CACHE_COMPARTILHADO: redis/memcached); com locmem ou file não há versão
+e as listas são consultadas a cada vez.
+
+As listas globais (semestres e matérias ativos, como o sistema mostra
+hoje) são compartilhadas entre os usuários; as de um usuário (seus
+semestres e as matérias deles) ficam em chaves próprias:
+
+    semestres()                    # [(id, 'Nome - 2025/1º Semestre'), ...]
+    materias(rotulo='nome')        # [(id, 'Cálculo I'), ...]
+    materias(usuario=request.user)
+    semestres(usuario=request.user)
+
+Nos formulários, aplicar_escolhas troca só as opções exibidas; a
+validação continua no queryset do campo, consultado apenas no POST.
+"""
+
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.metricas import cache_requisicoes_total
+
+from .models import Materia, Semestre
+
+CHAVE_VERSAO = 'academico:opcoes:versao'
+
+# Campos que aparecem nas opções: salvar só outros campos (update_fields,
+# como o contador de acessos) não invalida as listas
+CAMPOS_OPCOES = {
+    Semestre: {'usuario', 'nome', 'ano', 'periodo', 'ativo'},
+    Materia: {'semestre', 'nome', 'ativo'},
+}
+
+PERIODOS = dict(Semestre.PERIODO_CHOICES)
+
+
+def versao_opcoes():
+    """
+    Versão atual das listas (criada na primeira consulta ou após
+    invalidação), ou None se elas não devem ficar em cache.
+    """
+    if not settings.FORM_CHOICES_CACHE_TIMEOUT or not settings.CACHE_COMPARTILHADO:
+        return None
+    versao = cache.get(CHAVE_VERSAO)
+    if versao is None:
+        # add: se outro processo criou a versão ao mesmo tempo, vale a dele
+        cache.add(CHAVE_VERSAO, uuid.uuid4().hex, settings.FORM_CHOICES_CACHE_TIMEOUT)
+        versao = cache.get(CHAVE_VERSAO)
+    return versao
+
+
+def timeout_fragmento(versao):
+    """
+    Timeout de um {% cache %} de template que varia pela `versao` das
+    opções: sem versão (listas fora do cache) o fragmento não é guardado,
+    senão mostraria opções antigas.
+    """
+    return settings.TEMPLATE_FRAGMENT_CACHE_TIMEOUT if versao else 0
+
+
+def invalidar_opcoes():
+    """Descarta a versão das listas (chamado pelos sinais e gravações em lote)."""
+    cache.delete(CHAVE_VERSAO)
+
+
+def _em_cache(nome, carregar):
+    versao = versao_opcoes()
+    if versao is None:
+        # Desligado, cache local ou sem persistência (dummy): nada a reaproveitar
+        return carregar()
+    chave = f'academico:opcoes:{nome}:{versao}'
+    linhas = cache.get(chave)
+    if linhas is None:
+        cache_requisicoes_total.inc(cache='opcoes', resultado='miss')
+        linhas = carregar()
+        cache.set(chave, linhas, settings.FORM_CHOICES_CACHE_TIMEOUT)
+    else:
+        cache_requisicoes_total.inc(cache='opcoes', resultado='hit')
+    return linhas
+
+
+# ------------------------------------------------------------------ linhas
+
+def linhas_semestres(usuario=None):
+    """Semestres ativos (de todos ou só do usuário) como (id, nome, ano, período), na ordem do modelo."""
+    semestres = Semestre.objects.filter(ativo=True)
+    nome = 'semestres'
+    if usuario is not None:
+        semestres = semestres.filter(usuario=usuario)
+        nome = f'semestres:usuario:{usuario.pk}'
+    return _em_cache(nome, lambda: list(
+        semestres.order_by('-ano', '-periodo').values_list('id', 'nome', 'ano', 'periodo')
+    ))
+
+
+def linhas_materias(usuario=None):
+    """
+    Matérias como (id, nome, semestre_id, nome, ano e período do semestre).
+
+    Sem usuário: todas as matérias ativas. Com usuário: as matérias dos
+    semestres dele, ativas ou não (como o filtro do calendário).
+    """
+    materias = Materia.objects.all()
+    nome = 'materias'
+    if usuario is None:
+        materias = materias.filter(ativo=True)
+    else:
+        materias = materias.filter(semestre__usuario=usuario)
+        nome = f'materias:usuario:{usuario.pk}'
+    return _em_cache(nome, lambda: list(
+        materias.order_by('nome', 'pk').values_list(
+            'id', 'nome', 'semestre_id', 'semestre__nome', 'semestre__ano', 'semestre__periodo'
+        )
+    ))
+
+
+# ---------------------------------------------------------------- escolhas
+
+def _rotulo_semestre(nome, ano, periodo):
+    # Mesmo texto de Semestre.__str__
+    return f'{nome} - {ano}/{PERIODOS.get(periodo, periodo)}'
+
+
+def semestres(rotulo='completo', usuario=None):
+    """(id, rótulo) dos semestres ativos; rotulo='nome' usa só o nome."""
+    linhas = linhas_semestres(usuario)
+    if rotulo == 'nome':
+        return [(pk, nome) for pk, nome, _, _ in linhas]
+    return [(pk, _rotulo_semestre(nome, ano, periodo)) for pk, nome, ano, periodo in linhas]
+
+
+def materias(usuario=None, rotulo='completo'):
+    """
+    (id, rótulo) das matérias (ver linhas_materias). Rótulos: 'completo'
+    (como Materia.__str__), 'semestre' ("Nome (Semestre)") ou 'nome'.
+    """
+    linhas = linhas_materias(usuario)
+    if rotulo == 'nome':
+        return [(linha[0], linha[1]) for linha in linhas]
+    if rotulo == 'semestre':
+        return [(linha[0], f'{linha[1]} ({linha[3]})') for linha in linhas]
+    return [(linha[0], f'{linha[1]} ({_rotulo_semestre(*linha[3:])})') for linha in linhas]
+
+
+def aplicar_escolhas(campo, escolhas):
+    """Troca as opções de um ModelChoiceField pelas do cache, mantendo a opção vazia."""
+    vazio = [('', campo.empty_label)] if campo.empty_label is not None else []
+    campo.choices = vazio + list(escolhas)
@@ -0,0 +1,18 @@
+"""
+Sinais do app academico.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Materia, Semestre
+from .opcoes import CAMPOS_OPCOES, invalidar_opcoes
+
+
+@receiver([post_save, post_delete], sender=Semestre)
+@receiver([post_save, post_delete], sender=Materia)
+def opcoes_alteradas(sender, instance, update_fields=None, **kwargs):
+    """Renova a versão das listas de semestres/matérias dos selects."""
+    if update_fields and not CAMPOS_OPCOES[sender] & set(update_fields):
+        return
+    invalidar_opcoes()
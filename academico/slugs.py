@@ -0,0 +1,123 @@
+"""
+Alocação de slugs únicos para Materia.
+
+O próximo sufixo livre sai de uma única consulta: entre os slugs
+`base` e `base-N`, pega o de maior N (ordenando por tamanho e depois
+pelo texto) em vez de testar `base-1`, `base-2`... um por um. Como duas
+requisições simultâneas ainda podem escolher o mesmo slug, a gravação
+repete com o sufixo seguinte quando a restrição de unicidade recusa.
+"""
+
+import re
+
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Length
+from django.utils.text import slugify
+
+from users.estatisticas import ajustar_por_usuario
+
+from .models import Materia
+from .opcoes import invalidar_opcoes
+
+TAMANHO_MAXIMO = Materia._meta.get_field('slug').max_length
+TENTATIVAS = 5
+LIMITE_CONSULTAS = 50
+
+
+def slug_base(nome):
+    """Slug do nome, encurtado para caber um sufixo numérico."""
+    base = slugify(nome) or 'materia'
+    return base[:TAMANHO_MAXIMO - 7].rstrip('-')
+
+
+def _maior_sufixo(base, excluir_pk=None):
+    """Maior sufixo em uso para `base`: -1 se livre, 0 se só `base` existe."""
+    slugs = Materia.objects.filter(slug__startswith=base, slug__regex=rf'^{re.escape(base)}(-[0-9]+)?$')
+    if excluir_pk is not None:
+        slugs = slugs.exclude(pk=excluir_pk)
+    maior = (
+        slugs.annotate(tamanho=Length('slug'))
+        .order_by('-tamanho', '-slug')
+        .values_list('slug', flat=True)
+        .first()
+    )
+    if maior is None:
+        return -1
+    return int(maior[len(base) + 1:] or 0)
+
+
+def _com_sufixo(base, numero):
+    return base if numero == 0 else f'{base}-{numero}'
+
+
+def proximo_slug(nome, excluir_pk=None):
+    """Slug livre para uma matéria com este nome."""
+    base = slug_base(nome)
+    return _com_sufixo(base, _maior_sufixo(base, excluir_pk) + 1)
+
+
+def salvar_materia(materia):
+    """
+    Salva a matéria gerando o slug, se não houver. Se outro processo
+    gravar o mesmo slug entre a escolha e o INSERT, tenta o próximo.
+    """
+    gerar = not materia.slug
+    for tentativa in range(TENTATIVAS):
+        if gerar:
+            materia.slug = proximo_slug(materia.nome, materia.pk)
+        try:
+            with transaction.atomic():
+                materia.save()
+            return materia
+        except IntegrityError:
+            if not gerar or tentativa == TENTATIVAS - 1:
+                raise
+
+
+def _maiores_sufixos(bases):
+    """Maior sufixo em uso de cada base (como em _maior_sufixo)."""
+    if len(bases) <= LIMITE_CONSULTAS:
+        return {base: _maior_sufixo(base) for base in bases}
+    # Muitas bases (virada de semestre, importações grandes): uma leitura
+    # dos slugs existentes sai mais barata que uma consulta por base
+    maiores = dict.fromkeys(bases, -1)
+    for slug in Materia.objects.values_list('slug', flat=True).iterator(chunk_size=5000):
+        if slug in maiores:
+            maiores[slug] = max(maiores[slug], 0)
+        cabeca, _, numero = slug.rpartition('-')
+        if numero.isdigit() and cabeca in maiores:
+            maiores[cabeca] = max(maiores[cabeca], int(numero))
+    return maiores
+
+
+def alocar_slugs(materias):
+    """
+    Define o slug das matérias sem slug: uma consulta por nome-base
+    distinto ou, acima de LIMITE_CONSULTAS bases, uma só leitura.
+    """
+    pendentes = [(materia, slug_base(materia.nome)) for materia in materias if not materia.slug]
+    proximos = {base: maior + 1 for base, maior in _maiores_sufixos({base for _, base in pendentes}).items()}
+    for materia, base in pendentes:
+        materia.slug = _com_sufixo(base, proximos[base])
+        proximos[base] += 1
+
+
+def criar_em_lote(materias, batch_size=1000):
+    """bulk_create das matérias com slugs alocados, repetindo em caso de corrida."""
+    sem_slug = [materia for materia in materias if not materia.slug]
+    for tentativa in range(TENTATIVAS):
+        alocar_slugs(materias)
+        try:
+            with transaction.atomic():
+                criadas = Materia.objects.bulk_create(materias, batch_size=batch_size)
+        except IntegrityError:
+            if tentativa == TENTATIVAS - 1:
+                raise
+            for materia in sem_slug:
+                materia.slug = ''
+        else:
+            # bulk_create não dispara os sinais que renovam as opções dos
+            # selects e os contadores do perfil
+            transaction.on_commit(invalidar_opcoes)
+            ajustar_por_usuario('total_materias', (materia.semestre.usuario_id for materia in criadas))
+            return criadas
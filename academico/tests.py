@@ -1,3 +1,350 @@
-from django.test import TestCase
+import random
+from datetime import date, time
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from core.models import TarefaFila
+from users.estatisticas import CAMPOS
+from users.models import PerfilUsuario
+
+from . import opcoes, slugs
+from .conflitos import ArvoreIntervalos, pares_sobrepostos
+from .forms import HorarioAulaForm
+from .models import HorarioAula, MaterialDidatico, Materia, Semestre, Tarefa
+from .virada import virar_semestres
+
+User = get_user_model()
+
+
+def criar_semestre(usuario, nome='2026/1', ano=2026, periodo='1', inicio=date(2026, 2, 1), fim=date(2026, 6, 30)):
+    return Semestre.objects.create(
+        usuario=usuario, nome=nome, ano=ano, periodo=periodo, data_inicio=inicio, data_fim=fim,
+    )
+
+
+class ViradaSemestreTests(TestCase):
+    """Horários copiados pela virada continuam editáveis (sem conflito com a origem)."""
+
+    def setUp(self):
+        self.usuario = User.objects.create_user('ana', 'ana@exemplo.com', 'senha')
+        self.origem = criar_semestre(self.usuario)
+        materia = Materia.objects.create(semestre=self.origem, nome='Cálculo', slug='calculo')
+        HorarioAula.objects.create(materia=materia, dia_semana=0, hora_inicio=time(8), hora_fim=time(10))
+
+    def _editar_copia(self):
+        copia = HorarioAula.objects.select_related('materia__semestre').get(materia__semestre__periodo='2')
+        form = HorarioAulaForm(
+            {'dia_semana': 0, 'hora_inicio': '08:00', 'hora_fim': '10:30', 'local': '', 'observacoes': ''},
+            instance=copia, materia=copia.materia,
+        )
+        return form
+
+    def test_copia_editavel_com_origem_ativa(self):
+        virar_semestres([self.origem], 2026, '2', date(2026, 8, 1), date(2026, 12, 15))
+        form = self._editar_copia()
+        self.assertTrue(form.is_valid(), form.errors)
+
+    def test_copia_editavel_com_origem_desativada(self):
+        virar_semestres([self.origem], 2026, '2', date(2026, 8, 1), date(2026, 12, 15), desativar_origem=True)
+        form = self._editar_copia()
+        self.assertTrue(form.is_valid(), form.errors)
+
+    def test_conflito_dentro_do_semestre_continua_detectado(self):
+        virar_semestres([self.origem], 2026, '2', date(2026, 8, 1), date(2026, 12, 15))
+        semestre = Semestre.objects.get(periodo='2')
+        outra = Materia.objects.create(semestre=semestre, nome='Física', slug='fisica')
+        form = HorarioAulaForm(
+            {'dia_semana': 0, 'hora_inicio': '09:00', 'hora_fim': '11:00', 'local': '', 'observacoes': ''},
+            materia=outra,
+        )
+        self.assertFalse(form.is_valid())
+        self.assertIn('Conflita com: Cálculo (08:00–10:00)', str(form.errors))
+
+
+class HorariosDaMateriaTests(TestCase):
+    """O formset da matéria verifica as linhas contra a grade e entre si, também na criação."""
+
+    def setUp(self):
+        self.usuario = User.objects.create_user('ana', 'ana@exemplo.com', 'senha')
+        self.semestre = criar_semestre(self.usuario)
+        self.client.force_login(self.usuario)
+
+    def _criar(self, *linhas):
+        dados = {
+            'semestre': self.semestre.pk, 'nome': 'Física', 'descricao': '',
+            'horarios_aula-TOTAL_FORMS': len(linhas), 'horarios_aula-INITIAL_FORMS': 0,
+            'horarios_aula-MIN_NUM_FORMS': 0, 'horarios_aula-MAX_NUM_FORMS': 1000,
+        }
+        for i, (dia, inicio, fim) in enumerate(linhas):
+            dados.update({
+                f'horarios_aula-{i}-dia_semana': dia, f'horarios_aula-{i}-hora_inicio': inicio,
+                f'horarios_aula-{i}-hora_fim': fim, f'horarios_aula-{i}-local': '', f'horarios_aula-{i}-observacoes': '',
+            })
+        return self.client.post(reverse('academico:materia_create'), dados)
+
+    def test_linhas_sobrepostas_no_mesmo_envio(self):
+        resposta = self._criar((1, '08:00', '10:00'), (1, '09:00', '11:00'), (2, '09:00', '11:00'))
+        self.assertEqual(resposta.status_code, 200)
+        erros = [form.non_field_errors() for form in resposta.context['horarios_formset']]
+        self.assertIn('Conflita com: outro horário desta matéria (09:00–11:00)', erros[0])
+        self.assertIn('Conflita com: outro horário desta matéria (08:00–10:00)', erros[1])
+        self.assertFalse(erros[2])
+        self.assertFalse(Materia.objects.filter(nome='Física').exists())
+
+    def test_conflito_com_a_grade_na_criacao(self):
+        calculo = Materia.objects.create(semestre=self.semestre, nome='Cálculo', slug='calculo')
+        HorarioAula.objects.create(materia=calculo, dia_semana=0, hora_inicio=time(8), hora_fim=time(10))
+        resposta = self._criar((0, '09:30', '11:00'))
+        self.assertContains(resposta, 'Conflita com: Cálculo (08:00–10:00)')
+
+        resposta = self._criar((0, '10:00', '11:00'), (0, '11:00', '12:00'))
+        self.assertEqual(resposta.status_code, 302)
+        self.assertEqual(HorarioAula.objects.filter(materia__nome='Física').count(), 2)
+
+
+class TarefasLoteTests(TestCase):
+    """Operações em lote: só nas tarefas do usuário e com os contadores do perfil certos."""
+
+    def setUp(self):
+        self.ana = User.objects.create_user('ana', 'ana@exemplo.com', 'senha')
+        self.bia = User.objects.create_user('bia', 'bia@exemplo.com', 'senha')
+        self.tarefas = {}
+        for usuario in (self.ana, self.bia):
+            PerfilUsuario.objects.create(usuario=usuario)
+            materia = Materia.objects.create(semestre=criar_semestre(usuario), nome='Cálculo', slug=f'calculo-{usuario.pk}')
+            self.tarefas[usuario.username] = [
+                Tarefa.objects.create(materia=materia, usuario=usuario, titulo=f'T{i}', status=status).pk
+                for i, status in enumerate(['PENDENTE', 'PENDENTE', 'CONCLUIDA'])
+            ]
+        self.client.force_login(self.ana)
+
+    def _lote(self, operacao, ids):
+        resposta = self.client.post(
+            reverse('academico:tarefas_lote'), {'operacao': operacao, 'ids': ids}, content_type='application/json',
+        )
+        self.assertEqual(resposta.status_code, 200)
+        return resposta.json()['afetadas']
+
+    def _concluidas(self, usuario):
+        return PerfilUsuario.objects.values_list('total_tarefas_concluidas', flat=True).get(usuario=usuario)
+
+    def test_tarefas_de_outro_usuario_ficam_intactas(self):
+        todas = self.tarefas['ana'] + self.tarefas['bia']
+        self.assertEqual(self._lote('concluir', todas), 2)
+        self.assertEqual(self._lote('excluir', self.tarefas['bia']), 0)
+        self.assertEqual(Tarefa.objects.filter(usuario=self.bia, status='CONCLUIDA').count(), 1)
+        self.assertEqual(Tarefa.objects.filter(usuario=self.bia).count(), 3)
+        self.assertEqual(self._concluidas(self.bia), 1)
+        replanejados = TarefaFila.objects.filter(nome__endswith='replanejar_estudos').values_list('args', flat=True)
+        self.assertEqual(list(replanejados), [[self.ana.pk]])
+
+    def test_contadores_so_mudam_com_o_status(self):
+        self.assertEqual(self._concluidas(self.ana), 1)
+        # A tarefa já concluída não conta de novo
+        self.assertEqual(self._lote('concluir', self.tarefas['ana']), 2)
+        self.assertEqual(self._concluidas(self.ana), 3)
+        self.assertEqual(self._lote('concluir', self.tarefas['ana']), 0)
+        self.assertEqual(self._concluidas(self.ana), 3)
+        self.assertEqual(self._lote('reabrir', self.tarefas['ana'][:1]), 1)
+        self.assertEqual(self._concluidas(self.ana), 2)
+        self.assertEqual(self._lote('reabrir', self.tarefas['ana'][:1]), 0)
+        self.assertEqual(self._concluidas(self.ana), 2)
+
+    def test_excluir_atualiza_os_contadores(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self._lote('excluir', self.tarefas['ana']), 3)
+        self.assertEqual(self._concluidas(self.ana), 0)
+        self.assertEqual(self._concluidas(self.bia), 1)
+        self.assertEqual(
+            list(PerfilUsuario.objects.filter(usuario=self.ana).values_list(*CAMPOS).get()),
+            [1, 0, 0],
+        )
+
+
+class ListasJsonTests(TestCase):
+    """Páginas JSON das listas: formato, só os dados do usuário e cursores até o fim."""
+
+    def setUp(self):
+        self.ana = User.objects.create_user('ana', 'ana@exemplo.com', 'senha')
+        bia = User.objects.create_user('bia', 'bia@exemplo.com', 'senha')
+        for usuario, quantidade in ((self.ana, 45), (bia, 5)):
+            materia = Materia.objects.create(
+                semestre=criar_semestre(usuario), nome=f'Cálculo {usuario.username}', slug=f'calculo-{usuario.pk}',
+            )
+            Tarefa.objects.bulk_create([
+                Tarefa(materia=materia, usuario=usuario, titulo=f'T{i}') for i in range(quantidade)
+            ])
+            MaterialDidatico.objects.bulk_create([
+                MaterialDidatico(materia=materia, usuario=usuario, titulo=f'M{i}', arquivo='', tipo='PDF')
+                for i in range(quantidade)
+            ])
+        self.client.force_login(self.ana)
+
+    def _percorrer(self, rota, **filtros):
+        itens, cursor, paginas = [], None, 0
+        while True:
+            parametros = dict(filtros, **({'cursor': cursor} if cursor else {}))
+            dados = self.client.get(reverse(rota), parametros).json()
+            self.assertEqual(set(dados), {'itens', 'proximo_cursor'})
+            itens.extend(dados['itens'])
+            paginas += 1
+            cursor = dados['proximo_cursor']
+            if not cursor:
+                return itens, paginas
+
+    def test_tarefas_do_usuario_ate_a_ultima_pagina(self):
+        itens, paginas = self._percorrer('academico:tarefas_json')
+        self.assertEqual(paginas, 3)
+        esperadas = set(Tarefa.objects.filter(usuario=self.ana).values_list('pk', flat=True))
+        self.assertEqual([item['id'] for item in itens if item['id'] in esperadas], [item['id'] for item in itens])
+        self.assertEqual(len({item['id'] for item in itens}), 45)
+        self.assertEqual(itens[0]['materia'], 'Cálculo ana')
+        self.assertLessEqual(
+            {'titulo', 'status', 'status_display', 'prazo', 'url_materia', 'url_editar', 'concluida'}, set(itens[0]),
+        )
+
+    def test_filtro_com_id_de_outro_usuario_fica_vazio(self):
+        materia_bia = Materia.objects.get(nome='Cálculo bia')
+        itens, _ = self._percorrer('academico:tarefas_json', materia=materia_bia.pk)
+        self.assertEqual(itens, [])
+        itens, _ = self._percorrer('academico:materiais_json', materia=materia_bia.pk)
+        self.assertEqual(itens, [])
+
+    def test_materiais_do_usuario_ate_a_ultima_pagina(self):
+        itens, paginas = self._percorrer('academico:materiais_json')
+        self.assertEqual(paginas, 3)
+        self.assertEqual(len({item['id'] for item in itens}), 45)
+        self.assertEqual({item['autor'] for item in itens}, {'ana'})
+        self.assertEqual(itens[0]['tamanho'], '0 bytes')
+
+    def test_filtros_so_com_as_opcoes_do_usuario(self):
+        dados = self.client.get(reverse('academico:filtros_json')).json()
+        self.assertEqual(set(dados), {'semestres', 'materias', 'tipos_material'})
+        self.assertEqual([semestre['nome'] for semestre in dados['semestres']], ['2026/1'])
+        self.assertEqual(dados['semestres'][0]['id'], Semestre.objects.get(usuario=self.ana).pk)
+        self.assertEqual([materia['nome'] for materia in dados['materias']], ['Cálculo ana'])
+        self.assertIn({'id': 'PDF', 'nome': 'PDF'}, dados['tipos_material'])
+
+
+@override_settings(FORM_CHOICES_CACHE_TIMEOUT=3600)
+class OpcoesTests(TestCase):
+    """Listas dos selects só ficam em cache com invalidação entre workers."""
+
+    def setUp(self):
+        cache.clear()
+        self.usuario = User.objects.create_user('ana', 'ana@exemplo.com', 'senha')
+        criar_semestre(self.usuario)
+
+    @override_settings(CACHE_COMPARTILHADO=False)
+    def test_cache_local_consulta_sempre(self):
+        self.assertIsNone(opcoes.versao_opcoes())
+        opcoes.semestres()
+        with self.assertNumQueries(1):
+            opcoes.semestres()
+
+    @override_settings(CACHE_COMPARTILHADO=True)
+    def test_cache_compartilhado_reaproveita_ate_alterar(self):
+        opcoes.semestres()
+        with self.assertNumQueries(0):
+            self.assertEqual(len(opcoes.semestres()), 1)
+        criar_semestre(self.usuario, nome='2026/2', periodo='2', inicio=date(2026, 8, 1), fim=date(2026, 12, 15))
+        self.assertEqual(len(opcoes.semestres()), 2)
+
+
+class ArvoreIntervalosTests(SimpleTestCase):
+    """A árvore (com e sem buffer) devolve o mesmo que a comparação um a um."""
+
+    def _intervalos(self, quantidade, semente):
+        sorteio = random.Random(semente)
+        intervalos = []
+        for i in range(quantidade):
+            inicio = sorteio.randrange(0, 1000)
+            intervalos.append((inicio, inicio + sorteio.randrange(1, 80), i))
+        return intervalos
+
+    def test_consulta_igual_a_forca_bruta(self):
+        intervalos = self._intervalos(300, 1)
+        arvore = ArvoreIntervalos(intervalos[:200])
+        # O resto passa pelo buffer e por uma reconstrução (LIMITE_BUFFER)
+        for inicio, fim, item in intervalos[200:]:
+            arvore.adicionar(inicio, fim, item)
+        self.assertEqual(len(arvore), 300)
+        for inicio, fim, _ in self._intervalos(100, 2):
+            esperados = [item for c, t, item in intervalos if c < fim and t > inicio]
+            self.assertCountEqual(arvore.sobrepostos(inicio, fim), esperados)
+
+    def test_intervalos_encostados_nao_se_sobrepoem(self):
+        arvore = ArvoreIntervalos([(time(8), time(10), 'a'), (time(10), time(12), 'b')])
+        self.assertEqual(arvore.sobrepostos(time(10), time(11)), ['b'])
+        self.assertEqual(arvore.sobrepostos(time(9), time(10, 30)), ['a', 'b'])
+        self.assertEqual(ArvoreIntervalos().sobrepostos(time(8), time(9)), [])
+
+    def test_pares_sobrepostos(self):
+        intervalos = self._intervalos(150, 3)
+        esperados = {
+            frozenset((a[2], b[2]))
+            for i, a in enumerate(intervalos) for b in intervalos[i + 1:]
+            if a[0] < b[1] and b[0] < a[1]
+        }
+        pares = pares_sobrepostos(intervalos)
+        self.assertEqual(len(pares), len(esperados))
+        self.assertEqual({frozenset(par) for par in pares}, esperados)
+
+
+class SlugsTests(TestCase):
+    """Sufixo livre numa consulta e nova tentativa quando outro processo grava antes."""
+
+    def setUp(self):
+        self.semestre = criar_semestre(User.objects.create_user('ana', 'ana@exemplo.com', 'senha'))
+
+    def _materia(self, slug, nome='Cálculo'):
+        return Materia.objects.create(semestre=self.semestre, nome=nome, slug=slug)
+
+    def test_proximo_sufixo(self):
+        self.assertEqual(slugs.proximo_slug('Cálculo'), 'calculo')
+        for slug in ('calculo', 'calculo-2', 'calculo-10', 'calculo-abc', 'calculo-ii'):
+            self._materia(slug)
+        # -10 vence -2 (ordem por tamanho) e os sufixos não numéricos são ignorados
+        self.assertEqual(slugs.proximo_slug('Cálculo'), 'calculo-11')
+        self.assertEqual(slugs.proximo_slug('Cálculo II'), 'calculo-ii-1')
+
+    def _corrida(self, funcao):
+        """Envolve `funcao` gravando, na primeira chamada, o slug que ela acabou de liberar."""
+        original = getattr(slugs, funcao)
+        chamadas = []
+
+        def concorrente(*args, **kwargs):
+            resultado = original(*args, **kwargs)
+            if not chamadas:
+                self._materia('calculo', nome='Cálculo (outra aba)')
+            chamadas.append(args)
+            return resultado
+
+        return mock.patch.object(slugs, funcao, side_effect=concorrente), chamadas
+
+    def test_salvar_materia_tenta_o_proximo_slug(self):
+        corrida, chamadas = self._corrida('_maior_sufixo')
+        with corrida:
+            materia = slugs.salvar_materia(Materia(semestre=self.semestre, nome='Cálculo'))
+        self.assertEqual(materia.slug, 'calculo-1')
+        self.assertEqual(len(chamadas), 2)
+
+    def test_criar_em_lote_tenta_de_novo(self):
+        corrida, chamadas = self._corrida('_maiores_sufixos')
+        novas = [Materia(semestre=self.semestre, nome=nome) for nome in ('Cálculo', 'Cálculo', 'Física')]
+        with corrida:
+            criadas = slugs.criar_em_lote(novas)
+        self.assertEqual(sorted(m.slug for m in criadas), ['calculo-1', 'calculo-2', 'fisica'])
+        self.assertEqual(len(chamadas), 2)
+
+    def test_muitas_bases_numa_leitura(self):
+        self._materia('calculo-3')
+        novas = [Materia(semestre=self.semestre, nome=nome) for nome in ['Cálculo'] + [f'Optativa {i}' for i in range(slugs.LIMITE_CONSULTAS)]]
+        with self.assertNumQueries(1):
+            slugs.alocar_slugs(novas)
+        self.assertEqual(novas[0].slug, 'calculo-4')
+        self.assertEqual(novas[1].slug, 'optativa-0')
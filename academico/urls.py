@@ -19,6 +19,7 @@ urlpatterns = [
     path('materias/<slug:slug>/material/upload/', views.material_upload, name='material_upload'),
     path('materiais/<int:pk>/download/', views.material_download, name='material_download'),
     path('materiais/', views_extra.materials_lista, name='materials_lista'),
+    path('api/materiais/', views_extra.materiais_json, name='materiais_json'),
     
     # Eventos
     path('agenda/', views_extra.agenda_geral, name='agenda_geral'),
@@ -28,14 +29,22 @@ urlpatterns = [
     
     # Tarefas
     path('tarefas/', views_extra.todolist_geral, name='todolist_geral'),
+    path('tarefas/lote/', views_extra.tarefas_lote, name='tarefas_lote'),
+    path('api/tarefas/', views_extra.tarefas_json, name='tarefas_json'),
     path('materias/<slug:slug>/tarefa/nova/', views.tarefa_create, name='tarefa_create'),
     path('tarefas/<int:pk>/editar/', views.tarefa_edit, name='tarefa_edit'),
     path('tarefas/<int:pk>/toggle/', views.tarefa_toggle_status, name='tarefa_toggle_status'),
     path('semestres/<int:pk>/tarefas/', views_extra.todolist_semestre, name='todolist_semestre'),
 
+    # Semestres
+    path('semestres/<int:pk>/virada/', views_extra.semestre_virada, name='semestre_virada'),
+
     # Horários de aula
     path('materias/<slug:slug>/horarios/', views_extra.horarios_materia, name='horarios_materia'),
     path('materias/<slug:slug>/horarios/novo/', views_extra.horario_create, name='horario_create'),
     path('horarios/<int:pk>/editar/', views_extra.horario_edit, name='horario_edit'),
     path('horarios/<int:pk>/excluir/', views_extra.horario_delete, name='horario_delete'),
+
+    # Opções dos filtros das listas
+    path('api/filtros/', views_extra.filtros_json, name='filtros_json'),
 ]
\ No newline at end of file
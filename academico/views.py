@@ -22,6 +22,7 @@ from .forms import (
     MaterialDidaticoForm, EventoAgendaForm, TarefaForm
 )
 from agentes.servicos import servico_agente
+from core.metricas import material_download_bytes, material_upload_bytes
 
 
 @login_required
@@ -81,7 +82,7 @@ def materia_tutor(request, slug):
     
     if not pergunta:
         messages.error(request, 'Por favor, digite uma pergunta.')
-        return redirect('materia_detail', slug=slug)
+        return redirect('academico:materia_detail', slug=slug)
     
     try:
         resposta = servico_agente.responder_materia(pergunta, materia.slug)
@@ -105,7 +106,7 @@ def materia_tutor(request, slug):
         else:
             messages.error(request, erro_msg)
     
-    return redirect('materia_detail', slug=slug)
+    return redirect('academico:materia_detail', slug=slug)
 
 
 @login_required
@@ -132,6 +133,8 @@ def material_upload(request, slug):
                     material.tipo = 'DOCX'
             
             material.save()
+            if material.arquivo:
+                material_upload_bytes.inc(material.arquivo.size)
             messages.success(request, f'Material "{material.titulo}" enviado com sucesso!')
             
             if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
@@ -140,7 +143,7 @@ def material_upload(request, slug):
                     'mensagem': f'Material "{material.titulo}" enviado com sucesso!'
                 })
             
-            return redirect('materia_detail', slug=slug)
+            return redirect('academico:materia_detail', slug=slug)
         else:
             if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
                 return JsonResponse({
@@ -171,7 +174,7 @@ def material_download(request, pk):
     # Verificar se o arquivo existe
     if not default_storage.exists(material.arquivo.name):
         messages.error(request, 'Arquivo não encontrado no servidor.')
-        return redirect('materia_detail', slug=material.materia.slug)
+        return redirect('academico:materia_detail', slug=material.materia.slug)
     
     # Preparar resposta com o arquivo
     file_path = material.arquivo.path
@@ -179,12 +182,14 @@ def material_download(request, pk):
     
     try:
         with open(file_path, 'rb') as arquivo:
-            response = HttpResponse(arquivo.read(), content_type=mime_type or 'application/octet-stream')
+            conteudo = arquivo.read()
+            response = HttpResponse(conteudo, content_type=mime_type or 'application/octet-stream')
+            material_download_bytes.inc(len(conteudo))
             response['Content-Disposition'] = f'attachment; filename="{os.path.basename(material.arquivo.name)}"'
             return response
     except FileNotFoundError:
         messages.error(request, 'Arquivo não encontrado.')
-        return redirect('materia_detail', slug=material.materia.slug)
+        return redirect('academico:materia_detail', slug=material.materia.slug)
 
 
 @login_required
@@ -203,7 +208,7 @@ def evento_create(request, slug):
             evento.save()
             
             messages.success(request, f'Evento "{evento.titulo}" criado com sucesso!')
-            return redirect('materia_detail', slug=slug)
+            return redirect('academico:materia_detail', slug=slug)
     else:
         form = EventoAgendaForm()
     
@@ -225,7 +230,7 @@ def evento_edit(request, pk):
     # Verificar permissões
     if not request.user.is_staff and evento.usuario != request.user:
         messages.error(request, 'Você não tem permissão para editar este evento.')
-        return redirect('materia_detail', slug=evento.materia.slug if evento.materia else 'home')
+        return redirect('academico:materia_detail', slug=evento.materia.slug if evento.materia else 'home')
     
     if request.method == 'POST':
         form = EventoAgendaForm(request.POST, instance=evento)
@@ -234,9 +239,9 @@ def evento_edit(request, pk):
             messages.success(request, f'Evento "{evento.titulo}" atualizado com sucesso!')
             
             if evento.materia:
-                return redirect('materia_detail', slug=evento.materia.slug)
+                return redirect('academico:materia_detail', slug=evento.materia.slug)
             else:
-                return redirect('agenda_geral')
+                return redirect('academico:agenda_geral')
     else:
         form = EventoAgendaForm(instance=evento)
     
@@ -319,7 +324,7 @@ def tarefa_toggle_status(request, pk):
             return JsonResponse({'sucesso': False, 'erro': 'Sem permissão'})
         
         messages.error(request, 'Você não tem permissão para alterar esta tarefa.')
-        return redirect('materia_detail', slug=tarefa.materia.slug)
+        return redirect('academico:materia_detail', slug=tarefa.materia.slug)
     
     # Toggle do status
     if tarefa.status == 'CONCLUIDA':
@@ -340,4 +345,4 @@ def tarefa_toggle_status(request, pk):
         })
     
     messages.success(request, mensagem)
-    return redirect('materia_detail', slug=tarefa.materia.slug)
+    return redirect('academico:materia_detail', slug=tarefa.materia.slug)
@@ -4,19 +4,31 @@ Views adicionais para o app acadêmico - cadastros e funcionalidades extras.
 
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
 from django.views.decorators.http import require_POST
 from django.utils import timezone
-from django.core.paginator import Paginator
+from django.db import transaction
 from django.db.models import Q, Count
-from datetime import timedelta
+from django.utils.dateparse import parse_date, parse_datetime
+from django.template.defaultfilters import pluralize, truncatewords
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
+from datetime import datetime, time, timedelta
+import json
 
+from core.paginacao import PaginadorCursor
+from users.estatisticas import ajustar_concluidas, em_lote
+
+from . import opcoes
 from .models import (
     Semestre, Materia, MaterialDidatico, EventoAgenda, 
     Tarefa, AcessoMateria, HorarioAula
 )
 from .forms import EventoAgendaForm, TarefaForm, MateriaComHorariosForm, HorarioAulaForm, HorarioAulaFormSet
+from .forms_extra import VirarSemestreForm
+from .virada import ErroVirada, virar_semestres
 
 
 @login_required
@@ -25,7 +37,9 @@ def materia_create(request):
     
     if request.method == 'POST':
         form = MateriaComHorariosForm(request.POST)
-        horarios_formset = HorarioAulaFormSet(request.POST)
+        # Os conflitos dos horários são verificados no semestre escolhido
+        semestre = form.cleaned_data['semestre'] if form.is_valid() else None
+        horarios_formset = HorarioAulaFormSet(request.POST, semestre=semestre)
         
         if form.is_valid() and horarios_formset.is_valid():
             materia = form.save()
@@ -58,7 +72,8 @@ def materia_edit(request, slug):
     
     if request.method == 'POST':
         form = MateriaComHorariosForm(request.POST, instance=materia)
-        horarios_formset = HorarioAulaFormSet(request.POST, instance=materia)
+        semestre = form.cleaned_data['semestre'] if form.is_valid() else None
+        horarios_formset = HorarioAulaFormSet(request.POST, instance=materia, semestre=semestre)
         
         if form.is_valid() and horarios_formset.is_valid():
             materia = form.save()
@@ -110,13 +125,11 @@ def materias_lista(request):
     else:  # nome
         materias = materias.order_by('nome')
     
-    # Paginação
-    paginator = Paginator(materias, 12)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Paginação por cursor (core.paginacao), na ordenação da consulta
+    page_obj = PaginadorCursor(materias, 12).pagina(request.GET.get('cursor'))
     
-    # Dados para filtros
-    semestres = Semestre.objects.filter(ativo=True).order_by('-ano', '-periodo')
+    # Dados para filtros (academico.opcoes, em cache)
+    semestres = opcoes.semestres(rotulo='nome')
     
     context = {
         'page_obj': page_obj,
@@ -155,10 +168,8 @@ def agenda_geral(request):
     
     eventos = eventos.order_by('data_inicio')
     
-    # Paginação
-    paginator = Paginator(eventos, 20)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Paginação por cursor (core.paginacao), na ordenação da consulta
+    page_obj = PaginadorCursor(eventos, 20).pagina(request.GET.get('cursor'))
     
     # Próximos eventos importantes (para sidebar)
     proximos_importantes = EventoAgenda.objects.filter(
@@ -206,19 +217,17 @@ def evento_geral_create(request):
     return render(request, 'academico/evento_form.html', context)
 
 
-@login_required
-def todolist_geral(request):
-    """Lista geral de todas as tarefas (dashboard)."""
-    
-    # Filtros
-    status = request.GET.get('status', 'pendente')
-    semestre_id = request.GET.get('semestre', '')
-    materia_id = request.GET.get('materia', '')
+TAREFAS_POR_PAGINA = 20
+
+
+def _filtrar_tarefas(parametros, usuario):
+    """Tarefas do usuário com os filtros da querystring, na ordem da paginação."""
+    status = parametros.get('status', 'pendente')
+    semestre_id = parametros.get('semestre', '')
+    materia_id = parametros.get('materia', '')
     
-    # Base queryset
-    tarefas = Tarefa.objects.select_related('materia', 'materia__semestre')
+    tarefas = Tarefa.objects.filter(usuario=usuario).select_related('materia', 'materia__semestre')
     
-    # Filtros
     if status == 'pendente':
         tarefas = tarefas.filter(status__in=['PENDENTE', 'EM_ANDAMENTO'])
     elif status == 'concluida':
@@ -230,27 +239,30 @@ def todolist_geral(request):
     if materia_id:
         tarefas = tarefas.filter(materia_id=materia_id)
     
-    tarefas = tarefas.order_by('prazo', '-criado_em')
+    return tarefas.order_by('prazo', '-criado_em')
+
+
+@login_required
+def todolist_geral(request):
+    """Lista geral de todas as tarefas (dashboard)."""
+    
+    # Filtros
+    status = request.GET.get('status', 'pendente')
+    semestre_id = request.GET.get('semestre', '')
+    materia_id = request.GET.get('materia', '')
+    
+    tarefas = _filtrar_tarefas(request.GET, request.user)
     
     # Estatísticas
-    stats = {
-        'total': Tarefa.objects.count(),
-        'pendentes': Tarefa.objects.filter(status__in=['PENDENTE', 'EM_ANDAMENTO']).count(),
-        'concluidas': Tarefa.objects.filter(status='CONCLUIDA').count(),
-        'atrasadas': Tarefa.objects.filter(
-            status__in=['PENDENTE', 'EM_ANDAMENTO'],
-            prazo__lt=timezone.now()
-        ).count(),
-    }
+    stats = _estatisticas_tarefas(Tarefa.objects.filter(usuario=request.user))
     
-    # Paginação
-    paginator = Paginator(tarefas, 20)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Paginação por cursor (core.paginacao); as páginas seguintes vêm de tarefas_json
+    page_obj = PaginadorCursor(tarefas, TAREFAS_POR_PAGINA).pagina(request.GET.get('cursor'))
     
-    # Dados para filtros
-    semestres = Semestre.objects.filter(ativo=True).order_by('-ano', '-periodo')
-    materias = Materia.objects.filter(ativo=True).order_by('nome')
+    # Dados para filtros (academico.opcoes, em cache)
+    semestres = opcoes.semestres(rotulo='nome', usuario=request.user)
+    materias = opcoes.materias(usuario=request.user, rotulo='semestre')
+    versao_opcoes = opcoes.versao_opcoes()
     
     context = {
         'page_obj': page_obj,
@@ -260,12 +272,117 @@ def todolist_geral(request):
         'materia_selecionada': materia_id,
         'semestres': semestres,
         'materias': materias,
+        # Fragmento dos selects de filtro, em cache até as opções mudarem
+        'versao_opcoes': versao_opcoes,
+        'cache_filtros': opcoes.timeout_fragmento(versao_opcoes),
         'titulo_pagina': 'Lista de Tarefas - Geral'
     }
     
     return render(request, 'academico/todolist_geral.html', context)
 
 
+def _estatisticas_tarefas(tarefas):
+    """Totais da lista de tarefas numa única consulta."""
+    abertas = Q(status__in=['PENDENTE', 'EM_ANDAMENTO'])
+    return tarefas.aggregate(
+        total=Count('pk'),
+        pendentes=Count('pk', filter=abertas),
+        concluidas=Count('pk', filter=Q(status='CONCLUIDA')),
+        atrasadas=Count('pk', filter=abertas & Q(prazo__lt=timezone.now())),
+    )
+
+
+TAREFAS_LOTE_MAXIMO = 500
+
+OPERACOES_LOTE = {
+    # operação: (filtro das tarefas afetadas, mensagem)
+    'concluir': (~Q(status='CONCLUIDA'), 'concluída(s)'),
+    'reabrir': (Q(status='CONCLUIDA'), 'reaberta(s)'),
+    'reagendar': (Q(), 'reagendada(s)'),
+    'excluir': (Q(), 'excluída(s)'),
+}
+
+
+def _prazo_lote(valor):
+    """Prazo do reagendamento: data e hora ISO ou só a data (fim do dia)."""
+    valor = str(valor or '')
+    momento = parse_datetime(valor)
+    if momento is None:
+        dia = parse_date(valor)
+        if dia is None:
+            return None
+        momento = datetime.combine(dia, time(23, 59))
+    return timezone.make_aware(momento) if timezone.is_naive(momento) else momento
+
+
+@login_required
+@require_POST
+def tarefas_lote(request):
+    """
+    Operação em lote sobre tarefas (JSON): {"ids": [...], "operacao":
+    "concluir" | "reabrir" | "reagendar" | "excluir", "prazo": "..."}.
+    Uma única escrita, filtrada pelas tarefas que o usuário pode alterar.
+    """
+    
+    try:
+        dados = json.loads(request.body or b'{}')
+        ids = [int(pk) for pk in dados.get('ids', [])]
+    except (ValueError, TypeError, AttributeError):
+        return JsonResponse({'sucesso': False, 'erro': 'Requisição inválida.'}, status=400)
+    
+    operacao = dados.get('operacao')
+    if operacao not in OPERACOES_LOTE:
+        return JsonResponse({'sucesso': False, 'erro': 'Operação inválida.'}, status=400)
+    if not ids:
+        return JsonResponse({'sucesso': False, 'erro': 'Selecione ao menos uma tarefa.'}, status=400)
+    if len(ids) > TAREFAS_LOTE_MAXIMO:
+        return JsonResponse(
+            {'sucesso': False, 'erro': f'No máximo {TAREFAS_LOTE_MAXIMO} tarefas por vez.'}, status=400
+        )
+    
+    filtro, descricao = OPERACOES_LOTE[operacao]
+    tarefas = Tarefa.objects.filter(filtro, pk__in=ids)
+    if request.user.is_staff:
+        donos = list(tarefas.values_list('usuario_id', flat=True).distinct())
+    else:
+        tarefas = tarefas.filter(usuario=request.user)
+        donos = [request.user.pk]
+    
+    prazo = None
+    if operacao == 'reagendar':
+        prazo = _prazo_lote(dados.get('prazo'))
+        if prazo is None:
+            return JsonResponse({'sucesso': False, 'erro': 'Informe o novo prazo.'}, status=400)
+    
+    # update() não passa pelo auto_now: atualizado_em vai explícito
+    agora = timezone.now()
+    with transaction.atomic():
+        # update() não dispara sinais: os contadores do perfil vão à parte
+        if operacao == 'concluir':
+            ajustar_concluidas(tarefas, 1)
+            afetadas = tarefas.update(status='CONCLUIDA', atualizado_em=agora)
+        elif operacao == 'reabrir':
+            ajustar_concluidas(tarefas, -1)
+            afetadas = tarefas.update(status='PENDENTE', atualizado_em=agora)
+        elif operacao == 'reagendar':
+            afetadas = tarefas.update(prazo=prazo, atualizado_em=agora)
+        else:
+            with em_lote():
+                afetadas, _ = tarefas.delete()
+        
+        # O plano de estudos considera os prazos das tarefas pendentes
+        if afetadas:
+            from calendario.tarefas_assincronas import replanejar_estudos
+            replanejar_estudos.enfileirar_lote((dono,) for dono in donos)
+    
+    return JsonResponse({
+        'sucesso': True,
+        'afetadas': afetadas,
+        'mensagem': f'{afetadas} tarefa(s) {descricao}.',
+        'stats': _estatisticas_tarefas(Tarefa.objects.filter(usuario=request.user)),
+    })
+
+
 @login_required
 def todolist_semestre(request, pk):
     """Lista de tarefas de um semestre específico."""
@@ -310,10 +427,8 @@ def todolist_semestre(request, pk):
         ).count(),
     }
     
-    # Paginação
-    paginator = Paginator(tarefas, 15)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Paginação por cursor (core.paginacao), na ordenação da consulta
+    page_obj = PaginadorCursor(tarefas, 15).pagina(request.GET.get('cursor'))
     
     # Matérias do semestre para filtro
     materias = semestre.materias.filter(ativo=True).order_by('nome')
@@ -331,19 +446,19 @@ def todolist_semestre(request, pk):
     return render(request, 'academico/todolist_semestre.html', context)
 
 
-@login_required
-def materials_lista(request):
-    """Lista todos os materiais didáticos."""
-    
-    # Filtros
-    busca = request.GET.get('busca', '').strip()
-    tipo = request.GET.get('tipo', '')
-    materia_id = request.GET.get('materia', '')
+MATERIAIS_POR_PAGINA = 20
+
+
+def _filtrar_materiais(parametros, usuario):
+    """Materiais das matérias do usuário com os filtros da querystring, na ordem da paginação."""
+    busca = parametros.get('busca', '').strip()
+    tipo = parametros.get('tipo', '')
+    materia_id = parametros.get('materia', '')
     
-    # Base queryset
-    materiais = MaterialDidatico.objects.select_related('materia', 'materia__semestre')
+    materiais = MaterialDidatico.objects.filter(materia__semestre__usuario=usuario).select_related(
+        'materia', 'materia__semestre', 'usuario'
+    )
     
-    # Aplicar filtros
     if busca:
         materiais = materiais.filter(
             Q(titulo__icontains=busca) |
@@ -356,16 +471,26 @@ def materials_lista(request):
     if materia_id:
         materiais = materiais.filter(materia_id=materia_id)
     
-    materiais = materiais.order_by('-data_upload')
+    return materiais.order_by('-data_upload')
+
+
+@login_required
+def materials_lista(request):
+    """Lista todos os materiais didáticos."""
+    
+    # Filtros
+    busca = request.GET.get('busca', '').strip()
+    tipo = request.GET.get('tipo', '')
+    materia_id = request.GET.get('materia', '')
+    
+    materiais = _filtrar_materiais(request.GET, request.user)
     
-    # Paginação
-    paginator = Paginator(materiais, 20)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Paginação por cursor (core.paginacao); as páginas seguintes vêm de materiais_json
+    page_obj = PaginadorCursor(materiais, MATERIAIS_POR_PAGINA).pagina(request.GET.get('cursor'))
     
     # Dados para filtros
     tipos_material = MaterialDidatico.TIPO_CHOICES
-    materias = Materia.objects.filter(ativo=True).order_by('nome')
+    materias = opcoes.materias(usuario=request.user, rotulo='nome')
     
     context = {
         'page_obj': page_obj,
@@ -379,6 +504,143 @@ def materials_lista(request):
     
     return render(request, 'academico/materials_lista.html', context)
 
+
+# ==================== LISTAS EM JSON (ROLAGEM INFINITA) ====================
+
+# Só as colunas que os itens usam: filtros e paginação não precisam de mais nada
+CAMPOS_TAREFA_LISTA = (
+    'id', 'titulo', 'descricao', 'status', 'prazo', 'criado_em',
+    'materia__nome', 'materia__slug', 'materia__semestre__nome',
+)
+CAMPOS_MATERIAL_LISTA = (
+    'id', 'titulo', 'arquivo', 'tipo', 'data_upload',
+    'materia__nome', 'materia__slug', 'materia__semestre__nome',
+    'usuario__username', 'usuario__first_name', 'usuario__last_name',
+)
+
+FILTROS_MAX_AGE = 300
+
+CORES_STATUS_TAREFA = {'CONCLUIDA': 'success', 'EM_ANDAMENTO': 'info'}
+CORES_TIPO_MATERIAL = {'PDF': 'danger', 'TXT': 'info', 'DOCX': 'primary'}
+
+
+def _formatar_momento(momento, formato='%d/%m/%Y %H:%M'):
+    return timezone.localtime(momento).strftime(formato) if momento else ''
+
+
+def _prazo_tarefa(tarefa):
+    """Texto, classe e ícone do selo de prazo (como no card de todolist_geral)."""
+    dias = tarefa.dias_para_prazo
+    if dias is None:
+        return {}
+    if dias < 0:
+        texto = f'{-dias} dia{pluralize(-dias)} atrasado{pluralize(-dias)}'
+        classe, icone = 'priority-alta', 'bi-exclamation-triangle'
+    elif dias == 0:
+        texto, classe, icone = 'Vence hoje!', 'priority-alta', 'bi-alarm'
+    elif dias <= 3:
+        texto, classe, icone = f'{dias} dia{pluralize(dias)}', 'priority-media', 'bi-clock'
+    else:
+        texto, classe, icone = f'{dias} dia{pluralize(dias)}', 'priority-baixa', 'bi-calendar-check'
+    return {'selo_prazo': texto, 'selo_prazo_classe': classe, 'selo_prazo_icone': icone}
+
+
+def _tarefa_json(tarefa):
+    atrasada = tarefa.esta_atrasada
+    prazo = _formatar_momento(tarefa.prazo)
+    item = {
+        'id': tarefa.pk,
+        'titulo': tarefa.titulo,
+        'descricao': truncatewords(tarefa.descricao, 25),
+        'status': tarefa.status,
+        'status_display': tarefa.get_status_display(),
+        'status_estilo': f'background: var(--theme-{CORES_STATUS_TAREFA.get(tarefa.status, "warning")}); color: white;',
+        'classe': f'tarefa-{tarefa.status.lower()}' + (' tarefa-atrasada' if atrasada else ''),
+        'concluida': tarefa.status == 'CONCLUIDA',
+        'atrasada': atrasada,
+        'prazo': f'Atrasada - {prazo}' if atrasada else prazo,
+        'criado_em': _formatar_momento(tarefa.criado_em, '%d/%m/%Y'),
+        'materia': tarefa.materia.nome,
+        'semestre': tarefa.materia.semestre.nome,
+        'url_materia': reverse('academico:materia_detail', args=[tarefa.materia.slug]),
+        'url_editar': reverse('academico:tarefa_edit', args=[tarefa.pk]),
+    }
+    item.update(_prazo_tarefa(tarefa))
+    return item
+
+
+def _material_json(material):
+    usuario = material.usuario
+    return {
+        'id': material.pk,
+        'titulo': material.titulo,
+        'tipo': material.tipo,
+        'tipo_display': material.get_tipo_display(),
+        'tipo_estilo': f'background: var(--theme-{CORES_TIPO_MATERIAL.get(material.tipo, "success")}); color: white;',
+        'classe': f'material-{material.tipo.lower()}',
+        'tamanho': material.get_tamanho_arquivo(),
+        'data_upload': _formatar_momento(material.data_upload),
+        'materia': material.materia.nome,
+        'semestre': material.materia.semestre.nome,
+        'autor': (usuario.get_full_name() or usuario.username) if usuario else '',
+        'url_materia': reverse('academico:materia_detail', args=[material.materia.slug]),
+        'url_download': reverse('academico:material_download', args=[material.pk]),
+    }
+
+
+def _pagina_json(queryset, por_pagina, serializar, cursor):
+    page_obj = PaginadorCursor(queryset, por_pagina).pagina(cursor)
+    resposta = JsonResponse({
+        'itens': [serializar(objeto) for objeto in page_obj],
+        'proximo_cursor': page_obj.proximo_cursor,
+    })
+    patch_cache_control(resposta, private=True, no_cache=True)
+    return resposta
+
+
+@login_required
+def tarefas_json(request):
+    """
+    Página de tarefas em JSON, com os mesmos filtros e cursor de
+    todolist_geral: o front-end (main.js) busca só a lista quando um
+    filtro muda e acrescenta as páginas seguintes na rolagem, sem
+    recarregar estatísticas nem opções dos filtros.
+    """
+    tarefas = _filtrar_tarefas(request.GET, request.user).only(*CAMPOS_TAREFA_LISTA)
+    return _pagina_json(tarefas, TAREFAS_POR_PAGINA, _tarefa_json, request.GET.get('cursor'))
+
+
+@login_required
+def materiais_json(request):
+    """Página de materiais em JSON, com os mesmos filtros e cursor de materials_lista."""
+    materiais = _filtrar_materiais(request.GET, request.user).only(*CAMPOS_MATERIAL_LISTA)
+    return _pagina_json(materiais, MATERIAIS_POR_PAGINA, _material_json, request.GET.get('cursor'))
+
+
+@login_required
+def filtros_json(request):
+    """
+    Opções dos filtros das listas (semestres e matérias do usuário e
+    tipos de material), lidas do cache de academico.opcoes. Mudam pouco: o
+    front-end guarda a resposta em sessionStorage e o navegador pode
+    reaproveitá-la por FILTROS_MAX_AGE.
+    """
+    resposta = JsonResponse({
+        'semestres': [
+            {'id': pk, 'nome': nome} for pk, nome in opcoes.semestres(rotulo='nome', usuario=request.user)
+        ],
+        'materias': [
+            {'id': pk, 'nome': nome, 'semestre_id': semestre_id, 'semestre_nome': semestre_nome}
+            for pk, nome, semestre_id, semestre_nome, _, _ in opcoes.linhas_materias(request.user)
+        ],
+        'tipos_material': [
+            {'id': valor, 'nome': rotulo} for valor, rotulo in MaterialDidatico.TIPO_CHOICES
+        ],
+    })
+    patch_cache_control(resposta, private=True, max_age=FILTROS_MAX_AGE)
+    return resposta
+
+
 # ==================== VIEWS DE HORÁRIOS DE AULA ====================
 
 @login_required
@@ -412,33 +674,16 @@ def horario_create(request, slug):
         return redirect('semestres_lista')
     
     if request.method == 'POST':
-        form = HorarioAulaForm(request.POST)
+        form = HorarioAulaForm(request.POST, materia=materia)
         if form.is_valid():
             horario = form.save(commit=False)
             horario.materia = materia
             
-            # Verificar se já existe horário conflitante
-            conflito = HorarioAula.objects.filter(
-                materia=materia,
-                dia_semana=horario.dia_semana,
-                ativo=True
-            ).filter(
-                Q(hora_inicio__lt=horario.hora_fim, hora_fim__gt=horario.hora_inicio)
-            ).exists()
-            
-            if conflito:
-                messages.error(request, 'Já existe um horário conflitante para este dia e horário.')
-                return render(request, 'academico/horario_form.html', {
-                    'form': form,
-                    'materia': materia,
-                    'titulo_pagina': 'Novo Horário'
-                })
-            
             horario.save()
             messages.success(request, f'Horário de {horario.get_dia_semana_display()} criado com sucesso!')
             return redirect('academico:horarios_materia', slug=materia.slug)
     else:
-        form = HorarioAulaForm()
+        form = HorarioAulaForm(materia=materia)
     
     context = {
         'form': form,
@@ -459,33 +704,15 @@ def horario_edit(request, pk):
         return redirect('semestres_lista')
     
     if request.method == 'POST':
-        form = HorarioAulaForm(request.POST, instance=horario)
+        form = HorarioAulaForm(request.POST, instance=horario, materia=horario.materia)
         if form.is_valid():
             horario_editado = form.save(commit=False)
             
-            # Verificar conflitos (excluindo o próprio horário)
-            conflito = HorarioAula.objects.filter(
-                materia=horario.materia,
-                dia_semana=horario_editado.dia_semana,
-                ativo=True
-            ).exclude(pk=horario.pk).filter(
-                Q(hora_inicio__lt=horario_editado.hora_fim, hora_fim__gt=horario_editado.hora_inicio)
-            ).exists()
-            
-            if conflito:
-                messages.error(request, 'Já existe um horário conflitante para este dia e horário.')
-                return render(request, 'academico/horario_form.html', {
-                    'form': form,
-                    'horario': horario,
-                    'materia': horario.materia,
-                    'titulo_pagina': 'Editar Horário'
-                })
-            
             horario_editado.save()
             messages.success(request, f'Horário de {horario_editado.get_dia_semana_display()} atualizado com sucesso!')
             return redirect('academico:horarios_materia', slug=horario.materia.slug)
     else:
-        form = HorarioAulaForm(instance=horario)
+        form = HorarioAulaForm(instance=horario, materia=horario.materia)
     
     context = {
         'form': form,
@@ -520,3 +747,54 @@ def horario_delete(request, pk):
     }
     
     return render(request, 'academico/horario_delete.html', context)
+
+
+
+@staff_member_required
+def semestre_virada(request, pk):
+    """Virada de semestre: copia matérias, horários e eventos recorrentes."""
+    
+    semestre = get_object_or_404(Semestre, pk=pk, ativo=True)
+    
+    if request.method == 'POST':
+        form = VirarSemestreForm(request.POST)
+        if form.is_valid():
+            dados = form.cleaned_data
+            try:
+                resultado = virar_semestres(
+                    [semestre],
+                    dados['ano'],
+                    dados['periodo'],
+                    dados['data_inicio'],
+                    dados['data_fim'],
+                    nome=dados['nome'],
+                    eventos=dados['eventos'],
+                    desativar_origem=dados['desativar_origem'],
+                )
+            except ErroVirada as erro:
+                form.add_error(None, str(erro))
+            else:
+                resumo = resultado.resumo()
+                messages.success(
+                    request,
+                    f'Semestre criado com {resumo["materias"]} matéria(s), {resumo["horarios"]} horário(s) '
+                    f'e {resumo["eventos"]} evento(s) recorrente(s).'
+                )
+                return redirect('semestre_detail', pk=resultado.semestres[0].pk)
+    else:
+        # Sugere o período seguinte
+        if semestre.periodo == '1':
+            ano, periodo = semestre.ano, '2'
+        else:
+            ano, periodo = semestre.ano + 1, '1'
+        form = VirarSemestreForm(initial={'ano': ano, 'periodo': periodo, 'nome': f'{ano}.{periodo}'})
+    
+    context = {
+        'form': form,
+        'semestre': semestre,
+        'materias': semestre.materias.filter(ativo=True).count(),
+        'horarios': HorarioAula.objects.filter(materia__semestre=semestre, materia__ativo=True, ativo=True).count(),
+        'titulo_pagina': f'Virada de Semestre - {semestre.nome}'
+    }
+    
+    return render(request, 'academico/semestre_virada.html', context)
@@ -0,0 +1,171 @@
+"""
+Virada de semestre: copia matérias, horários de aula e (opcionalmente)
+as séries de eventos recorrentes de um ou mais semestres para novos
+semestres, em lote e numa única transação.
+
+Cada etapa é um SELECT e um bulk_create, independente do número de
+matérias; os slugs das cópias saem de academico.slugs (uma leitura dos
+slugs existentes quando a virada é grande).
+
+As séries recorrentes são deslocadas por semanas inteiras (do início do
+semestre de origem ao início do novo), para cair nos mesmos dias da
+semana, e terminam no máximo no fim do novo semestre. Séries sem data
+final já continuam no novo semestre e não são copiadas.
+"""
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from users.estatisticas import ajustar_por_usuario
+
+from .models import HorarioAula, Materia, Semestre
+from .opcoes import invalidar_opcoes
+from .slugs import criar_em_lote
+
+
+class ErroVirada(ValueError):
+    """Virada impossível (ex.: o usuário já tem o semestre de destino)."""
+
+
+class ResultadoVirada:
+    """Semestres criados e quantidades copiadas."""
+
+    def __init__(self):
+        self.semestres = []
+        self.materias = 0
+        self.horarios = 0
+        self.eventos = 0
+        self.series_sem_fim = 0
+
+    def resumo(self):
+        return {
+            'semestres': len(self.semestres),
+            'materias': self.materias,
+            'horarios': self.horarios,
+            'eventos': self.eventos,
+            'series_sem_fim': self.series_sem_fim,
+        }
+
+
+def deslocamento(origem, data_inicio):
+    """Semanas inteiras entre o início da origem e `data_inicio`."""
+    return timedelta(weeks=round((data_inicio - origem.data_inicio).days / 7))
+
+
+@transaction.atomic
+def virar_semestres(origens, ano, periodo, data_inicio, data_fim, nome=None,
+                    eventos=False, desativar_origem=False, lote=1000):
+    """
+    Cria, para cada semestre de `origens`, um semestre `ano`/`periodo` do
+    mesmo usuário com cópias das matérias e horários ativos.
+    """
+    from calendario.ics import invalidar_calendario
+    from calendario.models import EventoCalendario, RecorrenciaEvento
+    from calendario.tarefas_assincronas import estender_lembretes, replanejar_estudos
+
+    origens = list(origens)
+    usuarios = [origem.usuario_id for origem in origens]
+    if len(set(usuarios)) < len(usuarios):
+        raise ErroVirada('Há mais de um semestre de origem do mesmo usuário.')
+    if Semestre.objects.filter(usuario_id__in=usuarios, ano=ano, periodo=periodo).exists():
+        raise ErroVirada(f'Já existe semestre {ano}/{periodo} para algum dos usuários.')
+
+    resultado = ResultadoVirada()
+    novos = {
+        origem.pk: Semestre(
+            usuario_id=origem.usuario_id,
+            nome=nome or f'{ano}.{periodo}',
+            ano=ano,
+            periodo=periodo,
+            data_inicio=data_inicio,
+            data_fim=data_fim,
+        )
+        for origem in origens
+    }
+    resultado.semestres = Semestre.objects.bulk_create(novos.values(), batch_size=lote)
+
+    # Matérias: as cópias ganham slugs novos; o mapa liga a original à cópia
+    copias, semestre_da_materia = {}, {}
+    for materia in Materia.objects.filter(semestre__in=origens, ativo=True).only('nome', 'descricao', 'semestre'):
+        copias[materia.pk] = Materia(
+            semestre=novos[materia.semestre_id],
+            nome=materia.nome,
+            descricao=materia.descricao,
+        )
+        semestre_da_materia[materia.pk] = materia.semestre_id
+    criar_em_lote(list(copias.values()), batch_size=lote)
+    resultado.materias = len(copias)
+
+    horarios = [
+        HorarioAula(
+            materia=copias[horario['materia_id']],
+            dia_semana=horario['dia_semana'],
+            hora_inicio=horario['hora_inicio'],
+            hora_fim=horario['hora_fim'],
+            local=horario['local'],
+            observacoes=horario['observacoes'],
+        )
+        for horario in HorarioAula.objects.filter(materia_id__in=copias, ativo=True).values(
+            'materia_id', 'dia_semana', 'hora_inicio', 'hora_fim', 'local', 'observacoes'
+        )
+    ]
+    HorarioAula.objects.bulk_create(horarios, batch_size=lote)
+    resultado.horarios = len(horarios)
+
+    if eventos:
+        por_pk = {origem.pk: origem for origem in origens}
+        novos_eventos, recorrencias = [], []
+        series = EventoCalendario.objects.filter(
+            materia_id__in=copias, recorrencia__isnull=False, gerado_automaticamente=False
+        ).select_related('recorrencia')
+        for evento in series:
+            recorrencia = evento.recorrencia
+            if recorrencia.data_fim_recorrencia is None:
+                resultado.series_sem_fim += 1
+                continue
+            origem = por_pk[semestre_da_materia[evento.materia_id]]
+            if timezone.localdate(evento.data_inicio) > origem.data_fim:
+                continue
+            delta = deslocamento(origem, data_inicio)
+            copia = EventoCalendario(
+                titulo=evento.titulo,
+                descricao=evento.descricao,
+                data_inicio=evento.data_inicio + delta,
+                data_fim=evento.data_fim + delta,
+                tipo_evento=evento.tipo_evento,
+                materia=copias[evento.materia_id],
+                usuario_id=evento.usuario_id,
+                cor_personalizada=evento.cor_personalizada,
+                lembrete=evento.lembrete,
+                tempo_lembrete=evento.tempo_lembrete,
+            )
+            novos_eventos.append(copia)
+            recorrencias.append(RecorrenciaEvento(
+                evento=copia,
+                tipo_recorrencia=recorrencia.tipo_recorrencia,
+                intervalo=recorrencia.intervalo,
+                dias_semana=recorrencia.dias_semana,
+                data_fim_recorrencia=min(recorrencia.data_fim_recorrencia + delta, data_fim),
+            ))
+        EventoCalendario.objects.bulk_create(novos_eventos, batch_size=lote)
+        RecorrenciaEvento.objects.bulk_create(recorrencias, batch_size=lote)
+        ajustar_por_usuario('total_eventos', (evento.usuario_id for evento in novos_eventos))
+        resultado.eventos = len(novos_eventos)
+
+    if desativar_origem:
+        Semestre.objects.filter(pk__in=[origem.pk for origem in origens]).update(ativo=False)
+
+    # bulk_create não dispara os sinais do calendário (feed ICS e lembretes)
+    # nem os das opções dos selects
+    def invalidar():
+        invalidar_opcoes()
+        for usuario_id in usuarios:
+            invalidar_calendario(usuario_id)
+    transaction.on_commit(invalidar)
+    if resultado.eventos:
+        estender_lembretes.enfileirar()
+    if resultado.horarios or resultado.eventos:
+        replanejar_estudos.enfileirar_lote((usuario_id,) for usuario_id in usuarios)
+    return resultado
@@ -5,7 +5,11 @@ Este módulo fornece uma interface de alto nível para interagir com os agentes,
 abstraindo a complexidade da escolha e configuração dos diferentes tipos.
 """
 
+import time
+from contextlib import contextmanager
 from typing import Dict, Any, Optional
+
+from core.metricas import agente_chamadas_total, agente_duracao
 from .provedores import AgenteFactory, BaseAgente
 
 
@@ -25,8 +29,9 @@ class ServicoAgente:
         Returns:
             Resposta do agente
         """
-        agente = self._get_agente('home')
-        return agente.responder(pergunta)
+        with self._medir('home'):
+            agente = self._get_agente('home')
+            return agente.responder(pergunta)
     
     def responder_semestre(self, pergunta: str, semestre_id: int) -> str:
         """
@@ -41,19 +46,21 @@ class ServicoAgente:
         """
         from academico.models import Semestre
         
-        try:
-            semestre = Semestre.objects.get(id=semestre_id)
-            agente = self._get_agente('semestre')
-            
-            contexto = {
-                'semestre': semestre,
-                'semestre_id': semestre_id
-            }
-            
-            return agente.responder(pergunta, contexto)
-            
-        except Semestre.DoesNotExist:
-            return "Erro: Semestre não encontrado."
+        with self._medir('semestre') as chamada:
+            try:
+                semestre = Semestre.objects.get(id=semestre_id)
+                agente = self._get_agente('semestre')
+                
+                contexto = {
+                    'semestre': semestre,
+                    'semestre_id': semestre_id
+                }
+                
+                return agente.responder(pergunta, contexto)
+                
+            except Semestre.DoesNotExist:
+                chamada['resultado'] = 'nao_encontrado'
+                return "Erro: Semestre não encontrado."
     
     def responder_materia(self, pergunta: str, materia_slug: str) -> str:
         """
@@ -68,19 +75,40 @@ class ServicoAgente:
         """
         from academico.models import Materia
         
+        with self._medir('materia') as chamada:
+            try:
+                materia = Materia.objects.get(slug=materia_slug)
+                agente = self._get_agente('materia')
+                
+                contexto = {
+                    'materia': materia,
+                    'materia_slug': materia_slug
+                }
+                
+                return agente.responder(pergunta, contexto)
+                
+            except Materia.DoesNotExist:
+                chamada['resultado'] = 'nao_encontrado'
+                return "Erro: Matéria não encontrada."
+    
+    @contextmanager
+    def _medir(self, tipo: str):
+        """
+        Registra latência e resultado da chamada nas métricas do agente.
+        
+        Args:
+            tipo: Tipo do agente (home, semestre, materia)
+        """
+        chamada = {'resultado': 'sucesso'}
+        inicio = time.perf_counter()
         try:
-            materia = Materia.objects.get(slug=materia_slug)
-            agente = self._get_agente('materia')
-            
-            contexto = {
-                'materia': materia,
-                'materia_slug': materia_slug
-            }
-            
-            return agente.responder(pergunta, contexto)
-            
-        except Materia.DoesNotExist:
-            return "Erro: Matéria não encontrada."
+            yield chamada
+        except Exception:
+            chamada['resultado'] = 'erro'
+            raise
+        finally:
+            agente_duracao.observar(time.perf_counter() - inicio, tipo_agente=tipo)
+            agente_chamadas_total.inc(tipo_agente=tipo, resultado=chamada['resultado'])
     
     def _get_agente(self, tipo: str) -> BaseAgente:
         """
@@ -17,6 +17,7 @@ from django.urls import reverse
 
 # Views de autenticação customizadas
 from core.views_auth import RegistroView
+from users.views import variante_avatar
 
 # Configurar títulos do admin
 admin.site.site_header = 'Assistente de Estudos - Administração'
@@ -48,7 +49,12 @@ urlpatterns = [
     # path('auth/', include('django.contrib.auth.urls')),  # Removido para evitar conflito
 ]
 
-# Servir arquivos de media em desenvolvimento
+# Servir arquivos de media em desenvolvimento (em produção o servidor web
+# entrega MEDIA_URL e define o Cache-Control das variantes de avatar)
 if settings.DEBUG:
+    # Variantes de avatar com cache longo (antes do static() de media)
+    urlpatterns += [
+        path(f'{settings.MEDIA_URL.lstrip("/")}avatars/variantes/<path:caminho>', variante_avatar, name='variante_avatar'),
+    ]
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
@@ -14,3 +14,10 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "assistente_estudo.settings")
 
 application = get_wsgi_application()
+
+from django.conf import settings  # noqa: E402
+
+if settings.TEMPLATE_CACHE and settings.TEMPLATE_PRECOMPILE:
+    from core.templates_cache import precompilar  # noqa: E402
+
+    precompilar()
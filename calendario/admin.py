@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import EventoCalendario, RecorrenciaEvento
+from .models import EventoCalendario, LembreteEvento, RecorrenciaEvento
 
 @admin.register(EventoCalendario)
 class EventoCalendarioAdmin(admin.ModelAdmin):
@@ -49,4 +49,13 @@ class RecorrenciaEventoAdmin(admin.ModelAdmin):
     def get_queryset(self, request):
         return super().get_queryset(request).select_related('evento')
 
-
+@admin.register(LembreteEvento)
+class LembreteEventoAdmin(admin.ModelAdmin):
+    list_display = ['evento', 'usuario', 'ocorrencia', 'disparar_em', 'enviado_em']
+    list_filter = ['enviado_em']
+    search_fields = ['evento__titulo', 'usuario__username']
+    date_hierarchy = 'disparar_em'
+    raw_id_fields = ['evento', 'usuario']
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('evento', 'usuario')
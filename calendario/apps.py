@@ -5,3 +5,6 @@ class CalendarioConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'calendario'
     verbose_name = 'Calendário Acadêmico'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -2,7 +2,10 @@ from django import forms
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from .models import EventoCalendario, RecorrenciaEvento
+from .importacao import formato_do_arquivo
+from academico import opcoes
 from academico.models import Materia
+from academico.opcoes import aplicar_escolhas
 import datetime
 
 class EventoCalendarioForm(forms.ModelForm):
@@ -79,6 +82,9 @@ class EventoCalendarioForm(forms.ModelForm):
         # Adicionar opção vazia para matéria
         self.fields['materia'].empty_label = "Selecione uma matéria (opcional)"
         
+        # Opções exibidas vêm do cache (academico.opcoes); o queryset só valida
+        aplicar_escolhas(self.fields['materia'], opcoes.materias())
+        
         # Definir valores iniciais de data/hora apenas se for um novo evento 
         # e não foram fornecidos valores iniciais
         if not self.instance.pk and not args and not kwargs.get('initial'):
@@ -212,3 +218,26 @@ class FiltroEventosForm(forms.Form):
             self.fields['materia'].queryset = Materia.objects.filter(
                 semestre__usuario=user
             ).order_by('nome')
+            aplicar_escolhas(self.fields['materia'], opcoes.materias(usuario=user))
+
+class ImportacaoCalendarioForm(forms.Form):
+    """Upload de arquivo CSV ou ICS para importação em lote"""
+    
+    arquivo = forms.FileField(
+        label=_('Arquivo (.csv ou .ics)'),
+        widget=forms.ClearableFileInput(attrs={
+            'class': 'form-control',
+            'accept': '.csv,.ics'
+        })
+    )
+    somente_validar = forms.BooleanField(
+        label=_('Apenas validar (não gravar nada)'),
+        required=False,
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
+    )
+    
+    def clean_arquivo(self):
+        arquivo = self.cleaned_data['arquivo']
+        if formato_do_arquivo(arquivo.name) is None:
+            raise forms.ValidationError(_('Envie um arquivo .csv ou .ics.'))
+        return arquivo
@@ -0,0 +1,293 @@
+"""
+Feed iCalendar (RFC 5545) por usuário, para assinatura em apps de calendário.
+
+O feed reúne EventoCalendario (recorrências como RRULE, sem expandir),
+horários de aula semanais e eventos da agenda acadêmica. O endereço leva
+um token assinado com o id do usuário, então o feed dispensa login.
+
+O ETag vem de marcas d'água do banco (última alteração e totais dos
+eventos, conteúdo das recorrências, horários, agenda e matérias), como em
+eventos_feed: os clientes que consultam o feed a cada 15 minutos recebem
+304 com poucas consultas agregadas, sem gerar o calendário. Com um cache
+compartilhado (CACHE_COMPARTILHADO) a versão fica guardada no cache e é
+descartada pelos sinais de calendario.signals, então o 304 sai sem
+nenhuma consulta e o Last-Modified é confiável; com locmem/file a
+invalidação não chegaria aos outros workers e a versão é sempre recalculada.
+"""
+
+import hashlib
+import json
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core import signing
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from academico.models import EventoAgenda, HorarioAula, Materia
+from .models import EventoCalendario, RecorrenciaEvento
+from .recorrencia import dias_semana
+
+SALT_TOKEN = 'calendario.ics'
+DOMINIO_UID = 'assistente-estudo'
+DIAS_ICS = ['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU']
+FREQUENCIAS = {
+    RecorrenciaEvento.TipoRecorrencia.DIARIA: ('DAILY', 1),
+    RecorrenciaEvento.TipoRecorrencia.SEMANAL: ('WEEKLY', 1),
+    RecorrenciaEvento.TipoRecorrencia.QUINZENAL: ('WEEKLY', 2),
+    RecorrenciaEvento.TipoRecorrencia.MENSAL: ('MONTHLY', 1),
+    RecorrenciaEvento.TipoRecorrencia.ANUAL: ('YEARLY', 1),
+}
+
+
+# ------------------------------------------------------------------ token
+
+def token_usuario(user):
+    """Token assinado que identifica o usuário na URL do feed."""
+    return signing.dumps(user.pk, salt=SALT_TOKEN)
+
+
+def usuario_do_token(token):
+    """Id do usuário do token, ou None se a assinatura for inválida."""
+    try:
+        return signing.loads(token, salt=SALT_TOKEN)
+    except signing.BadSignature:
+        return None
+
+
+# ----------------------------------------------------------------- versão
+
+def chave_versao(user_id):
+    return f'calendario:ics:versao:{user_id}'
+
+
+def versao_dados(user_id):
+    """
+    Retorna (etag, modificado_em) calculados no banco, ou None se o usuário
+    não existe.
+
+    EventoCalendario tem atualizado_em, então basta a marca d'água e o
+    total; as demais tabelas não têm, então entram os campos que vão para o
+    feed. modificado_em (usado no DTSTAMP) é a última alteração dos eventos
+    ou o cadastro do usuário, estável enquanto os dados não mudam.
+    """
+    usuario = (
+        get_user_model().objects.filter(pk=user_id)
+        .values_list('username', 'first_name', 'last_name', 'date_joined').first()
+    )
+    if usuario is None:
+        return None
+    eventos = EventoCalendario.objects.filter(usuario_id=user_id).aggregate(
+        marca=Max('atualizado_em'), total=Count('id'),
+    )
+    recorrencias = (
+        RecorrenciaEvento.objects.filter(evento__usuario_id=user_id).order_by('evento_id')
+        .values_list('evento_id', 'tipo_recorrencia', 'intervalo', 'dias_semana', 'data_fim_recorrencia')
+    )
+    horarios = (
+        HorarioAula.objects.filter(ativo=True, materia__semestre__usuario_id=user_id).order_by('id')
+        .values_list(
+            'id', 'materia_id', 'dia_semana', 'hora_inicio', 'hora_fim', 'local', 'observacoes',
+            'materia__semestre__data_inicio', 'materia__semestre__data_fim',
+        )
+    )
+    agenda = (
+        EventoAgenda.objects.filter(usuario_id=user_id).order_by('id')
+        .values_list('id', 'materia_id', 'titulo', 'descricao', 'tipo', 'data_inicio', 'data_fim', 'criado_em')
+    )
+    materias = Materia.objects.filter(semestre__usuario_id=user_id).order_by('id').values_list('id', 'nome')
+    dados = [usuario[:3], eventos['marca'], eventos['total'], list(recorrencias), list(horarios), list(agenda), list(materias)]
+    etag = hashlib.md5(json.dumps(dados, default=str).encode()).hexdigest()
+    modificado_em = max(filter(None, [eventos['marca'], usuario[3]]))
+    return etag, int(modificado_em.timestamp())
+
+
+def versao_calendario(user_id):
+    """
+    Retorna (etag, modificado_em) do calendário do usuário, ou None se o
+    usuário não existe.
+
+    Com cache compartilhado a versão fica no cache até um sinal descartá-la;
+    ao ser criada, modificado_em é o horário atual, que é sempre >= a
+    última alteração. Sem ele a versão vem de versao_dados a cada consulta.
+    """
+    if not settings.CACHE_COMPARTILHADO:
+        return versao_dados(user_id)
+    chave = chave_versao(user_id)
+    versao = cache.get(chave)
+    if versao is None:
+        dados = versao_dados(user_id)
+        if dados is None:
+            return None
+        versao = {'etag': dados[0], 'modificado_em': int(timezone.now().timestamp())}
+        cache.set(chave, versao, settings.ICS_FEED_VERSION_TIMEOUT)
+    return versao['etag'], versao['modificado_em']
+
+
+def invalidar_calendario(user_id):
+    """Descarta a versão do calendário (chamado pelos sinais de alteração)."""
+    cache.delete(chave_versao(user_id))
+
+
+# ------------------------------------------------------------- formatação
+
+def _escapar(texto):
+    return (
+        str(texto).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+        .replace('\r\n', '\\n').replace('\n', '\\n')
+    )
+
+
+def _dobrar(linha):
+    """Quebra a linha em blocos de até 75 octetos (RFC 5545, 3.1)."""
+    if len(linha.encode('utf-8')) <= 75:
+        return linha + '\r\n'
+    partes, atual, tamanho = [], '', 0
+    for caractere in linha:
+        octetos = len(caractere.encode('utf-8'))
+        if tamanho + octetos > (75 if not partes else 74):
+            partes.append(atual)
+            atual, tamanho = '', 0
+        atual += caractere
+        tamanho += octetos
+    partes.append(atual)
+    return '\r\n '.join(partes) + '\r\n'
+
+
+def _utc(momento):
+    return momento.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def _local(momento):
+    return f';TZID={settings.TIME_ZONE}:' + timezone.localtime(momento).strftime('%Y%m%dT%H%M%S')
+
+
+def _fim_do_dia(data):
+    """Último instante do dia (local) em UTC, para o UNTIL das RRULEs."""
+    return _utc(timezone.make_aware(datetime.combine(data, time(23, 59, 59))))
+
+
+def _vtimezone():
+    """VTIMEZONE com o deslocamento atual de TIME_ZONE (America/Sao_Paulo não tem horário de verão desde 2019)."""
+    deslocamento = timezone.localtime().utcoffset()
+    minutos = int(deslocamento.total_seconds() // 60)
+    sinal = '-' if minutos < 0 else '+'
+    offset = f'{sinal}{abs(minutos) // 60:02d}{abs(minutos) % 60:02d}'
+    yield 'BEGIN:VTIMEZONE'
+    yield f'TZID:{settings.TIME_ZONE}'
+    yield 'BEGIN:STANDARD'
+    yield 'DTSTART:19700101T000000'
+    yield f'TZOFFSETFROM:{offset}'
+    yield f'TZOFFSETTO:{offset}'
+    yield 'END:STANDARD'
+    yield 'END:VTIMEZONE'
+
+
+def _rrule(recorrencia, primeiro):
+    frequencia, multiplicador = FREQUENCIAS[recorrencia.tipo_recorrencia]
+    partes = [f'FREQ={frequencia}', f'INTERVAL={max(1, recorrencia.intervalo) * multiplicador}']
+    if frequencia == 'WEEKLY':
+        dias = dias_semana(recorrencia, timezone.localtime(primeiro))
+        partes.append('BYDAY=' + ','.join(DIAS_ICS[dia] for dia in dias))
+    if recorrencia.data_fim_recorrencia:
+        partes.append(f'UNTIL={_fim_do_dia(recorrencia.data_fim_recorrencia)}')
+    return 'RRULE:' + ';'.join(partes)
+
+
+# -------------------------------------------------------------- componentes
+
+def _eventos_calendario(user_id):
+    eventos = (
+        EventoCalendario.objects.filter(usuario_id=user_id)
+        .select_related('materia', 'recorrencia')
+        .order_by('id')
+    )
+    for evento in eventos.iterator(chunk_size=500):
+        yield 'BEGIN:VEVENT'
+        yield f'UID:evento-{evento.id}@{DOMINIO_UID}'
+        yield f'DTSTAMP:{_utc(evento.atualizado_em)}'
+        yield f'LAST-MODIFIED:{_utc(evento.atualizado_em)}'
+        yield f'DTSTART{_local(evento.data_inicio)}'
+        yield f'DTEND{_local(evento.data_fim)}'
+        yield f'SUMMARY:{_escapar(evento.titulo)}'
+        if evento.descricao:
+            yield f'DESCRIPTION:{_escapar(evento.descricao)}'
+        categorias = [evento.get_tipo_evento_display()]
+        if evento.materia:
+            categorias.append(evento.materia.nome)
+        yield 'CATEGORIES:' + ','.join(_escapar(c) for c in categorias)
+        recorrencia = getattr(evento, 'recorrencia', None)
+        if recorrencia is not None:
+            yield _rrule(recorrencia, evento.data_inicio)
+        yield 'END:VEVENT'
+
+
+def _horarios_aula(user_id, dtstamp):
+    horarios = (
+        HorarioAula.objects.filter(ativo=True, materia__semestre__usuario_id=user_id)
+        .select_related('materia__semestre')
+        .order_by('id')
+    )
+    for horario in horarios:
+        semestre = horario.materia.semestre
+        primeiro_dia = semestre.data_inicio + timedelta(
+            days=(horario.dia_semana - semestre.data_inicio.weekday()) % 7
+        )
+        inicio = timezone.make_aware(datetime.combine(primeiro_dia, horario.hora_inicio))
+        fim = timezone.make_aware(datetime.combine(primeiro_dia, horario.hora_fim))
+        yield 'BEGIN:VEVENT'
+        yield f'UID:horario-{horario.id}@{DOMINIO_UID}'
+        yield f'DTSTAMP:{dtstamp}'
+        yield f'DTSTART{_local(inicio)}'
+        yield f'DTEND{_local(fim)}'
+        yield f'RRULE:FREQ=WEEKLY;BYDAY={DIAS_ICS[horario.dia_semana]};UNTIL={_fim_do_dia(semestre.data_fim)}'
+        yield f'SUMMARY:{_escapar(horario.materia.nome)}'
+        if horario.local:
+            yield f'LOCATION:{_escapar(horario.local)}'
+        if horario.observacoes:
+            yield f'DESCRIPTION:{_escapar(horario.observacoes)}'
+        yield 'CATEGORIES:Aula'
+        yield 'END:VEVENT'
+
+
+def _eventos_agenda(user_id):
+    eventos = EventoAgenda.objects.filter(usuario_id=user_id).select_related('materia').order_by('id')
+    for evento in eventos.iterator(chunk_size=500):
+        yield 'BEGIN:VEVENT'
+        yield f'UID:agenda-{evento.id}@{DOMINIO_UID}'
+        yield f'DTSTAMP:{_utc(evento.criado_em)}'
+        yield f'DTSTART{_local(evento.data_inicio)}'
+        if evento.data_fim:
+            yield f'DTEND{_local(evento.data_fim)}'
+        titulo = f'{evento.titulo} ({evento.materia.nome})' if evento.materia else evento.titulo
+        yield f'SUMMARY:{_escapar(titulo)}'
+        if evento.descricao:
+            yield f'DESCRIPTION:{_escapar(evento.descricao)}'
+        yield f'CATEGORIES:{_escapar(evento.get_tipo_display())}'
+        yield 'END:VEVENT'
+
+
+def gerar_ics(user_id, nome, modificado_em):
+    """Gera o feed linha a linha (já dobradas e com CRLF), para streaming."""
+    dtstamp = _utc(datetime.fromtimestamp(modificado_em, tz=dt_timezone.utc))
+
+    def linhas():
+        yield 'BEGIN:VCALENDAR'
+        yield 'VERSION:2.0'
+        yield 'PRODID:-//Assistente de Estudos//Calendario//PT-BR'
+        yield 'CALSCALE:GREGORIAN'
+        yield 'METHOD:PUBLISH'
+        yield f'X-WR-CALNAME:{_escapar(f"Assistente de Estudos - {nome}")}'
+        yield f'X-WR-TIMEZONE:{settings.TIME_ZONE}'
+        yield 'REFRESH-INTERVAL;VALUE=DURATION:PT15M'
+        yield 'X-PUBLISHED-TTL:PT15M'
+        yield from _vtimezone()
+        yield from _eventos_calendario(user_id)
+        yield from _horarios_aula(user_id, dtstamp)
+        yield from _eventos_agenda(user_id)
+        yield 'END:VCALENDAR'
+
+    for linha in linhas():
+        yield _dobrar(linha)
@@ -0,0 +1,444 @@
+"""
+Importação em lote de matérias, horários de aula e eventos a partir de
+CSV ou ICS.
+
+Os arquivos são lidos linha a linha (sem carregar o conteúdo inteiro),
+cada registro é validado e os horários são checados contra a grade do
+semestre da matéria, em memória (academico.conflitos). No final, tudo o que passou na
+validação é gravado com bulk_create numa única transação; os registros
+com problema voltam como erros com o número da linha.
+
+CSV (separador "," ou ";", cabeçalho obrigatório):
+    registro      materia | horario | evento
+    materia       nome ou slug da matéria (obrigatório para horários);
+                  nas linhas "materia", o nome da matéria a criar
+    semestre      nome do semestre da nova matéria (padrão: o atual)
+    dia_semana    0-6 (0 = segunda) ou nome do dia ("segunda", "Ter", ...)
+    hora_inicio, hora_fim           HH:MM
+    local, observacoes
+    titulo, descricao, tipo_evento  (eventos)
+    data_inicio, data_fim           AAAA-MM-DD HH:MM ou DD/MM/AAAA HH:MM
+
+ICS: cada VEVENT vira um EventoCalendario (RRULE vira RecorrenciaEvento).
+Eventos semanais cujo SUMMARY é o nome de uma matéria do usuário viram
+horários de aula, um por dia do BYDAY.
+"""
+
+import csv
+import unicodedata
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.db import transaction
+from django.utils import timezone
+
+from academico.conflitos import GradeHorarios
+from academico.models import HorarioAula, Materia, Semestre
+from academico.slugs import criar_em_lote
+from users.estatisticas import ajustar
+from .ics import DIAS_ICS, invalidar_calendario
+from .models import EventoCalendario, RecorrenciaEvento
+from .tarefas_assincronas import estender_lembretes, replanejar_estudos
+
+FORMATOS = ('csv', 'ics')
+
+DIAS_POR_NOME = {'seg': 0, 'ter': 1, 'qua': 2, 'qui': 3, 'sex': 4, 'sab': 5, 'dom': 6}
+
+TIPOS_EVENTO = {valor for valor, _ in EventoCalendario.TipoEvento.choices}
+
+RECORRENCIAS_ICS = {
+    'DAILY': RecorrenciaEvento.TipoRecorrencia.DIARIA,
+    'WEEKLY': RecorrenciaEvento.TipoRecorrencia.SEMANAL,
+    'MONTHLY': RecorrenciaEvento.TipoRecorrencia.MENSAL,
+    'YEARLY': RecorrenciaEvento.TipoRecorrencia.ANUAL,
+}
+
+DURACAO_MAXIMA_AULA = timedelta(hours=8)
+
+
+class ErroLinha(ValueError):
+    """Registro inválido; a mensagem vai para o relatório da importação."""
+
+
+def formato_do_arquivo(nome):
+    """Formato pela extensão do arquivo ('csv' ou 'ics'), ou None."""
+    extensao = nome.rsplit('.', 1)[-1].lower() if '.' in nome else ''
+    return extensao if extensao in FORMATOS else None
+
+
+def _sem_acentos(texto):
+    return unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode().lower().strip()
+
+
+class ResultadoImportacao:
+    """Registros prontos para gravar e erros por linha."""
+
+    def __init__(self):
+        self.materias = []
+        self.horarios = []
+        self.eventos = []
+        self.recorrencias = []  # (evento, recorrencia)
+        self.erros = []  # (linha, mensagem)
+        self.gravado = False
+
+    def erro(self, linha, mensagem):
+        self.erros.append((linha, str(mensagem)))
+
+    def resumo(self):
+        return {
+            'materias': len(self.materias),
+            'horarios': len(self.horarios),
+            'eventos': len(self.eventos),
+            'recorrencias': len(self.recorrencias),
+            'erros': len(self.erros),
+        }
+
+
+def _sobrepostos(semestre, outro):
+    return semestre.data_inicio <= outro.data_fim and outro.data_inicio <= semestre.data_fim
+
+
+class ImportadorCalendario:
+    """Importa matérias, horários e eventos de um usuário a partir de linhas de texto."""
+
+    def __init__(self, usuario, lote=1000):
+        self.usuario = usuario
+        self.lote = lote
+        self.materias = {}
+        for materia in Materia.objects.filter(semestre__usuario=usuario, ativo=True):
+            self.materias[_sem_acentos(materia.nome)] = materia
+            self.materias[materia.slug] = materia
+        self._semestres = None
+        # Grade de cada semestre (pk -> (semestre, grade)), carregada no
+        # primeiro horário dele, e os horários aceitos nesta importação
+        self._grades = {}
+        self._horarios_novos = []
+
+    def importar(self, linhas, formato, somente_validar=False):
+        """
+        Lê `linhas` (qualquer iterável de str, como um arquivo aberto em
+        modo texto) no formato indicado e grava os registros válidos.
+        """
+        resultado = ResultadoImportacao()
+        leitor = self._registros_csv if formato == 'csv' else self._registros_ics
+        for numero, registro in leitor(linhas, resultado):
+            try:
+                self._adicionar(registro, resultado)
+            except ErroLinha as erro:
+                resultado.erro(numero, erro)
+
+        if not somente_validar:
+            self._gravar(resultado)
+        return resultado
+
+    # ---------------------------------------------------------- validação
+
+    def _materia(self, valor, obrigatoria=False):
+        materia = self.materias.get(_sem_acentos(valor or '')) or self.materias.get((valor or '').strip())
+        if materia is None and obrigatoria:
+            raise ErroLinha(f'Matéria "{valor}" não encontrada entre as suas matérias ativas.')
+        return materia
+
+    def _semestre(self, valor):
+        if self._semestres is None:
+            hoje = timezone.localdate()
+            semestres = list(Semestre.objects.filter(usuario=self.usuario, ativo=True).order_by('-data_inicio'))
+            self._semestres = {_sem_acentos(semestre.nome): semestre for semestre in reversed(semestres)}
+            # Padrão: o semestre em curso ou, sem ele, o mais recente
+            atual = next((s for s in semestres if s.data_inicio <= hoje <= s.data_fim), semestres[0] if semestres else None)
+            if atual is not None:
+                self._semestres[''] = atual
+        semestre = self._semestres.get(_sem_acentos(valor or ''))
+        if semestre is None:
+            if valor:
+                raise ErroLinha(f'Semestre "{valor}" não encontrado entre os seus semestres ativos.')
+            raise ErroLinha('Cadastre um semestre ativo antes de importar matérias.')
+        return semestre
+
+    def _grade(self, semestre):
+        if semestre.pk not in self._grades:
+            grade = GradeHorarios.do_semestre(semestre)
+            for horario in self._horarios_novos:
+                if _sobrepostos(horario.materia.semestre, semestre):
+                    grade.adicionar(horario)
+            self._grades[semestre.pk] = (semestre, grade)
+        return self._grades[semestre.pk][1]
+
+    def _aceitar_horario(self, horario):
+        """Acrescenta o horário às grades já carregadas dos semestres concorrentes."""
+        for semestre, grade in self._grades.values():
+            if _sobrepostos(horario.materia.semestre, semestre):
+                grade.adicionar(horario)
+        self._horarios_novos.append(horario)
+
+    def _adicionar(self, registro, resultado):
+        if registro['registro'] == 'materia':
+            nome = (registro.get('materia') or '').strip()
+            if not nome:
+                raise ErroLinha('Informe o nome da matéria.')
+            if _sem_acentos(nome) in self.materias:
+                raise ErroLinha(f'A matéria "{nome}" já existe.')
+            materia = Materia(
+                semestre=self._semestre(registro.get('semestre')),
+                nome=nome[:200],
+                descricao=registro.get('descricao', ''),
+            )
+            # Linhas seguintes já podem usar a matéria nova
+            self.materias[_sem_acentos(nome)] = materia
+            resultado.materias.append(materia)
+            return
+
+        if registro['registro'] == 'horario':
+            horario = HorarioAula(
+                materia=self._materia(registro.get('materia'), obrigatoria=True),
+                dia_semana=registro['dia_semana'],
+                hora_inicio=registro['hora_inicio'],
+                hora_fim=registro['hora_fim'],
+                local=registro.get('local', '')[:100],
+                observacoes=registro.get('observacoes', ''),
+            )
+            if horario.hora_fim <= horario.hora_inicio:
+                raise ErroLinha('O horário de término deve ser posterior ao horário de início.')
+            duracao = datetime.combine(datetime.min, horario.hora_fim) - datetime.combine(datetime.min, horario.hora_inicio)
+            if duracao > DURACAO_MAXIMA_AULA:
+                raise ErroLinha('A aula não pode durar mais de 8 horas.')
+            conflito = self._grade(horario.materia.semestre).conflito(horario)
+            if conflito is not None:
+                raise ErroLinha(f'Conflita com {conflito}.')
+            self._aceitar_horario(horario)
+            resultado.horarios.append(horario)
+            return
+
+        titulo = (registro.get('titulo') or '').strip()
+        if not titulo:
+            raise ErroLinha('Informe o título do evento.')
+        tipo = _sem_acentos(registro.get('tipo_evento') or '') or EventoCalendario.TipoEvento.OUTRO
+        if tipo not in TIPOS_EVENTO:
+            raise ErroLinha(f'Tipo de evento "{registro["tipo_evento"]}" inválido.')
+        inicio = registro['data_inicio']
+        fim = registro.get('data_fim') or inicio + timedelta(hours=1)
+        if fim <= inicio:
+            raise ErroLinha('A data de término deve ser posterior à data de início.')
+
+        evento = EventoCalendario(
+            usuario=self.usuario,
+            titulo=titulo[:200],
+            descricao=registro.get('descricao', ''),
+            data_inicio=inicio,
+            data_fim=fim,
+            tipo_evento=tipo,
+            materia=self._materia(registro.get('materia')),
+        )
+        resultado.eventos.append(evento)
+        if registro.get('recorrencia'):
+            resultado.recorrencias.append((evento, registro['recorrencia']))
+
+    # ----------------------------------------------------------------- CSV
+
+    def _registros_csv(self, linhas, resultado):
+        linhas = iter(linhas)
+        try:
+            cabecalho = next(linhas)
+        except StopIteration:
+            return
+        delimitador = ';' if cabecalho.count(';') > cabecalho.count(',') else ','
+        leitor = csv.reader(linhas, delimiter=delimitador)
+        campos = [_sem_acentos(campo) for campo in next(csv.reader([cabecalho], delimiter=delimitador))]
+
+        for valores in leitor:
+            numero = leitor.line_num + 1
+            if not any(valor.strip() for valor in valores):
+                continue
+            bruto = {campo: valor.strip() for campo, valor in zip(campos, valores)}
+            try:
+                yield numero, self._converter_csv(bruto)
+            except ErroLinha as erro:
+                resultado.erro(numero, erro)
+
+    def _converter_csv(self, bruto):
+        tipo = _sem_acentos(bruto.get('registro', ''))
+        if tipo not in ('materia', 'horario', 'evento'):
+            raise ErroLinha('A coluna "registro" deve ser "materia", "horario" ou "evento".')
+        registro = dict(bruto, registro=tipo)
+        if tipo == 'horario':
+            registro['dia_semana'] = _dia_semana(bruto.get('dia_semana', ''))
+            registro['hora_inicio'] = _hora(bruto.get('hora_inicio', ''))
+            registro['hora_fim'] = _hora(bruto.get('hora_fim', ''))
+        elif tipo == 'evento':
+            registro['data_inicio'] = _data_hora(bruto.get('data_inicio', ''))
+            registro['data_fim'] = _data_hora(bruto['data_fim']) if bruto.get('data_fim') else None
+        return registro
+
+    # ----------------------------------------------------------------- ICS
+
+    def _registros_ics(self, linhas, resultado):
+        evento, numero = None, 0
+        for numero_linha, nome, parametros, valor in _propriedades_ics(linhas):
+            if nome == 'BEGIN' and valor == 'VEVENT':
+                evento, numero = {}, numero_linha
+            elif nome == 'END' and valor == 'VEVENT' and evento is not None:
+                try:
+                    yield from ((numero, registro) for registro in self._converter_ics(evento))
+                except ErroLinha as erro:
+                    resultado.erro(numero, erro)
+                evento = None
+            elif evento is not None:
+                evento[nome] = (parametros, valor)
+
+    def _converter_ics(self, evento):
+        if 'DTSTART' not in evento:
+            raise ErroLinha('VEVENT sem DTSTART.')
+        inicio, dia_inteiro = _data_ics(*evento['DTSTART'])
+        if 'DTEND' in evento:
+            fim, _ = _data_ics(*evento['DTEND'])
+        else:
+            fim = inicio + (timedelta(days=1) if dia_inteiro else timedelta(hours=1))
+        titulo = _texto_ics(evento.get('SUMMARY', ({}, ''))[1])
+        descricao = _texto_ics(evento.get('DESCRIPTION', ({}, ''))[1])
+        local = _texto_ics(evento.get('LOCATION', ({}, ''))[1])
+        regra = _rrule(evento['RRULE'][1]) if 'RRULE' in evento else {}
+
+        # Série semanal de uma matéria = horário de aula
+        materia = self._materia(titulo)
+        if regra.get('FREQ') == 'WEEKLY' and materia is not None and not dia_inteiro:
+            inicio_local, fim_local = timezone.localtime(inicio), timezone.localtime(fim)
+            dias = [DIAS_ICS.index(dia[-2:]) for dia in regra.get('BYDAY', '').split(',') if dia[-2:] in DIAS_ICS]
+            for dia in dias or [inicio_local.weekday()]:
+                yield {
+                    'registro': 'horario',
+                    'materia': titulo,
+                    'dia_semana': dia,
+                    'hora_inicio': inicio_local.time().replace(tzinfo=None),
+                    'hora_fim': fim_local.time().replace(tzinfo=None),
+                    'local': local,
+                    'observacoes': descricao,
+                }
+            return
+
+        registro = {
+            'registro': 'evento',
+            'titulo': titulo,
+            'descricao': descricao if not local else f'{descricao}\nLocal: {local}'.strip(),
+            'data_inicio': inicio,
+            'data_fim': fim,
+            'materia': titulo if materia else None,
+        }
+        if regra.get('FREQ') in RECORRENCIAS_ICS:
+            dias = [str(DIAS_ICS.index(dia[-2:]) + 1) for dia in regra.get('BYDAY', '').split(',') if dia[-2:] in DIAS_ICS]
+            registro['recorrencia'] = RecorrenciaEvento(
+                tipo_recorrencia=RECORRENCIAS_ICS[regra['FREQ']],
+                intervalo=_intervalo(regra.get('INTERVAL')),
+                dias_semana=','.join(dias),
+                data_fim_recorrencia=timezone.localdate(_data_ics({}, regra['UNTIL'])[0]) if regra.get('UNTIL') else None,
+            )
+        yield registro
+
+    # ------------------------------------------------------------- gravação
+
+    @transaction.atomic
+    def _gravar(self, resultado):
+        # Slugs alocados em lote, uma consulta por nome-base (academico.slugs)
+        criar_em_lote(resultado.materias, batch_size=self.lote)
+        HorarioAula.objects.bulk_create(resultado.horarios, batch_size=self.lote)
+        EventoCalendario.objects.bulk_create(resultado.eventos, batch_size=self.lote)
+        ajustar(self.usuario.pk, total_eventos=len(resultado.eventos))
+        for evento, recorrencia in resultado.recorrencias:
+            recorrencia.evento = evento
+        RecorrenciaEvento.objects.bulk_create(
+            [recorrencia for _, recorrencia in resultado.recorrencias], batch_size=self.lote
+        )
+        # bulk_create não dispara os sinais que renovam o feed ICS,
+        # agendam os lembretes e contam os eventos do perfil (acima); o
+        # plano de estudos também fica desatualizado
+        transaction.on_commit(lambda: invalidar_calendario(self.usuario.pk))
+        estender_lembretes.enfileirar()
+        replanejar_estudos.enfileirar(self.usuario.pk)
+        resultado.gravado = True
+
+
+# ---------------------------------------------------------------- conversão
+
+def _dia_semana(valor):
+    if valor.isdigit() and 0 <= int(valor) <= 6:
+        return int(valor)
+    dia = DIAS_POR_NOME.get(_sem_acentos(valor)[:3])
+    if dia is None:
+        raise ErroLinha(f'Dia da semana "{valor}" inválido.')
+    return dia
+
+
+def _hora(valor):
+    try:
+        return time.fromisoformat(valor.strip().zfill(5))
+    except ValueError:
+        raise ErroLinha(f'Horário "{valor}" inválido (use HH:MM).')
+
+
+def _data_hora(valor):
+    for formato in ('%Y-%m-%d %H:%M', '%Y-%m-%dT%H:%M', '%d/%m/%Y %H:%M', '%Y-%m-%d', '%d/%m/%Y'):
+        try:
+            return timezone.make_aware(datetime.strptime(valor.strip(), formato))
+        except ValueError:
+            continue
+    raise ErroLinha(f'Data "{valor}" inválida (use AAAA-MM-DD HH:MM ou DD/MM/AAAA HH:MM).')
+
+
+def _propriedades_ics(linhas):
+    """Desdobra as linhas do ICS e gera (linha, nome, parâmetros, valor)."""
+    atual, inicio = None, 0
+    for numero, linha in enumerate(linhas, start=1):
+        linha = linha.rstrip('\r\n')
+        if linha[:1] in (' ', '\t') and atual is not None:
+            atual += linha[1:]
+            continue
+        if atual:
+            yield _propriedade_ics(inicio, atual)
+        atual, inicio = linha, numero
+    if atual:
+        yield _propriedade_ics(inicio, atual)
+
+
+def _propriedade_ics(numero, linha):
+    cabeca, _, valor = linha.partition(':')
+    nome, *parametros = cabeca.split(';')
+    parametros = dict(p.split('=', 1) for p in parametros if '=' in p)
+    return numero, nome.upper(), parametros, valor
+
+
+def _texto_ics(valor):
+    return (
+        valor.replace('\\n', '\n').replace('\\N', '\n').replace('\\,', ',')
+        .replace('\\;', ';').replace('\\\\', '\\').strip()
+    )
+
+
+def _data_ics(parametros, valor):
+    """Converte DTSTART/DTEND/UNTIL em datetime aware; indica se é dia inteiro."""
+    try:
+        if parametros.get('VALUE') == 'DATE' or len(valor) == 8:
+            return timezone.make_aware(datetime.strptime(valor, '%Y%m%d')), True
+        if valor.endswith('Z'):
+            return datetime.strptime(valor, '%Y%m%dT%H%M%SZ').replace(tzinfo=ZoneInfo('UTC')), False
+        momento = datetime.strptime(valor, '%Y%m%dT%H%M%S')
+    except ValueError:
+        raise ErroLinha(f'Data "{valor}" inválida.')
+    try:
+        fuso = ZoneInfo(parametros['TZID'].strip('"')) if 'TZID' in parametros else None
+    except (ZoneInfoNotFoundError, ValueError):
+        fuso = None
+    return (momento.replace(tzinfo=fuso) if fuso else timezone.make_aware(momento)), False
+
+
+def _rrule(valor):
+    return dict(parte.split('=', 1) for parte in valor.split(';') if '=' in parte)
+
+
+def _intervalo(valor):
+    """INTERVAL da RRULE (padrão 1); inteiro positivo."""
+    try:
+        intervalo = int(valor or 1)
+    except ValueError:
+        raise ErroLinha(f'INTERVAL "{valor}" inválido.')
+    if intervalo < 1:
+        raise ErroLinha(f'INTERVAL "{valor}" inválido.')
+    return intervalo
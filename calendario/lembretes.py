@@ -0,0 +1,183 @@
+"""
+Agendamento e envio de lembretes de eventos por e-mail.
+
+A fila é a própria tabela LembreteEvento, ordenada por `disparar_em` e
+com índice parcial sobre os pendentes. Os lembretes são materializados
+só para as ocorrências que começam dentro do horizonte
+(REMINDER_HORIZON_HOURS), incluindo as de eventos recorrentes:
+
+- os sinais refazem os lembretes de um evento quando ele (ou sua
+  recorrência) muda;
+- o worker (comando enviar_lembretes) reabastece o horizonte a cada
+  REMINDER_REFILL_INTERVAL segundos, consultando apenas os eventos com
+  lembrete que começam na janela (índice evento_lembrete_idx).
+
+O envio reserva um lote de pendentes vencidos com um UPDATE condicional
+(enviado_em nulo), então vários workers não enviam o mesmo lembrete, e a
+unicidade (evento, ocorrencia) impede que uma ocorrência seja agendada
+de novo depois de enviada.
+"""
+
+import logging
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from core.metricas import lembretes_total
+from .models import EventoCalendario, LembreteEvento
+from .recorrencia import ocorrencias
+
+logger = logging.getLogger(__name__)
+
+CAMPOS_AGENDAMENTO = ('id', 'usuario_id', 'data_inicio', 'data_fim', 'tempo_lembrete')
+
+
+def _horizonte(agora):
+    return agora + timedelta(hours=settings.REMINDER_HORIZON_HOURS)
+
+
+def _lembretes_do_evento(evento, recorrencia, inicio, fim):
+    """LembreteEvento (não salvos) das ocorrências do evento que começam em [inicio, fim)."""
+    antecedencia = timedelta(minutes=max(0, evento.tempo_lembrete))
+    if recorrencia is None:
+        comecos = [evento.data_inicio] if inicio <= evento.data_inicio < fim else []
+    else:
+        comecos = (comeco for comeco, _ in ocorrencias(evento, recorrencia, inicio, fim))
+    for comeco in comecos:
+        yield LembreteEvento(
+            evento=evento,
+            usuario_id=evento.usuario_id,
+            ocorrencia=comeco,
+            disparar_em=comeco - antecedencia,
+        )
+
+
+def agendar_evento(evento, agora=None):
+    """
+    Refaz os lembretes pendentes de um evento (chamado pelos sinais).
+    Retorna quantos lembretes ficaram agendados.
+    """
+    agora = agora or timezone.now()
+    LembreteEvento.objects.filter(evento=evento, enviado_em__isnull=True).delete()
+    if not evento.lembrete or not evento.usuario.notificacoes_email:
+        return 0
+    recorrencia = getattr(evento, 'recorrencia', None)
+    lembretes = list(_lembretes_do_evento(evento, recorrencia, agora, _horizonte(agora)))
+    LembreteEvento.objects.bulk_create(lembretes, ignore_conflicts=True)
+    return len(lembretes)
+
+
+def estender_horizonte(agora=None, lote=1000):
+    """
+    Agenda os lembretes das ocorrências que começam até o fim do horizonte.
+    Idempotente: lembretes já existentes (enviados ou não) são ignorados.
+    Retorna quantas ocorrências foram consideradas.
+    """
+    agora = agora or timezone.now()
+    fim = _horizonte(agora)
+    base = EventoCalendario.objects.filter(
+        lembrete=True,
+        usuario__is_active=True,
+        usuario__notificacoes_email=True,
+    )
+    # Eventos simples já agendados ficam de fora: os reabastecimentos
+    # seguintes só tratam o que entrou no horizonte desde o anterior
+    simples = base.filter(recorrencia__isnull=True, data_inicio__gte=agora, data_inicio__lt=fim).exclude(
+        Exists(LembreteEvento.objects.filter(evento=OuterRef('pk'), ocorrencia=OuterRef('data_inicio')))
+    ).only(*CAMPOS_AGENDAMENTO)
+    recorrentes = base.filter(recorrencia__isnull=False, data_inicio__lt=fim).filter(
+        Q(recorrencia__data_fim_recorrencia__isnull=True)
+        | Q(recorrencia__data_fim_recorrencia__gte=timezone.localdate(agora))
+    ).select_related('recorrencia').only(*CAMPOS_AGENDAMENTO, 'recorrencia')
+
+    total = 0
+    pendentes = []
+    for consulta, recorrente in ((simples, False), (recorrentes, True)):
+        for evento in consulta.iterator(chunk_size=lote):
+            recorrencia = evento.recorrencia if recorrente else None
+            pendentes.extend(_lembretes_do_evento(evento, recorrencia, agora, fim))
+            if len(pendentes) >= lote:
+                LembreteEvento.objects.bulk_create(pendentes, ignore_conflicts=True)
+                total += len(pendentes)
+                pendentes = []
+    LembreteEvento.objects.bulk_create(pendentes, ignore_conflicts=True)
+    return total + len(pendentes)
+
+
+def proximo_disparo():
+    """Momento do próximo lembrete pendente, ou None."""
+    return (
+        LembreteEvento.objects.filter(enviado_em__isnull=True)
+        .order_by('disparar_em')
+        .values_list('disparar_em', flat=True)
+        .first()
+    )
+
+
+def _mensagem(lembrete):
+    evento = lembrete.evento
+    inicio = timezone.localtime(lembrete.ocorrencia)
+    fim = inicio + (evento.data_fim - evento.data_inicio)
+    linhas = [
+        f'Olá, {lembrete.usuario.first_name or lembrete.usuario.username}!',
+        '',
+        f'{evento.titulo}',
+        f'{inicio:%d/%m/%Y}, das {inicio:%H:%M} às {timezone.localtime(fim):%H:%M}',
+    ]
+    if evento.materia:
+        linhas.append(f'Matéria: {evento.materia.nome}')
+    if evento.descricao:
+        linhas.extend(['', evento.descricao])
+    return EmailMessage(
+        subject=f'Lembrete: {evento.titulo} às {inicio:%H:%M}',
+        body='\n'.join(linhas),
+        to=[lembrete.usuario.email],
+    )
+
+
+def enviar_pendentes(agora=None, lote=None):
+    """
+    Envia, numa única conexão SMTP, um lote de lembretes vencidos.
+    Retorna quantos lembretes foram processados (enviados ou descartados).
+    """
+    agora = agora or timezone.now()
+    lote = lote or settings.REMINDER_BATCH_SIZE
+    ids = list(
+        LembreteEvento.objects.filter(enviado_em__isnull=True, disparar_em__lte=agora)
+        .order_by('disparar_em')
+        .values_list('pk', flat=True)[:lote]
+    )
+    if not ids:
+        return 0
+
+    # Reserva o lote: outro worker que tenha lido os mesmos ids não os obtém
+    token = uuid.uuid4().hex
+    LembreteEvento.objects.filter(pk__in=ids, enviado_em__isnull=True).update(enviado_em=agora, lote=token)
+    reservados = LembreteEvento.objects.filter(pk__in=ids, lote=token).select_related('evento__materia', 'usuario')
+
+    mensagens, descartados = [], 0
+    for lembrete in reservados:
+        usuario = lembrete.usuario
+        # Ocorrências que já começaram ou preferências alteradas depois do agendamento
+        if lembrete.ocorrencia <= agora or not (usuario.is_active and usuario.notificacoes_email and usuario.email):
+            descartados += 1
+            continue
+        mensagens.append(_mensagem(lembrete))
+
+    try:
+        if mensagens:
+            get_connection().send_messages(mensagens)
+    except Exception:
+        LembreteEvento.objects.filter(pk__in=ids, lote=token).update(enviado_em=None, lote='')
+        lembretes_total.inc(len(mensagens), resultado='erro')
+        logger.exception('Falha ao enviar %d lembrete(s); o lote volta para a fila', len(mensagens))
+        raise
+
+    lembretes_total.inc(len(mensagens), resultado='enviado')
+    if descartados:
+        lembretes_total.inc(descartados, resultado='descartado')
+    return len(mensagens) + descartados
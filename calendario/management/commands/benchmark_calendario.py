@@ -0,0 +1,108 @@
+"""
+Management command que mede a renderização da página do calendário
+(visões mensal e semanal) para um mês com muitos eventos.
+
+Exemplos:
+    python manage.py benchmark_calendario
+    python manage.py benchmark_calendario --eventos 5000 --repeticoes 10
+"""
+
+import random
+import statistics
+from datetime import date, datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from academico.models import HorarioAula, Materia, Semestre
+from calendario.models import EventoCalendario
+from core import perfilamento
+from core.benchmark import banco_temporario, formatar_tabela, medir_requisicao
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Mede o tempo de renderização do calendário mensal e semanal'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--eventos', type=int, default=1000, help='Eventos no mês medido (padrão: 1000)')
+        parser.add_argument('--horarios', type=int, default=20, help='Horários de aula semanais (padrão: 20)')
+        parser.add_argument('--repeticoes', type=int, default=5, help='Execuções medidas por visão')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        perfilamento.instrumentar_templates()
+        with banco_temporario():
+            usuario = self._gerar_dados(options)
+            client = Client(raise_request_exception=False)
+            client.force_login(usuario)
+
+            linhas = []
+            for visao in ('monthly', 'weekly'):
+                url = f"{reverse('calendario:calendario_home')}?year=2025&month=3&view={visao}"
+                resultado = medir_requisicao(client, 'get', url, repeticoes=options['repeticoes'])
+                linhas.append([
+                    visao, resultado['status'], resultado['ms'],
+                    self._tempo_template(client, url, options['repeticoes']),
+                    resultado['consultas'], resultado['kb'],
+                ])
+
+        self.stdout.write(f"{options['eventos']} eventos + {options['horarios']} horários semanais em 03/2025")
+        self.stdout.write(formatar_tabela(['visão', 'status', 'ms', 'template ms', 'consultas', 'KB'], linhas))
+
+    def _gerar_dados(self, options):
+        rng = random.Random(options['seed'])
+        usuario = User.objects.create_user(
+            username='benchmark', email='benchmark@example.com', password='benchmark'
+        )
+        semestre = Semestre.objects.create(
+            usuario=usuario, nome='2025.1', ano=2025, periodo='1',
+            data_inicio=date(2025, 2, 1), data_fim=date(2025, 7, 1)
+        )
+        materias = [
+            Materia.objects.create(semestre=semestre, nome=f'Matéria {i}', slug=f'benchmark-materia-{i}')
+            for i in range(6)
+        ]
+        HorarioAula.objects.bulk_create(
+            HorarioAula(
+                materia=rng.choice(materias),
+                dia_semana=i % 6,
+                hora_inicio=time(7 + i % 14, 0),
+                hora_fim=time(8 + i % 14, 40),
+                local=f'Sala {i}',
+            )
+            for i in range(options['horarios'])
+        )
+
+        tipos = [valor for valor, _ in EventoCalendario.TipoEvento.choices]
+        inicio_mes = timezone.make_aware(datetime(2025, 3, 1))
+        eventos = []
+        for _ in range(options['eventos']):
+            comeco = inicio_mes + timedelta(days=rng.randint(0, 30), hours=rng.randint(7, 22))
+            eventos.append(EventoCalendario(
+                titulo=f'Evento {rng.randint(1, 9999)}',
+                data_inicio=comeco,
+                data_fim=comeco + timedelta(hours=1),
+                tipo_evento=rng.choice(tipos),
+                materia=rng.choice(materias) if rng.random() < 0.7 else None,
+                usuario=usuario,
+            ))
+        EventoCalendario.objects.bulk_create(eventos)
+        return usuario
+
+    def _tempo_template(self, client, url, repeticoes):
+        """Mediana do tempo gasto só na renderização de templates (ms)."""
+        tempos = []
+        for _ in range(repeticoes):
+            coleta = perfilamento.ColetaRequisicao()
+            perfilamento.definir_coleta(coleta)
+            try:
+                client.get(url)
+            finally:
+                perfilamento.definir_coleta(None)
+            tempos.append(coleta.template_ms)
+        return round(statistics.median(tempos), 2)
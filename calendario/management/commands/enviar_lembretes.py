@@ -0,0 +1,66 @@
+"""
+Worker que envia os lembretes de eventos por e-mail.
+
+Fica em execução permanente: reabastece o horizonte de lembretes de
+tempos em tempos, envia os vencidos em lotes e dorme até o próximo
+disparo (limitado a REMINDER_MAX_SLEEP, para notar lembretes agendados
+enquanto dorme). Cada despertar custa uma consulta pelo índice parcial
+dos pendentes, nunca uma varredura da tabela de eventos.
+
+Exemplos:
+    python manage.py enviar_lembretes
+    python manage.py enviar_lembretes --uma-vez   # para cron
+"""
+
+import signal
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from calendario import lembretes
+from core.metricas import registro
+
+
+class Command(BaseCommand):
+    help = 'Envia os lembretes de eventos vencidos e aguarda os próximos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--uma-vez', action='store_true', help='Processa os vencidos e sai')
+
+    def handle(self, *args, **options):
+        parar = threading.Event()
+        for sinal in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sinal, lambda *_: parar.set())
+
+        proximo_reabastecimento = 0.0
+        while not parar.is_set():
+            close_old_connections()
+            if time.monotonic() >= proximo_reabastecimento:
+                agendados = lembretes.estender_horizonte()
+                proximo_reabastecimento = time.monotonic() + settings.REMINDER_REFILL_INTERVAL
+                if options['verbosity'] > 1:
+                    self.stdout.write(f'{agendados} lembrete(s) no horizonte')
+
+            try:
+                while processados := lembretes.enviar_pendentes():
+                    self.stdout.write(f'{processados} lembrete(s) processado(s)')
+            except Exception as erro:  # o lote já voltou para a fila
+                self.stderr.write(f'Falha no envio: {erro}')
+                parar.wait(settings.REMINDER_MAX_SLEEP)
+                continue
+            finally:
+                registro.gravar()
+
+            if options['uma_vez']:
+                break
+
+            espera = settings.REMINDER_MAX_SLEEP
+            proximo = lembretes.proximo_disparo()
+            if proximo is not None:
+                espera = min(espera, max(0.0, (proximo - timezone.now()).total_seconds()))
+            espera = min(espera, max(0.0, proximo_reabastecimento - time.monotonic()))
+            parar.wait(espera)
@@ -0,0 +1,57 @@
+"""
+Management command para importar matérias, horários de aula e eventos de
+um arquivo CSV ou ICS para um usuário (ex.: a grade horária inteira da
+universidade).
+
+Exemplos:
+    python manage.py importar_calendario aluno grade_2025_1.csv
+    python manage.py importar_calendario aluno calendario.ics --validar
+"""
+
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from calendario.importacao import FORMATOS, ImportadorCalendario, formato_do_arquivo
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Importa matérias, horários de aula e eventos de um arquivo CSV ou ICS'
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', help='Usuário dono dos registros importados')
+        parser.add_argument('arquivo', help='Caminho do arquivo .csv ou .ics')
+        parser.add_argument('--formato', choices=FORMATOS, help='Força o formato (padrão: pela extensão)')
+        parser.add_argument('--validar', action='store_true', help='Apenas valida, sem gravar')
+        parser.add_argument('--lote', type=int, default=1000, help='Tamanho dos lotes do bulk_create')
+
+    def handle(self, *args, **options):
+        try:
+            usuario = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f'Usuário "{options["username"]}" não encontrado.')
+
+        formato = options['formato'] or formato_do_arquivo(options['arquivo'])
+        if formato is None:
+            raise CommandError('Não foi possível deduzir o formato; use --formato csv|ics.')
+
+        inicio = time.perf_counter()
+        with open(options['arquivo'], encoding='utf-8-sig', newline='') as linhas:
+            resultado = ImportadorCalendario(usuario, lote=options['lote']).importar(
+                linhas, formato, somente_validar=options['validar']
+            )
+        duracao = time.perf_counter() - inicio
+
+        for linha, mensagem in resultado.erros:
+            self.stderr.write(f'  linha {linha}: {mensagem}')
+
+        resumo = resultado.resumo()
+        acao = 'importados' if resultado.gravado else 'válidos (nada gravado)'
+        self.stdout.write(self.style.SUCCESS(
+            f'{resumo["materias"]} matéria(s), {resumo["horarios"]} horário(s), {resumo["eventos"]} evento(s) e '
+            f'{resumo["recorrencias"]} recorrência(s) {acao} em {duracao:.2f}s; '
+            f'{resumo["erros"]} linha(s) com erro.'
+        ))
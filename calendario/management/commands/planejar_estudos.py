@@ -0,0 +1,68 @@
+"""
+Management command que refaz o plano de estudos (sessões do tipo ESTUDO
+geradas automaticamente) de um usuário ou de todos. Pensado para rodar
+todas as noites via cron.
+
+Exemplos:
+    python manage.py planejar_estudos
+    python manage.py planejar_estudos --usuario aluno --semanas 4
+    python manage.py planejar_estudos --usuario aluno --simular
+"""
+
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from calendario.planejamento import PlanejadorEstudos
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Gera sessões de estudo nos horários livres das próximas semanas'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--usuario', help='Username (padrão: todos os usuários com semestre em andamento)')
+        parser.add_argument('--semanas', type=int, help='Semanas planejadas (padrão: STUDY_PLANNER_WEEKS)')
+        parser.add_argument('--simular', action='store_true', help='Mostra as sessões sem gravar')
+
+    def handle(self, *args, **options):
+        usuarios = User.objects.filter(is_active=True).select_related('perfil')
+        if options['usuario']:
+            usuarios = usuarios.filter(username=options['usuario'])
+            if not usuarios.exists():
+                raise CommandError(f'Usuário "{options["usuario"]}" não encontrado.')
+        else:
+            usuarios = usuarios.filter(
+                semestres__data_fim__gte=timezone.localdate(),
+                semestres__materias__ativo=True,
+            ).distinct()
+
+        inicio = time.perf_counter()
+        total_usuarios = total_criadas = total_removidas = 0
+        for usuario in usuarios.iterator(chunk_size=200):
+            planejador = PlanejadorEstudos(usuario, semanas=options['semanas'])
+            if options['simular']:
+                sessoes = planejador.planejar()
+                for sessao in sessoes:
+                    self.stdout.write(
+                        f'  {timezone.localtime(sessao.data_inicio):%a %d/%m %H:%M}'
+                        f'–{timezone.localtime(sessao.data_fim):%H:%M}  {sessao.titulo}'
+                    )
+                criadas, removidas = len(sessoes), 0
+            else:
+                removidas, criadas = planejador.gravar()
+            total_usuarios += 1
+            total_criadas += criadas
+            total_removidas += removidas
+            if options['verbosity'] > 1:
+                self.stdout.write(f'{usuario.username}: {criadas} sessão(ões), {removidas} substituída(s)')
+
+        duracao = time.perf_counter() - inicio
+        acao = 'planejadas (simulação)' if options['simular'] else 'criadas'
+        self.stdout.write(self.style.SUCCESS(
+            f'{total_usuarios} usuário(s): {total_criadas} sessão(ões) {acao}, '
+            f'{total_removidas} substituída(s) em {duracao:.2f}s.'
+        ))
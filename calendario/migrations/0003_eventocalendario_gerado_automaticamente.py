@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-19 03:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendario', '0002_remove_eventocalendario_calendario__data_in_0041fc_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventocalendario',
+            name='gerado_automaticamente',
+            field=models.BooleanField(default=False, help_text='Sessão de estudo criada pelo planejador; é refeita a cada planejamento', verbose_name='Gerado automaticamente'),
+        ),
+    ]
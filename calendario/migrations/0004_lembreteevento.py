@@ -0,0 +1,54 @@
+# Generated by Django 5.0.14 on 2026-10-19 03:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academico', '0003_alter_semestre_unique_together_semestre_usuario_and_more'),
+        ('calendario', '0003_eventocalendario_gerado_automaticamente'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LembreteEvento',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ocorrencia', models.DateTimeField(verbose_name='Início da Ocorrência')),
+                ('disparar_em', models.DateTimeField(verbose_name='Disparar em')),
+                ('enviado_em', models.DateTimeField(blank=True, null=True, verbose_name='Enviado em')),
+                ('lote', models.CharField(blank=True, max_length=32, verbose_name='Lote de Envio')),
+            ],
+            options={
+                'verbose_name': 'Lembrete de Evento',
+                'verbose_name_plural': 'Lembretes de Eventos',
+                'ordering': ['disparar_em'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='eventocalendario',
+            index=models.Index(condition=models.Q(('lembrete', True)), fields=['data_inicio'], name='evento_lembrete_idx'),
+        ),
+        migrations.AddField(
+            model_name='lembreteevento',
+            name='evento',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lembretes', to='calendario.eventocalendario', verbose_name='Evento'),
+        ),
+        migrations.AddField(
+            model_name='lembreteevento',
+            name='usuario',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lembretes_eventos', to=settings.AUTH_USER_MODEL, verbose_name='Usuário'),
+        ),
+        migrations.AddIndex(
+            model_name='lembreteevento',
+            index=models.Index(condition=models.Q(('enviado_em__isnull', True)), fields=['disparar_em'], name='lembrete_pendente_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='lembreteevento',
+            constraint=models.UniqueConstraint(fields=('evento', 'ocorrencia'), name='lembrete_unico_por_ocorrencia'),
+        ),
+    ]
@@ -51,6 +51,11 @@ class EventoCalendario(models.Model):
         default=30,
         help_text=_("Quantos minutos antes do evento enviar o lembrete")
     )
+    gerado_automaticamente = models.BooleanField(
+        _("Gerado automaticamente"),
+        default=False,
+        help_text=_("Sessão de estudo criada pelo planejador; é refeita a cada planejamento")
+    )
     criado_em = models.DateTimeField(auto_now_add=True)
     atualizado_em = models.DateTimeField(auto_now=True)
     
@@ -61,6 +66,8 @@ class EventoCalendario(models.Model):
         indexes = [
             models.Index(fields=['usuario', 'data_inicio']),
             models.Index(fields=['usuario', 'tipo_evento']),
+            # Agendamento de lembretes (calendario.lembretes.estender_horizonte)
+            models.Index(fields=['data_inicio'], condition=models.Q(lembrete=True), name='evento_lembrete_idx'),
         ]
     
     def __str__(self):
@@ -131,3 +138,46 @@ class RecorrenciaEvento(models.Model):
     
     def __str__(self):
         return f"Recorrência {self.get_tipo_recorrencia_display()} - {self.evento.titulo}"
+
+class LembreteEvento(models.Model):
+    """
+    Lembrete agendado para uma ocorrência de um evento (calendario.lembretes).
+
+    A tabela funciona como fila ordenada por `disparar_em`: o worker lê só
+    os pendentes vencidos pelo índice parcial, sem varrer os eventos. A
+    unicidade (evento, ocorrencia) garante no máximo um envio por ocorrência.
+    """
+    evento = models.ForeignKey(
+        EventoCalendario,
+        on_delete=models.CASCADE,
+        related_name="lembretes",
+        verbose_name=_("Evento")
+    )
+    usuario = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="lembretes_eventos",
+        verbose_name=_("Usuário")
+    )
+    ocorrencia = models.DateTimeField(_("Início da Ocorrência"))
+    disparar_em = models.DateTimeField(_("Disparar em"))
+    enviado_em = models.DateTimeField(_("Enviado em"), null=True, blank=True)
+    lote = models.CharField(_("Lote de Envio"), max_length=32, blank=True)
+    
+    class Meta:
+        ordering = ['disparar_em']
+        verbose_name = _("Lembrete de Evento")
+        verbose_name_plural = _("Lembretes de Eventos")
+        constraints = [
+            models.UniqueConstraint(fields=['evento', 'ocorrencia'], name='lembrete_unico_por_ocorrencia'),
+        ]
+        indexes = [
+            models.Index(
+                fields=['disparar_em'],
+                condition=models.Q(enviado_em__isnull=True),
+                name='lembrete_pendente_idx'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"Lembrete de {self.evento.titulo} - {self.disparar_em.strftime('%d/%m/%Y %H:%M')}"
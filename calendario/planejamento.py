@@ -0,0 +1,232 @@
+"""
+Planejador de estudos: encaixa sessões de estudo nos horários livres.
+
+Para as próximas N semanas, o planejador junta aulas e eventos do
+calendário (academico.conflitos.itens_do_periodo), calcula os intervalos
+livres dentro da janela diária de estudo com uma varredura sobre os
+intervalos ocupados ordenados e preenche cada dia até a meta de
+PerfilUsuario.horas_estudo_dia. As tarefas pendentes são atendidas por
+ordem de prazo (o prazo mais próximo primeiro, num heap); o que sobra da
+meta vira revisão das matérias do semestre.
+
+A duração das sessões segue PerfilUsuario.metodo_estudo_preferido
+(Pomodoro = 25 min + 5 de pausa, e assim por diante). As sessões geradas
+são marcadas com gerado_automaticamente e as futuras são refeitas a cada
+planejamento, então rodar o comando todas as noites é idempotente.
+"""
+
+import heapq
+import itertools
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from academico.conflitos import itens_do_periodo
+from academico.models import Materia, Tarefa
+from users.estatisticas import ajustar, em_lote
+from .ics import invalidar_calendario
+from .models import EventoCalendario
+
+# Trecho do método preferido (minúsculo) -> (minutos de sessão, minutos de pausa)
+METODOS = [
+    ('pomodoro', (25, 5)),
+    ('flashcard', (30, 10)),
+    ('mapa', (45, 15)),
+]
+SESSAO_PADRAO = (50, 10)
+
+
+def duracao_sessao(metodo):
+    """(sessão, pausa) em minutos para o método de estudo informado."""
+    metodo = (metodo or '').lower()
+    for trecho, duracao in METODOS:
+        if trecho in metodo:
+            return duracao
+    return SESSAO_PADRAO
+
+
+def _hora(valor):
+    horas, minutos = valor.split(':')
+    return time(int(horas), int(minutos))
+
+
+def _arredondar(momento, minutos):
+    """Primeiro múltiplo de `minutos` (no horário local) a partir de `momento`."""
+    base = timezone.localtime(momento).replace(second=0, microsecond=0)
+    if base < momento:
+        base += timedelta(minutes=1)
+    return base + timedelta(minutes=-base.minute % minutos)
+
+
+def intervalos_livres(janelas, ocupados):
+    """
+    Subtrai os intervalos ocupados das janelas (ambos listas de
+    (inicio, fim) ordenadas pelo início) numa única varredura.
+    """
+    livres = []
+    indice = 0
+    for inicio, fim in janelas:
+        # Ocupados que terminam antes desta janela não afetam as próximas
+        while indice < len(ocupados) and ocupados[indice][1] <= inicio:
+            indice += 1
+        cursor = inicio
+        atual = indice
+        while atual < len(ocupados) and ocupados[atual][0] < fim:
+            comeco, termino = ocupados[atual]
+            if comeco > cursor:
+                livres.append((cursor, comeco))
+            cursor = max(cursor, termino)
+            atual += 1
+        if cursor < fim:
+            livres.append((cursor, fim))
+    return livres
+
+
+class PlanejadorEstudos:
+    """Gera as sessões de estudo de um usuário para as próximas semanas."""
+
+    def __init__(self, usuario, semanas=None, agora=None):
+        self.usuario = usuario
+        self.semanas = semanas or settings.STUDY_PLANNER_WEEKS
+        self.agora = agora or timezone.now()
+        perfil = getattr(usuario, 'perfil', None)
+        self.minutos_por_dia = 60 * (perfil.horas_estudo_dia if perfil else 4)
+        self.metodo = perfil.metodo_estudo_preferido if perfil else ''
+        self.sessao, self.pausa = duracao_sessao(self.metodo)
+
+        self.inicio = _arredondar(self.agora, 15)
+        ultimo_dia = self.inicio.date() + timedelta(days=7 * self.semanas)
+        self.fim = timezone.make_aware(datetime.combine(ultimo_dia, time.min))
+
+    def _janelas(self):
+        comeco, termino = _hora(settings.STUDY_PLANNER_DAY_START), _hora(settings.STUDY_PLANNER_DAY_END)
+        dia = self.inicio.date()
+        while dia < timezone.localdate(self.fim):
+            inicio = max(self.inicio, timezone.make_aware(datetime.combine(dia, comeco)))
+            fim = timezone.make_aware(datetime.combine(dia, termino))
+            if inicio < fim:
+                yield inicio, fim
+            dia += timedelta(days=1)
+
+    def _ocupados(self):
+        """Intervalos ocupados mesclados e minutos de estudo já marcados por dia."""
+        intervalos = []
+        estudo_por_dia = {}
+        for item in itens_do_periodo(self.usuario, self.inicio, self.fim):
+            if item.tipo == 'evento' and item.objeto.gerado_automaticamente and item.inicio >= self.agora:
+                continue  # será refeita por este planejamento
+            intervalos.append((item.inicio, item.fim))
+            if item.tipo == 'evento' and item.objeto.tipo_evento == EventoCalendario.TipoEvento.ESTUDO:
+                dia = timezone.localdate(item.inicio)
+                estudo_por_dia[dia] = estudo_por_dia.get(dia, 0) + (item.fim - item.inicio).total_seconds() // 60
+
+        intervalos.sort()
+        mesclados = []
+        for inicio, fim in intervalos:
+            if mesclados and inicio <= mesclados[-1][1]:
+                if fim > mesclados[-1][1]:
+                    mesclados[-1] = (mesclados[-1][0], fim)
+            else:
+                mesclados.append((inicio, fim))
+        return mesclados, estudo_por_dia
+
+    def _tarefas(self):
+        """Heap (prazo, ordem, tarefa, sessões restantes) das tarefas pendentes."""
+        tarefas = (
+            Tarefa.objects.filter(usuario=self.usuario, materia__ativo=True)
+            .exclude(status='CONCLUIDA')
+            .filter(Q(prazo__isnull=True) | Q(prazo__gt=self.inicio))
+            .select_related('materia')
+            .order_by(F('prazo').asc(nulls_last=True), 'criado_em')
+        )
+        sem_prazo = self.fim + timedelta(days=1)
+        heap = [
+            (tarefa.prazo or sem_prazo, ordem, tarefa, settings.STUDY_PLANNER_SESSIONS_PER_TASK)
+            for ordem, tarefa in enumerate(tarefas)
+        ]
+        heapq.heapify(heap)
+        return heap
+
+    def _materias(self):
+        return list(
+            Materia.objects.filter(
+                semestre__usuario=self.usuario,
+                ativo=True,
+                semestre__data_inicio__lte=timezone.localdate(self.fim),
+                semestre__data_fim__gte=self.inicio.date(),
+            ).select_related('semestre').order_by('nome')
+        )
+
+    def planejar(self):
+        """Lista (não salva) das sessões de estudo do período."""
+        ocupados, estudo_por_dia = self._ocupados()
+        heap = self._tarefas()
+        materias = self._materias()
+        rodizio = itertools.cycle(materias)
+        sessao = timedelta(minutes=self.sessao)
+        pausa = timedelta(minutes=self.pausa)
+        sessoes = []
+
+        for inicio, fim in intervalos_livres(list(self._janelas()), ocupados):
+            dia = timezone.localdate(inicio)
+            cursor = _arredondar(inicio, 5)
+            while cursor + sessao <= fim and estudo_por_dia.get(dia, 0) + self.sessao <= self.minutos_por_dia:
+                termino = cursor + sessao
+                # Tarefas cujo prazo chega antes do fim da sessão saem da fila
+                while heap and heap[0][0] < termino:
+                    heapq.heappop(heap)
+
+                if heap:
+                    prazo, ordem, tarefa, restantes = heapq.heappop(heap)
+                    if restantes > 1:
+                        heapq.heappush(heap, (prazo, ordem, tarefa, restantes - 1))
+                    titulo, materia = f'Estudo: {tarefa.titulo}', tarefa.materia
+                    descricao = f'Preparação para a tarefa "{tarefa.titulo}"'
+                    if tarefa.prazo:
+                        descricao += f' (prazo {timezone.localtime(tarefa.prazo):%d/%m %H:%M})'
+                else:
+                    materia = next(
+                        (m for m in itertools.islice(rodizio, len(materias))
+                         if m.semestre.data_inicio <= dia <= m.semestre.data_fim),
+                        None
+                    )
+                    if materia is None:
+                        break
+                    titulo, descricao = f'Revisão: {materia.nome}', 'Revisão do conteúdo da matéria'
+
+                if self.metodo:
+                    descricao += f'\nMétodo: {self.metodo}'
+                sessoes.append(EventoCalendario(
+                    titulo=titulo[:200],
+                    descricao=descricao,
+                    data_inicio=cursor,
+                    data_fim=termino,
+                    tipo_evento=EventoCalendario.TipoEvento.ESTUDO,
+                    materia=materia,
+                    usuario=self.usuario,
+                    lembrete=False,
+                    gerado_automaticamente=True,
+                ))
+                estudo_por_dia[dia] = estudo_por_dia.get(dia, 0) + self.sessao
+                cursor = termino + pausa
+
+        return sessoes
+
+    @transaction.atomic
+    def gravar(self):
+        """Refaz as sessões futuras geradas automaticamente. Retorna (removidas, criadas)."""
+        sessoes = self.planejar()
+        # Os sinais de exclusão e a criação em lote viram um só UPDATE no perfil
+        with em_lote():
+            removidas, _ = EventoCalendario.objects.filter(
+                usuario=self.usuario,
+                gerado_automaticamente=True,
+                data_inicio__gte=self.agora,
+            ).delete()
+            EventoCalendario.objects.bulk_create(sessoes, batch_size=500)
+            ajustar(self.usuario.pk, total_eventos=len(sessoes))
+        transaction.on_commit(lambda: invalidar_calendario(self.usuario.pk))
+        return removidas, len(sessoes)
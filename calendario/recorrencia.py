@@ -0,0 +1,110 @@
+"""
+Expansão de eventos recorrentes e horários de aula em ocorrências concretas.
+
+As datas são calculadas no horário local (TIME_ZONE), para que uma aula
+às 19h continue às 19h em toda a série, e cada série salta direto para a
+janela pedida: o custo é proporcional às ocorrências devolvidas, não ao
+tamanho da série.
+"""
+
+import calendar
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+from .models import RecorrenciaEvento
+
+Tipo = RecorrenciaEvento.TipoRecorrencia
+
+
+def dias_semana(recorrencia, primeiro):
+    """Dias da semana (0=segunda) da série; padrão: o dia do primeiro evento."""
+    dias = set()
+    for valor in recorrencia.dias_semana.split(','):
+        valor = valor.strip()
+        if valor.isdigit() and 1 <= int(valor) <= 7:
+            dias.add(int(valor) - 1)
+    return sorted(dias) or [primeiro.weekday()]
+
+
+def _somar_meses(momento, meses):
+    """Soma meses mantendo o dia; None se o dia não existir no mês alvo."""
+    ano, mes = divmod(momento.month - 1 + meses, 12)
+    ano, mes = momento.year + ano, mes + 1
+    if momento.day > calendar.monthrange(ano, mes)[1]:
+        return None
+    return momento.replace(year=ano, month=mes)
+
+
+def _datas(recorrencia, primeiro, de, ate):
+    """Inícios (naive, locais) da série em [de, ate), todos >= primeiro."""
+    intervalo = max(1, recorrencia.intervalo)
+    tipo = recorrencia.tipo_recorrencia
+
+    if tipo == Tipo.DIARIA:
+        passo = timedelta(days=intervalo)
+        k = max(0, -(-(de - primeiro) // passo))
+        momento = primeiro + k * passo
+        while momento < ate:
+            yield momento
+            momento += passo
+
+    elif tipo in (Tipo.SEMANAL, Tipo.QUINZENAL):
+        passo = 7 * intervalo * (2 if tipo == Tipo.QUINZENAL else 1)
+        semana0 = primeiro.date() - timedelta(days=primeiro.weekday())
+        k = max(0, (de.date() - semana0).days // passo)
+        dias = dias_semana(recorrencia, primeiro)
+        semana = semana0 + timedelta(days=k * passo)
+        while semana < ate.date():
+            for dia in dias:
+                momento = datetime.combine(semana + timedelta(days=dia), primeiro.time())
+                if momento >= ate:
+                    return
+                if momento >= de and momento >= primeiro:
+                    yield momento
+            semana += timedelta(days=passo)
+
+    elif tipo in (Tipo.MENSAL, Tipo.ANUAL):
+        passo = intervalo * (12 if tipo == Tipo.ANUAL else 1)
+        diferenca = (de.year - primeiro.year) * 12 + de.month - primeiro.month
+        n = max(0, diferenca // passo) * passo
+        while True:
+            ano, mes = divmod(primeiro.month - 1 + n, 12)
+            if datetime(primeiro.year + ano, mes + 1, 1) >= ate:
+                return
+            momento = _somar_meses(primeiro, n)
+            if momento is not None and de <= momento < ate:
+                yield momento
+            n += passo
+
+
+def ocorrencias(evento, recorrencia, inicio, fim):
+    """
+    Gera (data_inicio, data_fim) das ocorrências de um evento recorrente
+    que começam em [inicio, fim). `inicio` e `fim` são datetimes aware.
+    """
+    if recorrencia.data_fim_recorrencia:
+        ultimo_dia = datetime.combine(recorrencia.data_fim_recorrencia + timedelta(days=1), time.min)
+        fim = min(fim, timezone.make_aware(ultimo_dia))
+    inicio = max(inicio, evento.data_inicio)
+    if inicio >= fim:
+        return
+
+    duracao = evento.data_fim - evento.data_inicio
+    primeiro = timezone.make_naive(evento.data_inicio)
+    for momento in _datas(recorrencia, primeiro, timezone.make_naive(inicio), timezone.make_naive(fim)):
+        comeco = timezone.make_aware(momento)
+        yield comeco, comeco + duracao
+
+
+def ocorrencias_horario(horario, inicio, fim):
+    """Gera (data_inicio, data_fim) das aulas de um HorarioAula em [inicio, fim)."""
+    dia = timezone.make_naive(inicio).date()
+    dia += timedelta(days=(horario.dia_semana - dia.weekday()) % 7)
+    while True:
+        comeco = timezone.make_aware(datetime.combine(dia, horario.hora_inicio))
+        if comeco >= fim:
+            return
+        if comeco >= inicio:
+            yield comeco, timezone.make_aware(datetime.combine(dia, horario.hora_fim))
+        dia += timedelta(days=7)
@@ -0,0 +1,83 @@
+"""
+Sinais do app calendario.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from academico.donos import dono_da_origem, dono_materia, dono_semestre, memoria
+from academico.models import EventoAgenda, HorarioAula, Materia, Semestre
+from .ics import invalidar_calendario
+from .lembretes import agendar_evento
+from .models import EventoCalendario, RecorrenciaEvento
+
+
+def _invalidar(usuario_id, origin=None):
+    """
+    Renova a versão do feed ICS do usuário. Numa exclusão em cascata
+    (`origin` do post_delete) cada dono é invalidado uma vez só; o dono
+    vem de academico.donos, sem consulta por linha removida.
+    """
+    invalidados = memoria(origin)
+    if invalidados is not None:
+        if ('ics', usuario_id) in invalidados:
+            return
+        invalidados['ics', usuario_id] = True
+    invalidar_calendario(usuario_id)
+
+
+@receiver([post_save, post_delete], sender=EventoCalendario)
+@receiver([post_save, post_delete], sender=EventoAgenda)
+@receiver([post_save, post_delete], sender=Semestre)
+def evento_alterado(sender, instance, origin=None, **kwargs):
+    """Renova a versão do feed ICS do dono do registro."""
+    _invalidar(instance.usuario_id, origin)
+
+
+@receiver([post_save, post_delete], sender=RecorrenciaEvento)
+def recorrencia_alterada(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, EventoCalendario):
+        dono = origin.usuario_id
+    else:
+        dono = dono_da_origem(origin)
+    if dono is None:
+        dono = instance.evento.usuario_id
+    _invalidar(dono, origin)
+
+
+@receiver([post_save, post_delete], sender=Materia)
+def materia_alterada(sender, instance, origin=None, **kwargs):
+    _invalidar(dono_semestre(instance.semestre_id, origin), origin)
+
+
+@receiver([post_save, post_delete], sender=HorarioAula)
+def horario_alterado(sender, instance, origin=None, **kwargs):
+    _invalidar(dono_materia(instance.materia_id, origin), origin)
+
+
+@receiver(post_save, sender=EventoCalendario)
+def agendar_lembretes_evento(sender, instance, raw=False, **kwargs):
+    """Refaz os lembretes pendentes do evento salvo."""
+    if not raw:
+        agendar_evento(instance)
+
+
+@receiver(post_save, sender=RecorrenciaEvento)
+def agendar_lembretes_recorrencia(sender, instance, raw=False, **kwargs):
+    if not raw:
+        agendar_evento(instance.evento)
+
+
+@receiver(post_delete, sender=RecorrenciaEvento)
+def recorrencia_removida(sender, instance, **kwargs):
+    # Na exclusão em cascata do evento a recorrência sai antes dele, então
+    # o reagendamento espera o commit e só ocorre se o evento ainda existir.
+    evento_id = instance.evento_id
+
+    def reagendar():
+        evento = EventoCalendario.objects.filter(pk=evento_id).select_related('usuario').first()
+        if evento is not None:
+            agendar_evento(evento)
+
+    transaction.on_commit(reagendar)
@@ -0,0 +1,30 @@
+"""
+Tarefas em segundo plano do app calendario (core.fila).
+"""
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from core.fila import tarefa_assincrona
+from . import lembretes
+from .models import EventoCalendario
+from .planejamento import PlanejadorEstudos
+
+User = get_user_model()
+
+
+@tarefa_assincrona(fila='calendario')
+def replanejar_estudos(usuario_id):
+    """Refaz o plano de estudos do usuário, se ele já usa o planejador."""
+    usa_planejador = EventoCalendario.objects.filter(
+        usuario_id=usuario_id, gerado_automaticamente=True, data_inicio__gte=timezone.now()
+    ).exists()
+    usuario = User.objects.filter(pk=usuario_id, is_active=True).select_related('perfil').first()
+    if usa_planejador and usuario is not None:
+        PlanejadorEstudos(usuario).gravar()
+
+
+@tarefa_assincrona(fila='calendario', prioridade=10)
+def estender_lembretes():
+    """Agenda os lembretes de eventos criados sem sinais (bulk_create)."""
+    lembretes.estender_horizonte()
@@ -1,3 +1,352 @@
-from django.test import TestCase
+import uuid
+from datetime import date, datetime, time, timedelta
+from unittest import mock
+from zoneinfo import ZoneInfo
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from academico.models import HorarioAula, Materia, Semestre
+from users.models import PerfilUsuario
+from . import ics, lembretes
+from .importacao import ImportadorCalendario
+from .models import EventoCalendario, LembreteEvento, RecorrenciaEvento
+from .planejamento import PlanejadorEstudos
+from .recorrencia import ocorrencias
+from .views import _inicio_evento, gerar_eventos_horarios, montar_grade_semanal
+
+User = get_user_model()
+
+SAO_PAULO = ZoneInfo('America/Sao_Paulo')
+
+
+class GradeCalendarioTests(SimpleTestCase):
+    """Eventos do banco (em UTC) caem no dia e na hora locais."""
+
+    def _evento(self, inicio):
+        return EventoCalendario(titulo='Revisão', data_inicio=inicio, data_fim=inicio + timedelta(hours=1))
+
+    def test_evento_noturno_na_grade_semanal(self):
+        # 21h de terça em São Paulo = 00h de quarta em UTC
+        inicio = datetime(2026, 10, 20, 21, tzinfo=SAO_PAULO).astimezone(ZoneInfo('UTC'))
+        semana = [date(2026, 10, 18) + timedelta(days=i) for i in range(7)]
+        linhas = montar_grade_semanal(semana, range(7, 23), [self._evento(inicio)])
+
+        ocupadas = [
+            (linha['hora'], celula['dia_index'])
+            for linha in linhas for celula in linha['celulas'] if celula['eventos']
+        ]
+        self.assertEqual(ocupadas, [(21, 2)])
+
+    def test_inicio_local_para_a_grade_mensal(self):
+        # A grade mensal agrupa por _inicio_evento(evento).date()
+        inicio = datetime(2026, 10, 20, 22, 30, tzinfo=SAO_PAULO).astimezone(ZoneInfo('UTC'))
+        self.assertEqual(_inicio_evento(self._evento(inicio)).date(), date(2026, 10, 20))
+
+
+class InvalidacaoFeedTests(TestCase):
+    """Exclusões em cascata resolvem o dono uma vez, não uma vez por linha."""
+
+    def setUp(self):
+        self.usuario = User.objects.create_user('ana', 'ana@exemplo.com', 'senha')
+
+    def _semestre_com_horarios(self, quantidade):
+        semestre = Semestre.objects.create(
+            usuario=self.usuario, nome='2026/1', ano=2026, periodo='1',
+            data_inicio=date(2026, 2, 1), data_fim=date(2026, 6, 30),
+        )
+        materia = Materia.objects.create(semestre=semestre, nome='Cálculo', slug=f'calculo-{quantidade}')
+        for dia in range(quantidade):
+            HorarioAula.objects.create(materia=materia, dia_semana=dia % 7, hora_inicio=time(8 + dia // 7), hora_fim=time(9 + dia // 7))
+        return semestre
+
+    def _excluir(self, semestre):
+        with mock.patch('calendario.signals.invalidar_calendario') as invalidar:
+            with CaptureQueriesContext(connection) as consultas:
+                semestre.delete()
+        return invalidar, len(consultas)
+
+    def test_cascata_do_semestre(self):
+        invalidar, poucos = self._excluir(self._semestre_com_horarios(2))
+        invalidar.assert_called_once_with(self.usuario.pk)
+        _, muitos = self._excluir(self._semestre_com_horarios(12))
+        self.assertEqual(poucos, muitos)
+
+
+class HorariosCalendarioTests(TestCase):
+    def test_so_os_horarios_do_usuario(self):
+        usuarios = [User.objects.create_user(nome, f'{nome}@exemplo.com', 'senha') for nome in ('ana', 'bia')]
+        for usuario in usuarios:
+            semestre = Semestre.objects.create(
+                usuario=usuario, nome='2026/2', ano=2026, periodo='2',
+                data_inicio=date(2026, 8, 1), data_fim=date(2026, 12, 15),
+            )
+            materia = Materia.objects.create(semestre=semestre, nome=f'Cálculo {usuario.username}', slug=f'calculo-{usuario.pk}')
+            HorarioAula.objects.create(materia=materia, dia_semana=0, hora_inicio=time(8), hora_fim=time(10))
+
+        eventos = gerar_eventos_horarios(usuarios[0], date(2026, 10, 19), date(2026, 10, 25))
+        self.assertEqual([evento['titulo'] for evento in eventos], ['Cálculo ana'])
+
+
+class FeedIcsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.usuario = User.objects.create_user('ana', 'ana@exemplo.com', 'senha')
+        self.url = reverse('calendario:ics_feed', args=[ics.token_usuario(self.usuario)])
+
+    @override_settings(CACHE_COMPARTILHADO=False)
+    def test_cache_local_responde_304_pelas_marcas_do_banco(self):
+        resposta = self.client.get(self.url)
+        etag = resposta['ETag']
+        self.assertNotIn('Last-Modified', resposta)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        inicio = datetime(2026, 10, 20, 10, tzinfo=SAO_PAULO)
+        evento = EventoCalendario.objects.create(usuario=self.usuario, titulo='Prova', data_inicio=inicio, data_fim=inicio + timedelta(hours=2))
+        resposta = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resposta.status_code, 200)
+        etag = resposta['ETag']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # A versão vem dos dados, não dos sinais: bulk_create também muda o ETag
+        RecorrenciaEvento.objects.bulk_create([RecorrenciaEvento(evento=evento, tipo_recorrencia=RecorrenciaEvento.TipoRecorrencia.SEMANAL)])
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    @override_settings(CACHE_COMPARTILHADO=True)
+    def test_cache_compartilhado_responde_304_ate_mudar(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        inicio = datetime(2026, 10, 20, 10, tzinfo=SAO_PAULO)
+        EventoCalendario.objects.create(usuario=self.usuario, titulo='Prova', data_inicio=inicio, data_fim=inicio + timedelta(hours=2))
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+@override_settings(REMINDER_HORIZON_HOURS=48, REMINDER_BATCH_SIZE=200)
+class LembretesTests(TestCase):
+    """Agendamento pelos sinais, reabastecimento do horizonte e envio em lote."""
+
+    def setUp(self):
+        self.agora = datetime(2026, 10, 19, 8, tzinfo=SAO_PAULO)
+        relogio = mock.patch('django.utils.timezone.now', side_effect=lambda: self.agora)
+        relogio.start()
+        self.addCleanup(relogio.stop)
+        self.usuario = User.objects.create_user('ana', 'ana@exemplo.com', 'senha')
+
+    def _evento(self, inicio, **campos):
+        return EventoCalendario.objects.create(
+            usuario=self.usuario, titulo='Prova', data_inicio=inicio, data_fim=inicio + timedelta(hours=2),
+            tempo_lembrete=30, **campos,
+        )
+
+    def _pendentes(self):
+        return list(
+            LembreteEvento.objects.filter(enviado_em__isnull=True).order_by('ocorrencia').values_list('ocorrencia', 'disparar_em')
+        )
+
+    def test_edicao_reagenda_e_desligar_remove(self):
+        inicio = datetime(2026, 10, 20, 10, tzinfo=SAO_PAULO)
+        evento = self._evento(inicio)
+        self.assertEqual(self._pendentes(), [(inicio, inicio - timedelta(minutes=30))])
+
+        evento.data_inicio, evento.data_fim = inicio + timedelta(hours=4), inicio + timedelta(hours=6)
+        evento.save()
+        self.assertEqual(self._pendentes(), [(evento.data_inicio, evento.data_inicio - timedelta(minutes=30))])
+
+        evento.lembrete = False
+        evento.save()
+        self.assertEqual(self._pendentes(), [])
+
+    def test_lembrete_enviado_nao_volta(self):
+        inicio = datetime(2026, 10, 20, 10, tzinfo=SAO_PAULO)
+        evento = self._evento(inicio)
+        LembreteEvento.objects.update(enviado_em=self.agora)
+        evento.save()
+        self.assertEqual(LembreteEvento.objects.count(), 1)
+        self.assertEqual(self._pendentes(), [])
+
+    def test_sem_notificacoes_nada_e_agendado(self):
+        self.usuario.notificacoes_email = False
+        self.usuario.save()
+        self._evento(datetime(2026, 10, 20, 10, tzinfo=SAO_PAULO))
+        self.assertFalse(LembreteEvento.objects.exists())
+
+    def test_horizonte_reabastece_eventos_recorrentes(self):
+        evento = self._evento(datetime(2026, 10, 19, 20, tzinfo=SAO_PAULO))
+        RecorrenciaEvento.objects.create(evento=evento, tipo_recorrencia=RecorrenciaEvento.TipoRecorrencia.DIARIA)
+        self.assertEqual([o.day for o, _ in self._pendentes()], [19, 20])
+
+        self.agora += timedelta(days=1)
+        lembretes.estender_horizonte()
+        lembretes.estender_horizonte()  # idempotente
+        self.assertEqual([o.day for o, _ in self._pendentes()], [19, 20, 21])
+
+    def test_envio_reserva_o_lote_uma_vez(self):
+        self._evento(datetime(2026, 10, 20, 10, tzinfo=SAO_PAULO))
+        self.assertEqual(lembretes.enviar_pendentes(), 0)
+
+        self.agora = datetime(2026, 10, 20, 9, 31, tzinfo=SAO_PAULO)
+        self.assertEqual(lembretes.enviar_pendentes(), 1)
+        self.assertEqual(lembretes.enviar_pendentes(), 0)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject, 'Lembrete: Prova às 10:00')
+        self.assertEqual(mail.outbox[0].to, ['ana@exemplo.com'])
+        self.assertEqual(LembreteEvento.objects.get().enviado_em, self.agora)
+
+    def test_lote_reservado_por_outro_worker_nao_e_enviado(self):
+        self._evento(datetime(2026, 10, 20, 10, tzinfo=SAO_PAULO))
+        self.agora = datetime(2026, 10, 20, 9, 31, tzinfo=SAO_PAULO)
+        token = uuid.uuid4
+
+        def outro_worker_reserva_antes():
+            LembreteEvento.objects.update(enviado_em=self.agora, lote='outro')
+            return token()
+
+        with mock.patch('calendario.lembretes.uuid.uuid4', side_effect=outro_worker_reserva_antes):
+            self.assertEqual(lembretes.enviar_pendentes(), 0)
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(LembreteEvento.objects.get().lote, 'outro')
+
+    def test_falha_no_envio_devolve_o_lote(self):
+        self._evento(datetime(2026, 10, 20, 10, tzinfo=SAO_PAULO))
+        self.agora = datetime(2026, 10, 20, 9, 31, tzinfo=SAO_PAULO)
+        conexao = mock.Mock(**{'send_messages.side_effect': OSError('SMTP fora do ar')})
+        with mock.patch('calendario.lembretes.get_connection', return_value=conexao):
+            with self.assertRaises(OSError), self.assertLogs('calendario.lembretes', 'ERROR'):
+                lembretes.enviar_pendentes()
+        self.assertEqual(LembreteEvento.objects.values_list('enviado_em', 'lote').get(), (None, ''))
+
+        self.assertEqual(lembretes.enviar_pendentes(), 1)
+        self.assertEqual(len(mail.outbox), 1)
+
+
+@override_settings(STUDY_PLANNER_DAY_START='08:00', STUDY_PLANNER_DAY_END='12:00')
+class PlanejadorEstudosTests(TestCase):
+    """Sessões encaixadas entre aulas e eventos, dentro da janela diária."""
+
+    def setUp(self):
+        self.usuario = User.objects.create_user('ana', 'ana@exemplo.com', 'senha')
+        PerfilUsuario.objects.create(usuario=self.usuario, horas_estudo_dia=2, metodo_estudo_preferido='')
+        semestre = Semestre.objects.create(
+            usuario=self.usuario, nome='2026/2', ano=2026, periodo='2',
+            data_inicio=date(2026, 8, 1), data_fim=date(2026, 12, 15),
+        )
+        materia = Materia.objects.create(semestre=semestre, nome='Cálculo', slug='calculo')
+        # Segunda 09:00–10:00 (aula) e terça 08:30–09:30 (evento)
+        HorarioAula.objects.create(materia=materia, dia_semana=0, hora_inicio=time(9), hora_fim=time(10))
+        inicio = datetime(2026, 10, 20, 8, 30, tzinfo=SAO_PAULO)
+        EventoCalendario.objects.create(usuario=self.usuario, titulo='Monitoria', data_inicio=inicio, data_fim=inicio + timedelta(hours=1))
+        self.agora = datetime(2026, 10, 19, 7, tzinfo=SAO_PAULO)
+
+    def _planejador(self):
+        self.usuario.refresh_from_db()
+        return PlanejadorEstudos(self.usuario, semanas=1, agora=self.agora)
+
+    def _inicios(self, sessoes):
+        return [timezone.localtime(sessao.data_inicio).strftime('%d %H:%M') for sessao in sessoes]
+
+    def test_sessoes_contornam_aulas_e_eventos(self):
+        sessoes = self._planejador().planejar()
+        self.assertEqual(self._inicios(sessoes)[:4], ['19 08:00', '19 10:00', '20 09:30', '20 10:30'])
+        # Meta de 2 h por dia com sessões de 50 min: duas por dia, nos 7 dias
+        self.assertEqual(len(sessoes), 14)
+        for sessao in sessoes:
+            inicio, fim = timezone.localtime(sessao.data_inicio), timezone.localtime(sessao.data_fim)
+            self.assertGreaterEqual(inicio.time(), time(8))
+            self.assertLessEqual(fim.time(), time(12))
+            self.assertEqual(sessao.titulo, 'Revisão: Cálculo')
+
+    @override_settings(STUDY_PLANNER_DAY_START='10:00', STUDY_PLANNER_DAY_END='11:00')
+    def test_janela_diaria_limita_as_sessoes(self):
+        sessoes = self._planejador().planejar()
+        self.assertEqual(self._inicios(sessoes)[:2], ['19 10:00', '20 10:00'])
+        self.assertEqual(len(sessoes), 7)
+
+    def test_gravar_de_novo_e_idempotente(self):
+        removidas, criadas = self._planejador().gravar()
+        self.assertEqual((removidas, criadas), (0, 14))
+        inicios = list(EventoCalendario.objects.filter(gerado_automaticamente=True).values_list('data_inicio', flat=True))
+
+        self.assertEqual(self._planejador().gravar(), (14, 14))
+        self.assertEqual(
+            list(EventoCalendario.objects.filter(gerado_automaticamente=True).values_list('data_inicio', flat=True)),
+            inicios,
+        )
+        self.assertEqual(PerfilUsuario.objects.get(usuario=self.usuario).total_eventos, 15)
+
+
+class ImportacaoIcsTests(TestCase):
+    def setUp(self):
+        self.usuario = User.objects.create_user('ana', 'ana@exemplo.com', 'senha')
+
+    def _importar(self, rrule):
+        linhas = [
+            'BEGIN:VCALENDAR', 'BEGIN:VEVENT', 'DTSTART:20261020T130000Z', 'DTEND:20261020T150000Z',
+            'SUMMARY:Grupo de estudos', f'RRULE:{rrule}', 'END:VEVENT', 'END:VCALENDAR',
+        ]
+        return ImportadorCalendario(self.usuario).importar([f'{linha}\r\n' for linha in linhas], 'ics', somente_validar=True)
+
+    def test_intervalo_da_rrule(self):
+        resultado = self._importar('FREQ=WEEKLY;INTERVAL=2;BYDAY=TU,TH;UNTIL=20261215T000000Z')
+        self.assertEqual(resultado.erros, [])
+        _, recorrencia = resultado.recorrencias[0]
+        self.assertEqual((recorrencia.intervalo, recorrencia.dias_semana), (2, '2,4'))
+        self.assertEqual(recorrencia.data_fim_recorrencia, date(2026, 12, 14))
+
+    def test_intervalo_invalido_vira_erro_da_linha(self):
+        for intervalo in ('abc', '0', '-1'):
+            with self.subTest(intervalo=intervalo):
+                resultado = self._importar(f'FREQ=DAILY;INTERVAL={intervalo}')
+                self.assertEqual(resultado.resumo()['eventos'], 0)
+                self.assertEqual(len(resultado.erros), 1)
+                self.assertIn('INTERVAL', resultado.erros[0][1])
+
+
+class RecorrenciaTests(SimpleTestCase):
+    """Expansão das séries: saltar para a janela dá o mesmo que percorrer desde o início."""
+
+    def _serie(self, tipo, inicio, **campos):
+        evento = EventoCalendario(titulo='Monitoria', data_inicio=inicio, data_fim=inicio + timedelta(hours=2))
+        return evento, RecorrenciaEvento(evento=evento, tipo_recorrencia=tipo, **campos)
+
+    def _inicios(self, serie, de, ate):
+        return [inicio for inicio, _ in ocorrencias(*serie, de, ate)]
+
+    def test_janela_distante_igual_a_expansao_completa(self):
+        inicio = datetime(2026, 1, 31, 19, tzinfo=SAO_PAULO)
+        series = [
+            self._serie(RecorrenciaEvento.TipoRecorrencia.DIARIA, inicio, intervalo=3),
+            self._serie(RecorrenciaEvento.TipoRecorrencia.SEMANAL, inicio, intervalo=2, dias_semana='2,4,6'),
+            self._serie(RecorrenciaEvento.TipoRecorrencia.QUINZENAL, inicio),
+            self._serie(RecorrenciaEvento.TipoRecorrencia.MENSAL, inicio),
+            self._serie(RecorrenciaEvento.TipoRecorrencia.ANUAL, inicio, intervalo=2),
+        ]
+        de, ate = datetime(2029, 3, 1, tzinfo=SAO_PAULO), datetime(2029, 5, 1, tzinfo=SAO_PAULO)
+        for serie in series:
+            with self.subTest(tipo=serie[1].tipo_recorrencia):
+                completa = [i for i in self._inicios(serie, inicio, ate) if i >= de]
+                self.assertEqual(self._inicios(serie, de, ate), completa)
+
+    def test_semanal_nos_dias_escolhidos_na_hora_local(self):
+        inicio = datetime(2026, 10, 20, 19, tzinfo=SAO_PAULO)  # terça
+        serie = self._serie(RecorrenciaEvento.TipoRecorrencia.SEMANAL, inicio, dias_semana='2,4')
+        inicios = self._inicios(serie, inicio, inicio + timedelta(days=14))
+        self.assertEqual([(i.astimezone(SAO_PAULO).day, i.astimezone(SAO_PAULO).hour) for i in inicios], [(20, 19), (22, 19), (27, 19), (29, 19)])
+
+    def test_mensal_pula_meses_sem_o_dia(self):
+        inicio = datetime(2026, 1, 31, 10, tzinfo=SAO_PAULO)
+        serie = self._serie(RecorrenciaEvento.TipoRecorrencia.MENSAL, inicio)
+        inicios = self._inicios(serie, inicio, datetime(2026, 8, 1, tzinfo=SAO_PAULO))
+        self.assertEqual([i.month for i in inicios], [1, 3, 5, 7])
+
+    def test_data_final_da_recorrencia(self):
+        inicio = datetime(2026, 10, 20, 8, tzinfo=SAO_PAULO)
+        serie = self._serie(RecorrenciaEvento.TipoRecorrencia.DIARIA, inicio, data_fim_recorrencia=date(2026, 10, 24))
+        inicios = self._inicios(serie, inicio, inicio + timedelta(days=30))
+        self.assertEqual(len(inicios), 5)
+        self.assertEqual(inicios[-1].date(), date(2026, 10, 24))
@@ -16,9 +16,19 @@ urlpatterns = [
     path('evento/<int:evento_id>/editar/', views.evento_editar, name='evento_editar'),
     path('evento/<int:evento_id>/excluir/', views.evento_excluir, name='evento_excluir'),
     
+    # Importação em lote (CSV/ICS)
+    path('importar/', views.importar_calendario, name='importar'),
+    
+    # Sobreposições entre aulas e eventos
+    path('conflitos/', views.conflitos_semana, name='conflitos'),
+    
     # Lista de eventos com filtros
     path('eventos/', views.eventos_lista, name='eventos_lista'),
     
     # API JSON para integração
     path('api/eventos/', views.eventos_json, name='eventos_json'),
+    path('api/feed/', views.eventos_feed, name='eventos_feed'),
+    
+    # Assinatura iCalendar (pública, autenticada pelo token)
+    path('ics/<str:token>/', views.ics_feed, name='ics_feed'),
 ]
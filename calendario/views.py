@@ -1,57 +1,121 @@
+from django.conf import settings
 from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.utils import timezone
 from django.urls import reverse
-from django.db.models import Q
-from django.http import JsonResponse
+from django.db.models import Count, Max, Q
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.core import signing
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
 from datetime import datetime, timedelta, date
 import calendar
+import hashlib
+import io
 import json
 from .models import EventoCalendario, RecorrenciaEvento
-from .forms import EventoCalendarioForm, RecorrenciaEventoForm, FiltroEventosForm
+from .forms import EventoCalendarioForm, RecorrenciaEventoForm, FiltroEventosForm, ImportacaoCalendarioForm
+from .importacao import ImportadorCalendario, formato_do_arquivo
+from .recorrencia import ocorrencias, ocorrencias_horario
+from . import ics
+from academico.conflitos import IndiceSemana
 from academico.models import HorarioAula
 
+User = get_user_model()
+
 def gerar_eventos_horarios(user, first_day, last_day):
     """Gera eventos virtuais baseados nos horários de aula das matérias"""
     eventos_horarios = []
     
-    # Buscar todos os horários de aula ativos (as matérias são globais no sistema)
-    horarios = HorarioAula.objects.filter(ativo=True).select_related('materia')
+    # Horários de aula ativos das matérias do usuário (como nos feeds)
+    horarios = HorarioAula.objects.filter(ativo=True, materia__semestre__usuario=user).select_related('materia')
+    
+    # Agrupar por dia da semana (0=Segunda, 6=Domingo, igual ao Python)
+    horarios_por_dia = {}
+    for horario in horarios:
+        horarios_por_dia.setdefault(horario.dia_semana, []).append(horario)
     
-    # Para cada horário, gerar eventos para o período solicitado
+    # Para cada dia, gerar eventos dos horários daquele dia da semana
     current_date = first_day
     while current_date <= last_day:
-        # Mapear dia da semana (0=Segunda, 6=Domingo) para Python (0=Segunda, 6=Domingo)
-        weekday = current_date.weekday()
-        
-        for horario in horarios:
-            # Verificar se o horário corresponde ao dia da semana atual
-            if horario.dia_semana == weekday:
-                # Criar um objeto evento virtual
-                evento_virtual = {
-                    'id': f'horario_{horario.id}_{current_date}',
-                    'titulo': f'{horario.materia.nome}',
-                    'descricao': f'Aula regular - {horario.local}' if horario.local else 'Aula regular',
-                    'data_inicio': timezone.make_aware(
-                        datetime.combine(current_date, horario.hora_inicio)
-                    ),
-                    'data_fim': timezone.make_aware(
-                        datetime.combine(current_date, horario.hora_fim)
-                    ),
-                    'tipo': 'AULA',
-                    'cor': '#28a745',  # Verde para aulas regulares
-                    'local': horario.local or '',
-                    'observacoes': horario.observacoes or '',
-                    'materia': horario.materia,
-                    'is_horario_fixo': True,  # Flag para identificar como horário fixo
-                }
-                eventos_horarios.append(evento_virtual)
+        for horario in horarios_por_dia.get(current_date.weekday(), []):
+            # Criar um objeto evento virtual
+            evento_virtual = {
+                'id': f'horario_{horario.id}_{current_date}',
+                'titulo': f'{horario.materia.nome}',
+                'descricao': f'Aula regular - {horario.local}' if horario.local else 'Aula regular',
+                'data_inicio': timezone.make_aware(
+                    datetime.combine(current_date, horario.hora_inicio)
+                ),
+                'data_fim': timezone.make_aware(
+                    datetime.combine(current_date, horario.hora_fim)
+                ),
+                'tipo': 'AULA',
+                'cor': '#28a745',  # Verde para aulas regulares
+                'local': horario.local or '',
+                'observacoes': horario.observacoes or '',
+                'materia': horario.materia,
+                'is_horario_fixo': True,  # Flag para identificar como horário fixo
+            }
+            eventos_horarios.append(evento_virtual)
         
         current_date += timedelta(days=1)
     
     return eventos_horarios
 
+def _inicio_evento(evento):
+    """
+    Início, no fuso local, de um evento do banco ou de um evento virtual de
+    horário: com USE_TZ o do banco vem em UTC e cairia no dia/hora errados.
+    """
+    inicio = evento['data_inicio'] if isinstance(evento, dict) else evento.data_inicio
+    return timezone.localtime(inicio)
+
+def montar_grade_mensal(year, month, eventos_por_data, today):
+    """
+    Lista plana das células do mês (semanas começando no domingo), cada uma
+    já com seus eventos, para o template apenas iterar.
+    """
+    celulas = []
+    for semana in calendar.Calendar(firstweekday=6).monthdatescalendar(year, month):
+        for data in semana:
+            no_mes = data.month == month
+            celulas.append({
+                'data': data,
+                'dia': data.day if no_mes else 0,
+                'no_mes': no_mes,
+                'hoje': no_mes and data == today,
+                'eventos': eventos_por_data.get(data, []) if no_mes else [],
+            })
+    return celulas
+
+def montar_grade_semanal(week_dates, horas, eventos):
+    """
+    Linhas da grade semanal (uma por hora) com 7 células cada, já com os
+    eventos. O índice do dia vem de um dicionário data -> posição.
+    """
+    indice_dia = {data: i for i, data in enumerate(week_dates)}
+    eventos_por_hora = {hora: [[] for _ in range(7)] for hora in horas}
+    
+    for evento in eventos:
+        inicio = _inicio_evento(evento)
+        dia_index = indice_dia.get(inicio.date())
+        if dia_index is not None and inicio.hour in eventos_por_hora:
+            eventos_por_hora[inicio.hour][dia_index].append(evento)
+    
+    return [
+        {
+            'hora': hora,
+            'celulas': [
+                {'dia_index': i, 'eventos': eventos_dia}
+                for i, eventos_dia in enumerate(eventos_por_hora[hora])
+            ],
+        }
+        for hora in horas
+    ]
+
 @login_required
 def calendario_home(request):
     """Página principal do calendário com visualização mensal e semanal"""
@@ -78,7 +142,6 @@ def calendario_home(request):
     
     # Para visualização semanal, calcular semana atual
     week_dates = []
-    eventos_semana_por_hora = {}
     horas_semana = list(range(7, 23))  # 7h às 22h
     
     if current_view == 'weekly':
@@ -99,19 +162,13 @@ def calendario_home(request):
                     for i, dia in enumerate(semana):
                         week_dates.append(date(year, month, dia))
                     break
-        
-        # Inicializar estrutura de eventos por hora e dia da semana
-        for hora in horas_semana:
-            eventos_semana_por_hora[hora] = {}
-            for dia_index in range(7):
-                eventos_semana_por_hora[hora][dia_index] = []
     
     # Buscar eventos normais
     eventos = EventoCalendario.objects.filter(
         usuario=request.user,
         data_inicio__date__gte=first_day,
         data_inicio__date__lte=last_day
-    ).order_by('data_inicio')
+    ).select_related('materia').order_by('data_inicio')
     
     # Gerar eventos dos horários de aula
     eventos_horarios = gerar_eventos_horarios(request.user, first_day, last_day)
@@ -119,33 +176,12 @@ def calendario_home(request):
     # Combinar eventos normais e horários
     todos_eventos = list(eventos) + eventos_horarios
     
-    # Organizar eventos por dia (visualização mensal)
-    eventos_por_dia = {}
+    # Organizar eventos por data (visualização mensal)
+    eventos_por_data = {}
     for evento in todos_eventos:
-        if hasattr(evento, 'data_inicio'):
-            # Evento normal do banco
-            dia = evento.data_inicio.date().day
-            data_evento = evento.data_inicio.date()
-        else:
-            # Evento virtual do horário
-            dia = evento['data_inicio'].date().day
-            data_evento = evento['data_inicio'].date()
-            
-        if dia not in eventos_por_dia:
-            eventos_por_dia[dia] = []
-        eventos_por_dia[dia].append(evento)
-        
-        # Para visualização semanal, organizar por hora e dia da semana
-        if current_view == 'weekly' and data_evento in week_dates:
-            dia_semana_index = week_dates.index(data_evento)
-            
-            if hasattr(evento, 'data_inicio'):
-                hora_evento = evento.data_inicio.hour
-            else:
-                hora_evento = evento['data_inicio'].hour
-            
-            if hora_evento in horas_semana:
-                eventos_semana_por_hora[hora_evento][dia_semana_index].append(evento)
+        eventos_por_data.setdefault(_inicio_evento(evento).date(), []).append(evento)
+    
+    weekdays = ['Dom', 'Seg', 'Ter', 'Qua', 'Qui', 'Sex', 'Sáb']
     
     # Navegação de meses
     if month == 1:
@@ -171,11 +207,10 @@ def calendario_home(request):
     proximos_eventos = EventoCalendario.objects.filter(
         usuario=request.user,
         data_inicio__gte=timezone.now()
-    )[:3]
+    ).select_related('materia')[:3]
     
     context = {
-        'month_days': month_days,
-        'eventos_por_dia': eventos_por_dia,
+        'grade_mensal': montar_grade_mensal(year, month, eventos_por_data, today),
         'current_month': month,
         'current_year': year,
         'month_name': calendar.month_name[month],
@@ -185,18 +220,38 @@ def calendario_home(request):
         'next_month': next_month,
         'next_year': next_year,
         'next_month_name': next_month_name,
+        'url_ics': request.build_absolute_uri(
+            reverse('calendario:ics_feed', args=[ics.token_usuario(request.user)])
+        ),
         'today': today,
         'eventos_hoje': eventos_hoje,
         'proximos_eventos': proximos_eventos,
-        'weekdays': ['Dom', 'Seg', 'Ter', 'Qua', 'Qui', 'Sex', 'Sáb'],
+        'weekdays': weekdays,
         'current_view': current_view,
-        'week_dates': week_dates,
-        'eventos_semana_por_hora': eventos_semana_por_hora,
-        'horas_semana': horas_semana,
+        'cabecalho_semana': [
+            {'nome': nome, 'data': week_dates[i] if week_dates else None}
+            for i, nome in enumerate(weekdays)
+        ],
+        'grade_semanal': montar_grade_semanal(
+            week_dates, horas_semana, todos_eventos if week_dates else []
+        ),
     }
     
     return render(request, 'calendario/calendario_home.html', context)
 
+def _avisar_conflitos(request, evento):
+    """Avisa (sem impedir o salvamento) se o evento se sobrepõe a aulas ou outros eventos da semana."""
+    data = timezone.localdate(evento.data_inicio)
+    indice = IndiceSemana.do_usuario(request.user, data)
+    itens = indice.sobrepostos(evento.data_inicio, evento.data_fim, ignorar=evento)
+    if itens:
+        nomes = ', '.join(
+            f'{item.titulo} ({timezone.localtime(item.inicio):%d/%m %H:%M})' for item in itens[:5]
+        )
+        if len(itens) > 5:
+            nomes += f' e mais {len(itens) - 5}'
+        messages.warning(request, f'"{evento.titulo}" se sobrepõe a: {nomes}.')
+
 @login_required
 def evento_criar(request):
     """Criar um novo evento"""
@@ -218,6 +273,7 @@ def evento_criar(request):
                 messages.success(request, f'Evento "{evento.titulo}" criado com recorrência!')
             else:
                 messages.success(request, f'Evento "{evento.titulo}" criado com sucesso!')
+            _avisar_conflitos(request, evento)
             
             return redirect('calendario:calendario_home')
     else:
@@ -264,6 +320,7 @@ def evento_editar(request, evento_id):
         if form.is_valid():
             evento = form.save()
             messages.success(request, f'Evento "{evento.titulo}" atualizado com sucesso!')
+            _avisar_conflitos(request, evento)
             return redirect('calendario:evento_detalhe', evento_id=evento.id)
     else:
         form = EventoCalendarioForm(instance=evento, user=request.user)
@@ -310,7 +367,7 @@ def eventos_lista(request):
     form = FiltroEventosForm(request.GET, user=request.user)
     
     # Filtros base
-    eventos = EventoCalendario.objects.filter(usuario=request.user)
+    eventos = EventoCalendario.objects.filter(usuario=request.user).select_related('materia')
     
     if form.is_valid():
         # Filtro por período
@@ -369,21 +426,18 @@ def eventos_lista(request):
 @login_required
 def eventos_json(request):
     """API JSON para eventos do calendário (para integração com plugins JS)"""
-    start = request.GET.get('start')
-    end = request.GET.get('end')
-    
-    try:
-        start_date = datetime.fromisoformat(start.replace('Z', '+00:00'))
-        end_date = datetime.fromisoformat(end.replace('Z', '+00:00'))
-    except (ValueError, AttributeError):
+    janela = _ler_janela(request)
+    if janela is None:
         return JsonResponse({'error': 'Datas inválidas'}, status=400)
+    start_date, end_date = janela
     
     eventos = EventoCalendario.objects.filter(
         usuario=request.user,
         data_inicio__gte=start_date,
         data_inicio__lt=end_date
-    )
+    ).select_related('materia')
     
+    url_evento = _url_evento_template()
     eventos_json = []
     for evento in eventos:
         eventos_json.append({
@@ -395,11 +449,262 @@ def eventos_json(request):
             'color': evento.get_cor_evento(),
             'tipo': evento.get_tipo_evento_display(),
             'materia': evento.materia.nome if evento.materia else None,
-            'url': reverse('calendario:evento_detalhe', args=[evento.id])
+            'url': url_evento.format(evento_id=evento.id)
         })
     
     return JsonResponse(eventos_json, safe=False)
 
+# Colunas de cada linha do feed, na ordem em que são serializadas
+CAMPOS_FEED = ['id', 'evento_id', 'titulo', 'inicio', 'fim', 'tipo', 'cor', 'materia']
+
+# Campos carregados do banco para montar o feed (only)
+CAMPOS_CONSULTA_FEED = [
+    'id', 'titulo', 'data_inicio', 'data_fim', 'tipo_evento', 'cor_personalizada',
+    'materia__nome', 'recorrencia__tipo_recorrencia', 'recorrencia__data_fim_recorrencia',
+    'recorrencia__intervalo', 'recorrencia__dias_semana',
+]
+
+SALT_SYNC_FEED = 'calendario.feed.sync'
+
+def _url_evento_template():
+    """URL de detalhe com o marcador {evento_id}, montada com um único reverse."""
+    return reverse('calendario:evento_detalhe', args=[0]).replace('/0/', '/{evento_id}/')
+
+def _ler_janela(request):
+    """Lê start/end (ISO 8601) da query string como datetimes aware; None se inválidos."""
+    try:
+        janela = [
+            datetime.fromisoformat(request.GET[nome].replace('Z', '+00:00'))
+            for nome in ('start', 'end')
+        ]
+    except (KeyError, ValueError):
+        return None
+    return [timezone.make_aware(d) if timezone.is_naive(d) else d for d in janela]
+
+def _linhas_evento(evento, inicio, fim):
+    """Linhas do feed para um evento: ele mesmo ou suas ocorrências na janela."""
+    materia = evento.materia.nome if evento.materia else None
+    cor = evento.get_cor_evento()
+    recorrencia = getattr(evento, 'recorrencia', None)
+    
+    if recorrencia is None:
+        yield [str(evento.id), evento.id, evento.titulo, evento.data_inicio, evento.data_fim,
+               evento.tipo_evento, cor, materia]
+        return
+    
+    for comeco, termino in ocorrencias(evento, recorrencia, inicio, fim):
+        yield [f'{evento.id}@{timezone.localdate(comeco)}', evento.id, evento.titulo,
+               comeco, termino, evento.tipo_evento, cor, materia]
+
+def _linhas_horarios(horarios, inicio, fim):
+    """Linhas do feed para as aulas semanais na janela."""
+    for horario in horarios:
+        for comeco, termino in ocorrencias_horario(horario, inicio, fim):
+            yield [f'horario_{horario.id}_{timezone.localdate(comeco)}', None, horario.materia.nome,
+                   comeco, termino, EventoCalendario.TipoEvento.AULA, '#28a745', horario.materia.nome]
+
+def _ler_token_sync(token, janela):
+    """Estado da última sincronização; None (sincronização completa) se ausente, inválido ou de outra janela."""
+    if not token:
+        return None
+    try:
+        estado = signing.loads(token, salt=SALT_SYNC_FEED)
+    except signing.BadSignature:
+        return None
+    return estado if estado.get('janela') == janela else None
+
+@login_required
+def eventos_feed(request):
+    """
+    Feed JSON compacto do calendário com sincronização incremental.
+    
+    Recebe start/end (ISO 8601) e devolve os eventos da janela com
+    recorrências e horários de aula já expandidos, como linhas na ordem de
+    CAMPOS_FEED. A resposta traz um token `sync`; enviado de volta no
+    parâmetro sync, o feed devolve apenas os eventos alterados desde então
+    (o cliente substitui todas as ocorrências de cada evento_id recebido),
+    a lista `ids` dos eventos ainda existentes na janela e as aulas só se
+    os horários mudaram. Suporta ETag/If-None-Match (304).
+    """
+    janela = _ler_janela(request)
+    if janela is None:
+        return JsonResponse({'error': 'Datas inválidas'}, status=400)
+    inicio, fim = janela
+    
+    eventos_usuario = EventoCalendario.objects.filter(usuario=request.user)
+    resumo = eventos_usuario.aggregate(
+        marca=Max('atualizado_em'), total=Count('id'), recorrentes=Count('recorrencia')
+    )
+    horarios = list(
+        HorarioAula.objects.filter(ativo=True, materia__semestre__usuario=request.user)
+        .select_related('materia')
+        .only('dia_semana', 'hora_inicio', 'hora_fim', 'materia__nome')
+    )
+    versao_horarios = hashlib.md5(json.dumps([
+        [h.id, h.dia_semana, str(h.hora_inicio), str(h.hora_fim), h.materia.nome] for h in horarios
+    ]).encode()).hexdigest()
+    marca = resumo['marca'].isoformat() if resumo['marca'] else None
+    
+    # Mesmo estado + mesmos parâmetros = mesma resposta
+    etag = quote_etag(hashlib.md5(json.dumps([
+        request.GET.urlencode(), marca, resumo['total'], resumo['recorrentes'], versao_horarios
+    ]).encode()).hexdigest())
+    resposta = get_conditional_response(request, etag=etag)
+    if resposta is not None:
+        return resposta
+    
+    chave_janela = f'{inicio.isoformat()}|{fim.isoformat()}'
+    anterior = _ler_token_sync(request.GET.get('sync'), chave_janela)
+    
+    # Eventos simples que começam na janela + séries recorrentes que a alcançam
+    em_janela = eventos_usuario.filter(data_inicio__lt=fim).filter(
+        Q(recorrencia__isnull=True, data_inicio__gte=inicio)
+        | Q(recorrencia__isnull=False, recorrencia__data_fim_recorrencia__isnull=True)
+        | Q(recorrencia__data_fim_recorrencia__gte=timezone.localdate(inicio))
+    )
+    
+    dados = {'completo': anterior is None}
+    alterados = em_janela
+    if anterior is not None:
+        dados['ids'] = list(em_janela.values_list('id', flat=True))
+        if anterior['marca']:
+            alterados = em_janela.filter(atualizado_em__gt=datetime.fromisoformat(anterior['marca']))
+    
+    linhas = []
+    for evento in alterados.select_related('materia', 'recorrencia').only(*CAMPOS_CONSULTA_FEED):
+        linhas.extend(_linhas_evento(evento, inicio, fim))
+    
+    dados['horarios_alterados'] = anterior is None or anterior['horarios'] != versao_horarios
+    if dados['horarios_alterados']:
+        linhas.extend(_linhas_horarios(horarios, inicio, fim))
+    
+    linhas.sort(key=lambda linha: linha[3])
+    for linha in linhas:
+        linha[3] = timezone.localtime(linha[3]).isoformat()
+        linha[4] = timezone.localtime(linha[4]).isoformat()
+    
+    dados.update({
+        'sync': signing.dumps(
+            {'janela': chave_janela, 'marca': marca, 'horarios': versao_horarios},
+            salt=SALT_SYNC_FEED
+        ),
+        'url_evento': _url_evento_template(),
+        'campos': CAMPOS_FEED,
+        'eventos': linhas,
+    })
+    
+    resposta = JsonResponse(dados)
+    resposta['ETag'] = etag
+    patch_cache_control(resposta, private=True, no_cache=True)
+    return resposta
+
+@login_required
+def importar_calendario(request):
+    """Importação em lote de horários de aula e eventos (CSV ou ICS)"""
+    resultado = None
+    
+    if request.method == 'POST':
+        form = ImportacaoCalendarioForm(request.POST, request.FILES)
+        if form.is_valid():
+            arquivo = form.cleaned_data['arquivo']
+            linhas = io.TextIOWrapper(arquivo.file, encoding='utf-8-sig', newline='')
+            try:
+                resultado = ImportadorCalendario(request.user).importar(
+                    linhas,
+                    formato_do_arquivo(arquivo.name),
+                    somente_validar=form.cleaned_data['somente_validar']
+                )
+            except UnicodeDecodeError:
+                messages.error(request, 'O arquivo deve estar em UTF-8.')
+            else:
+                resumo = resultado.resumo()
+                if resultado.gravado:
+                    messages.success(
+                        request,
+                        f'{resumo["materias"]} matéria(s), {resumo["horarios"]} horário(s) e '
+                        f'{resumo["eventos"]} evento(s) importados.'
+                    )
+                else:
+                    messages.info(
+                        request,
+                        f'Validação: {resumo["materias"]} matéria(s), {resumo["horarios"]} horário(s) e '
+                        f'{resumo["eventos"]} evento(s) prontos para importar.'
+                    )
+    else:
+        form = ImportacaoCalendarioForm()
+    
+    context = {
+        'form': form,
+        'resultado': resultado,
+        'titulo_pagina': 'Importar Calendário'
+    }
+    
+    return render(request, 'calendario/importar.html', context)
+
+@login_required
+def conflitos_semana(request):
+    """Sobreposições entre aulas e eventos do calendário numa semana"""
+    try:
+        data = datetime.strptime(request.GET.get('semana', ''), '%Y-%m-%d').date()
+    except ValueError:
+        data = timezone.localdate()
+    
+    indice = IndiceSemana.do_usuario(request.user, data)
+    conflitos = [
+        {
+            'dia': timezone.localdate(max(primeiro.inicio, segundo.inicio)),
+            'inicio': max(primeiro.inicio, segundo.inicio),
+            'fim': min(primeiro.fim, segundo.fim),
+            'itens': (primeiro, segundo),
+        }
+        for primeiro, segundo in indice.conflitos()
+    ]
+    
+    context = {
+        'conflitos': conflitos,
+        'total_itens': len(indice.itens),
+        'inicio_semana': indice.inicio_semana,
+        'fim_semana': indice.fim_semana - timedelta(days=1),
+        'semana_anterior': indice.inicio_semana - timedelta(days=7),
+        'proxima_semana': indice.fim_semana,
+        'titulo_pagina': 'Conflitos da Semana'
+    }
+    
+    return render(request, 'calendario/conflitos.html', context)
+
+def ics_feed(request, token):
+    """
+    Feed iCalendar do usuário do token, gerado em streaming.
+    
+    O ETag vem da versão do calendário (ics.versao_calendario), então as
+    consultas periódicas dos apps de calendário são respondidas com 304
+    sem gerar o feed enquanto nada mudar. Last-Modified só vai com cache
+    compartilhado: sem ele não há horário confiável da última alteração.
+    """
+    user_id = ics.usuario_do_token(token)
+    if user_id is None:
+        raise Http404('Feed não encontrado')
+    
+    versao = ics.versao_calendario(user_id)
+    if versao is None:
+        raise Http404('Feed não encontrado')
+    etag, modificado_em = quote_etag(versao[0]), versao[1]
+    last_modified = modificado_em if settings.CACHE_COMPARTILHADO else None
+    resposta = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if resposta is None:
+        usuario = get_object_or_404(User, pk=user_id)
+        resposta = StreamingHttpResponse(
+            ics.gerar_ics(user_id, usuario.get_full_name() or usuario.username, modificado_em),
+            content_type='text/calendar; charset=utf-8'
+        )
+        resposta['Content-Disposition'] = 'inline; filename="assistente-estudo.ics"'
+    
+    resposta['ETag'] = etag
+    if last_modified:
+        resposta['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(resposta, private=True, no_cache=True)
+    return resposta
+
 @login_required
 def dashboard_calendario(request):
     """Dashboard com resumo e estatísticas do calendário"""
@@ -1,3 +1,22 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import TarefaFila
+
+
+@admin.register(TarefaFila)
+class TarefaFilaAdmin(admin.ModelAdmin):
+    list_display = ['nome', 'fila', 'prioridade', 'status', 'tentativas', 'disponivel_em', 'criado_em', 'concluido_em']
+    list_filter = ['status', 'fila', 'nome']
+    search_fields = ['nome', 'erro']
+    date_hierarchy = 'criado_em'
+    readonly_fields = ['reserva', 'criado_em', 'concluido_em']
+    actions = ['reenfileirar']
+    
+    @admin.action(description='Reenfileirar tarefas selecionadas')
+    def reenfileirar(self, request, queryset):
+        from django.utils import timezone
+        
+        total = queryset.update(
+            status=TarefaFila.Status.PENDENTE, tentativas=0, reserva='', disponivel_em=timezone.now()
+        )
+        self.message_user(request, f'{total} tarefa(s) reenfileirada(s).')
@@ -0,0 +1,71 @@
+"""
+Carregamento do usuário autenticado com cache.
+
+O AuthenticationMiddleware padrão faz um SELECT em users_customuser a cada
+requisição. Aqui o usuário é guardado no cache por AUTH_USER_CACHE_TIMEOUT
+segundos e invalidado sempre que o registro é salvo ou excluído.
+
+A invalidação só alcança os outros workers com um cache compartilhado
+(CACHE_COMPARTILHADO: redis/memcached); com locmem ou file o cache de
+usuário fica desligado, qualquer que seja o timeout.
+"""
+
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+
+from .metricas import cache_requisicoes_total
+
+
+def chave_usuario_cache(user_id):
+    """Retorna a chave de cache do usuário."""
+    return f'auth:usuario:{user_id}'
+
+
+def invalidar_usuario_cache(user_id):
+    """Remove o usuário do cache (chamado nos sinais de save/delete)."""
+    cache.delete(chave_usuario_cache(user_id))
+
+
+def get_usuario_cache(request):
+    """
+    Equivalente a django.contrib.auth.get_user usando o cache.
+
+    Em caso de cache miss, ou se o hash de sessão não bater com o usuário
+    em cache, delega para o fluxo padrão do Django (que também trata
+    logout e fallbacks de SECRET_KEY).
+    """
+    timeout = getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', 0)
+    if not timeout or not getattr(settings, 'CACHE_COMPARTILHADO', False):
+        return auth.get_user(request)
+
+    try:
+        user_id = request.session[SESSION_KEY]
+        backend_path = request.session[BACKEND_SESSION_KEY]
+    except KeyError:
+        return AnonymousUser()
+
+    if backend_path not in settings.AUTHENTICATION_BACKENDS:
+        return auth.get_user(request)
+
+    chave = chave_usuario_cache(user_id)
+    user = cache.get(chave)
+
+    if user is None:
+        cache_requisicoes_total.inc(cache='usuario', resultado='miss')
+        user = auth.get_user(request)
+        if user.is_authenticated:
+            cache.set(chave, user, timeout)
+        return user
+
+    session_hash = request.session.get(HASH_SESSION_KEY)
+    if not session_hash or not constant_time_compare(
+        session_hash, user.get_session_auth_hash()
+    ):
+        return auth.get_user(request)
+
+    cache_requisicoes_total.inc(cache='usuario', resultado='hit')
+    return user
@@ -0,0 +1,114 @@
+"""
+Utilitários compartilhados pelos comandos de benchmark.
+
+Os benchmarks rodam contra um banco de teste temporário, nunca contra o
+banco de desenvolvimento.
+"""
+
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from django.db import connection, reset_queries, transaction
+from django.test.utils import (
+    CaptureQueriesContext, setup_test_environment, teardown_test_environment
+)
+from django.urls import URLPattern, URLResolver, get_resolver
+
+
+@contextmanager
+def banco_temporario(verbosity=0):
+    """Cria um banco de teste com as migrações aplicadas e o remove ao final."""
+    setup_test_environment()
+    nome_original = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=verbosity, autoclobber=True, serialize=False)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(nome_original, verbosity=verbosity)
+        teardown_test_environment()
+
+
+def formatar_tabela(cabecalho, linhas):
+    """Formata uma tabela de texto simples com colunas alinhadas."""
+    linhas = [[str(c) for c in linha] for linha in linhas]
+    larguras = [
+        max(len(str(cabecalho[i])), *(len(linha[i]) for linha in linhas)) if linhas
+        else len(str(cabecalho[i]))
+        for i in range(len(cabecalho))
+    ]
+
+    def fmt(valores):
+        return '  '.join(str(v).ljust(larguras[i]) for i, v in enumerate(valores))
+    saida = [fmt(cabecalho), '  '.join('-' * w for w in larguras)]
+    saida.extend(fmt(linha) for linha in linhas)
+    return '\n'.join(saida)
+
+
+def listar_rotas(modulos):
+    """
+    Retorna (nome_qualificado, URLPattern) das rotas nomeadas incluídas
+    pelos URLconfs informados (ex.: 'academico.urls').
+    """
+    rotas = []
+    for padrao in get_resolver().url_patterns:
+        if not isinstance(padrao, URLResolver):
+            continue
+        modulo = getattr(padrao.urlconf_name, '__name__', padrao.urlconf_name)
+        if modulo not in modulos:
+            continue
+        for item in padrao.url_patterns:
+            if isinstance(item, URLPattern) and item.name:
+                nome = f'{padrao.namespace}:{item.name}' if padrao.namespace else item.name
+                rotas.append((nome, item))
+    return rotas
+
+
+@contextmanager
+def _desfeita(ativo):
+    """Desfaz no fim do bloco tudo que a requisição gravou (se `ativo`)."""
+    if not ativo:
+        yield
+        return
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def medir_requisicao(client, metodo, url, dados=None, repeticoes=5, isolar=False):
+    """
+    Executa a requisição `repeticoes` vezes e retorna um dicionário com
+    status, mediana do tempo (ms), consultas e pico de memória (KB).
+
+    A memória é medida numa execução extra com tracemalloc, para não
+    distorcer os tempos. Com `isolar`, cada execução roda numa transação
+    desfeita ao final, então requisições que alteram dados (POST) medem
+    sempre o mesmo estado do banco.
+    """
+    executar = getattr(client, metodo)
+    tempos = []
+    with _desfeita(isolar):
+        resposta = executar(url, dados or {})  # aquecimento
+    for _ in range(repeticoes):
+        # O log de consultas é limitado; limpar evita contagens zeradas
+        reset_queries()
+        with _desfeita(isolar), CaptureQueriesContext(connection) as ctx:
+            inicio = time.perf_counter()
+            resposta = executar(url, dados or {})
+            tempos.append((time.perf_counter() - inicio) * 1000)
+
+    tracemalloc.start()
+    try:
+        with _desfeita(isolar):
+            executar(url, dados or {})
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'status': resposta.status_code,
+        'ms': round(statistics.median(tempos), 2),
+        'consultas': len(ctx.captured_queries),
+        'kb': round(pico / 1024, 1),
+    }
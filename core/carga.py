@@ -0,0 +1,364 @@
+"""
+Gerador de dados sintéticos em volume para testes de carga e benchmarks.
+
+Todos os registros são criados com bulk_create em lotes, cada lote dentro
+da sua própria transação. A geração é determinística para uma mesma seed:
+os usuários gerados recebem o prefixo "carga<seed>_", o que permite
+remover uma carga anterior sem afetar os dados reais.
+"""
+
+import random
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from academico.models import (
+    AcessoMateria, EventoAgenda, HorarioAula, Materia, Semestre, Tarefa
+)
+from calendario.models import EventoCalendario, RecorrenciaEvento
+
+User = get_user_model()
+
+# Volumes por perfil; cada chave pode ser sobrescrita individualmente.
+PERFIS = {
+    'pequeno': {
+        'usuarios': 20, 'semestres': 2, 'materias': 200, 'horarios': 2,
+        'tarefas': 5_000, 'acessos': 20_000, 'eventos': 2_000, 'eventos_agenda': 500,
+    },
+    'medio': {
+        'usuarios': 1_000, 'semestres': 4, 'materias': 10_000, 'horarios': 2,
+        'tarefas': 250_000, 'acessos': 1_000_000, 'eventos': 50_000, 'eventos_agenda': 20_000,
+    },
+    'producao': {
+        'usuarios': 10_000, 'semestres': 6, 'materias': 100_000, 'horarios': 2,
+        'tarefas': 5_000_000, 'acessos': 20_000_000, 'eventos': 500_000, 'eventos_agenda': 200_000,
+    },
+}
+
+NOMES_MATERIAS = [
+    'Cálculo I', 'Cálculo II', 'Álgebra Linear', 'Física I', 'Física II',
+    'Algoritmos e Estruturas de Dados', 'Programação Orientada a Objetos',
+    'Banco de Dados', 'Engenharia de Software', 'Redes de Computadores',
+    'Sistemas Operacionais', 'Inteligência Artificial', 'Estatística',
+    'Química Geral', 'Desenvolvimento Web', 'Compiladores', 'Probabilidade',
+    'Metodologia Científica', 'Arquitetura de Computadores', 'Teoria da Computação',
+]
+
+TITULOS_TAREFAS = [
+    'Lista de exercícios', 'Projeto prático', 'Relatório de pesquisa',
+    'Leitura do capítulo', 'Apresentação', 'Resumo da aula', 'Revisão para prova',
+]
+
+# Distribuição de acessos por hora do dia (pico à noite)
+PESOS_HORA = [
+    1, 1, 0, 0, 0, 0, 1, 3, 6, 8, 8, 7, 5, 6, 8, 9, 9, 8, 9, 12, 14, 13, 9, 4,
+]
+
+
+def em_lotes(iteravel, tamanho):
+    """Divide um iterável em listas de até `tamanho` itens."""
+    iterador = iter(iteravel)
+    while True:
+        lote = list(islice(iterador, tamanho))
+        if not lote:
+            return
+        yield lote
+
+
+@contextmanager
+def datas_manuais(*campos):
+    """
+    Desliga auto_now/auto_now_add dos campos informados para que as datas
+    geradas sejam gravadas em vez do horário atual.
+    """
+    originais = [(campo, campo.auto_now, campo.auto_now_add) for campo in campos]
+    for campo in campos:
+        campo.auto_now = campo.auto_now_add = False
+    try:
+        yield
+    finally:
+        for campo, auto_now, auto_now_add in originais:
+            campo.auto_now, campo.auto_now_add = auto_now, auto_now_add
+
+
+def _campo(modelo, nome):
+    return modelo._meta.get_field(nome)
+
+
+class GeradorCarga:
+    """Gera usuários, semestres, matérias, horários, tarefas, acessos e eventos."""
+
+    def __init__(self, seed=42, lote=5_000, saida=None):
+        self.seed = seed
+        self.lote = lote
+        self.saida = saida
+        self.rng = random.Random(seed)
+        self.prefixo = f'carga{seed}_'
+        self.tz = timezone.get_current_timezone()
+        self.hoje = timezone.localdate()
+
+    # ------------------------------------------------------------------ util
+
+    def _log(self, mensagem):
+        if self.saida:
+            self.saida.write(mensagem)
+
+    def _inserir(self, modelo, objetos, total):
+        """Insere `objetos` com bulk_create, um lote por transação."""
+        criados = 0
+        for lote in em_lotes(objetos, self.lote):
+            with transaction.atomic():
+                modelo.objects.bulk_create(lote, batch_size=self.lote)
+            criados += len(lote)
+            if total >= self.lote * 10 and criados % (self.lote * 10) == 0:
+                self._log(f'  {modelo._meta.verbose_name_plural}: {criados}/{total}')
+        return criados
+
+    def _datahora(self, dia, hora, minuto=0):
+        return datetime.combine(dia, time(hora, minuto), tzinfo=self.tz)
+
+    def _dia_entre(self, inicio, fim):
+        return inicio + timedelta(days=self.rng.randint(0, max((fim - inicio).days, 0)))
+
+    def _periodos(self, quantidade):
+        """Retorna (ano, periodo, inicio, fim) do semestre atual para trás."""
+        ano = self.hoje.year
+        periodo = '1' if self.hoje.month <= 7 else '2'
+        periodos = []
+        for _ in range(quantidade):
+            if periodo == '1':
+                periodos.append((ano, '1', date(ano, 2, 15), date(ano, 7, 15)))
+                ano, periodo = ano - 1, '2'
+            else:
+                periodos.append((ano, '2', date(ano, 8, 1), date(ano, 12, 15)))
+                periodo = '1'
+        return periodos
+
+    # ---------------------------------------------------------------- limpar
+
+    def limpar(self):
+        """Remove a carga gerada anteriormente com a mesma seed."""
+        removidos, _ = User.objects.filter(username__startswith=self.prefixo).delete()
+        return removidos
+
+    # ----------------------------------------------------------------- gerar
+
+    def gerar(self, usuarios, semestres, materias, horarios, tarefas,
+              acessos, eventos, eventos_agenda):
+        """Gera todos os volumes e retorna um dicionário com as contagens."""
+        resumo = {}
+        resumo['usuarios'] = self._gerar_usuarios(usuarios)
+        resumo['semestres'] = self._gerar_semestres(semestres)
+        resumo['materias'] = self._gerar_materias(materias)
+        lista_materias = list(
+            Materia.objects.filter(semestre__usuario__username__startswith=self.prefixo)
+            .values_list('id', 'semestre__usuario_id', 'semestre__data_inicio', 'semestre__data_fim')
+            .order_by('id')
+        )
+        if not lista_materias:
+            return resumo
+        resumo['horarios'] = self._gerar_horarios(lista_materias, horarios)
+        resumo['tarefas'] = self._gerar_tarefas(lista_materias, tarefas)
+        resumo['acessos'] = self._gerar_acessos(lista_materias, acessos)
+        resumo['eventos'], resumo['recorrencias'] = self._gerar_eventos(lista_materias, eventos)
+        resumo['eventos_agenda'] = self._gerar_eventos_agenda(lista_materias, eventos_agenda)
+        return resumo
+
+    def _gerar_usuarios(self, total):
+        senha = make_password('carga123')  # um único hash para todos
+        agora = timezone.now()
+
+        def objetos():
+            for i in range(total):
+                yield User(
+                    username=f'{self.prefixo}{i}',
+                    email=f'{self.prefixo}{i}@example.com',
+                    first_name=f'Aluno {i}',
+                    last_name='Carga',
+                    password=senha,
+                    date_joined=agora - timedelta(days=self.rng.randint(0, 900)),
+                )
+
+        return self._inserir(User, objetos(), total)
+
+    def _gerar_semestres(self, por_usuario):
+        periodos = self._periodos(por_usuario)
+        ids_usuarios = User.objects.filter(
+            username__startswith=self.prefixo
+        ).values_list('id', flat=True).order_by('id')
+
+        def objetos():
+            for usuario_id in ids_usuarios.iterator():
+                for ano, periodo, inicio, fim in periodos:
+                    yield Semestre(
+                        usuario_id=usuario_id, nome=f'{ano}/{periodo}', ano=ano,
+                        periodo=periodo, data_inicio=inicio, data_fim=fim,
+                    )
+
+        return self._inserir(Semestre, objetos(), ids_usuarios.count() * por_usuario)
+
+    def _gerar_materias(self, total):
+        semestres = list(
+            Semestre.objects.filter(usuario__username__startswith=self.prefixo)
+            .values_list('id', 'data_inicio').order_by('id')
+        )
+        if not semestres:
+            return 0
+
+        def objetos():
+            for i in range(total):
+                semestre_id, inicio = self.rng.choice(semestres)
+                nome = self.rng.choice(NOMES_MATERIAS)
+                yield Materia(
+                    semestre_id=semestre_id, nome=nome,
+                    descricao=f'Disciplina de {nome}.',
+                    slug=f'{slugify(nome)}-{self.prefixo.rstrip("_")}-{i}',
+                    criado_em=self._datahora(inicio, self.rng.randint(8, 22)),
+                )
+
+        with datas_manuais(_campo(Materia, 'criado_em')):
+            return self._inserir(Materia, objetos(), total)
+
+    def _gerar_horarios(self, materias, por_materia):
+        def objetos():
+            for materia_id, _, _, _ in materias:
+                dias = self.rng.sample(range(6), k=min(self.rng.randint(1, por_materia), 6))
+                for dia in dias:
+                    hora = self.rng.choice([7, 8, 10, 13, 14, 16, 19, 21])
+                    yield HorarioAula(
+                        materia_id=materia_id, dia_semana=dia,
+                        hora_inicio=time(hora, 0), hora_fim=time(min(hora + 2, 23), 0),
+                        local=f'Sala {self.rng.randint(100, 450)}',
+                    )
+
+        return self._inserir(HorarioAula, objetos(), len(materias) * por_materia)
+
+    def _gerar_tarefas(self, materias, total):
+        agora = timezone.now()
+
+        def objetos():
+            for _ in range(total):
+                materia_id, usuario_id, inicio, fim = self.rng.choice(materias)
+                criado = self._datahora(self._dia_entre(inicio, fim), self.rng.randint(7, 23))
+                prazo = None
+                if self.rng.random() < 0.85:
+                    prazo = criado + timedelta(days=self.rng.randint(1, 30), hours=self.rng.randint(0, 12))
+                # Tarefas com prazo vencido tendem a estar concluídas
+                if prazo and prazo < agora:
+                    status = 'CONCLUIDA' if self.rng.random() < 0.8 else 'PENDENTE'
+                else:
+                    status = self.rng.choices(['PENDENTE', 'EM_ANDAMENTO', 'CONCLUIDA'], [6, 3, 1])[0]
+                yield Tarefa(
+                    materia_id=materia_id, usuario_id=usuario_id,
+                    titulo=f'{self.rng.choice(TITULOS_TAREFAS)} {self.rng.randint(1, 12)}',
+                    status=status, prazo=prazo, criado_em=criado,
+                    atualizado_em=min(prazo or criado, agora) if status == 'CONCLUIDA' else criado,
+                )
+
+        with datas_manuais(_campo(Tarefa, 'criado_em'), _campo(Tarefa, 'atualizado_em')):
+            return self._inserir(Tarefa, objetos(), total)
+
+    def _gerar_acessos(self, materias, total):
+        # Popularidade de cauda longa: poucas matérias concentram os acessos
+        pesos = [self.rng.paretovariate(1.2) for _ in materias]
+        acumulado = []
+        soma = 0
+        for peso in pesos:
+            soma += peso
+            acumulado.append(soma)
+        contagem = Counter()
+        horas = list(range(24))
+
+        def objetos():
+            restante = total
+            while restante > 0:
+                n = min(self.lote, restante)
+                escolhidas = self.rng.choices(materias, cum_weights=acumulado, k=n)
+                hora_lote = self.rng.choices(horas, weights=PESOS_HORA, k=n)
+                for (materia_id, usuario_id, inicio, fim), hora in zip(escolhidas, hora_lote):
+                    contagem[materia_id] += 1
+                    yield AcessoMateria(
+                        materia_id=materia_id, usuario_id=usuario_id,
+                        data_hora=self._datahora(self._dia_entre(inicio, fim), hora, self.rng.randint(0, 59)),
+                        ip_address=f'10.0.{self.rng.randint(0, 255)}.{self.rng.randint(1, 254)}',
+                    )
+                restante -= n
+
+        with datas_manuais(_campo(AcessoMateria, 'data_hora')):
+            criados = self._inserir(AcessoMateria, objetos(), total)
+
+        # Mantém contador_acessos coerente com os acessos gerados
+        atualizar = (Materia(id=materia_id, contador_acessos=n) for materia_id, n in contagem.items())
+        for lote in em_lotes(atualizar, self.lote):
+            with transaction.atomic():
+                Materia.objects.bulk_update(lote, ['contador_acessos'], batch_size=self.lote)
+        return criados
+
+    def _gerar_eventos(self, materias, total):
+        tipos = [valor for valor, _ in EventoCalendario.TipoEvento.choices]
+        agora = timezone.now()
+
+        def objetos():
+            for _ in range(total):
+                materia_id, usuario_id, inicio, fim = self.rng.choice(materias)
+                dia = self._dia_entre(inicio, fim)
+                comeco = self._datahora(dia, self.rng.randint(7, 21))
+                yield EventoCalendario(
+                    titulo=f'Evento {self.rng.randint(1, 9999)}',
+                    data_inicio=comeco,
+                    data_fim=comeco + timedelta(minutes=self.rng.choice([50, 60, 90, 120])),
+                    tipo_evento=self.rng.choice(tipos),
+                    materia_id=materia_id if self.rng.random() < 0.7 else None,
+                    usuario_id=usuario_id,
+                    lembrete=self.rng.random() < 0.6,
+                    tempo_lembrete=self.rng.choice([15, 30, 60, 1440]),
+                    criado_em=comeco - timedelta(days=self.rng.randint(1, 30)),
+                    atualizado_em=min(comeco, agora),
+                )
+
+        campos = (_campo(EventoCalendario, 'criado_em'), _campo(EventoCalendario, 'atualizado_em'))
+        with datas_manuais(*campos):
+            criados = self._inserir(EventoCalendario, objetos(), total)
+
+        # ~10% dos eventos viram séries recorrentes (semanais, até o fim do semestre)
+        eventos = EventoCalendario.objects.filter(
+            usuario__username__startswith=self.prefixo, recorrencia__isnull=True
+        ).values_list('id', 'data_inicio').order_by('id')
+
+        def recorrencias():
+            for evento_id, data_inicio in eventos.iterator(chunk_size=self.lote):
+                if self.rng.random() >= 0.1:
+                    continue
+                tipo = self.rng.choices(['semanal', 'quinzenal', 'diaria', 'mensal'], [7, 1, 1, 1])[0]
+                dia_local = timezone.localtime(data_inicio, self.tz).date()
+                yield RecorrenciaEvento(
+                    evento_id=evento_id, tipo_recorrencia=tipo,
+                    data_fim_recorrencia=dia_local + timedelta(weeks=self.rng.randint(4, 16)),
+                    intervalo=1,
+                    dias_semana=str(dia_local.isoweekday()) if tipo == 'semanal' else '',
+                )
+
+        return criados, self._inserir(RecorrenciaEvento, recorrencias(), criados // 10)
+
+    def _gerar_eventos_agenda(self, materias, total):
+        tipos = [valor for valor, _ in EventoAgenda.TIPO_CHOICES]
+
+        def objetos():
+            for _ in range(total):
+                materia_id, usuario_id, inicio, fim = self.rng.choice(materias)
+                comeco = self._datahora(self._dia_entre(inicio, fim), self.rng.randint(7, 21))
+                yield EventoAgenda(
+                    titulo=f'{self.rng.choice(tipos).title()} {self.rng.randint(1, 99)}',
+                    escopo='MATERIA', tipo=self.rng.choice(tipos),
+                    data_inicio=comeco, data_fim=comeco + timedelta(hours=2),
+                    materia_id=materia_id, usuario_id=usuario_id,
+                )
+
+        return self._inserir(EventoAgenda, objetos(), total)
@@ -0,0 +1,10 @@
+"""
+Context processors do app core.
+"""
+
+from django.conf import settings
+
+
+def cache_fragmentos(request):
+    """Tempo dos fragmentos em cache: {% cache CACHE_FRAGMENTOS navbar ... %}."""
+    return {'CACHE_FRAGMENTOS': settings.TEMPLATE_FRAGMENT_CACHE_TIMEOUT}
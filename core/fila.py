@@ -0,0 +1,229 @@
+"""
+Fila de tarefas em segundo plano, guardada no próprio banco.
+
+Funções decoradas com @tarefa_assincrona continuam chamáveis normalmente
+e ganham `.enfileirar(...)`, que grava uma TarefaFila (na mesma transação
+de quem enfileira) para o worker executar:
+
+    @tarefa_assincrona(fila='calendario', max_tentativas=5)
+    def replanejar_estudos(usuario_id):
+        ...
+
+    replanejar_estudos.enfileirar(request.user.pk)
+
+Os argumentos precisam ser serializáveis em JSON (ids, não instâncias).
+As tarefas ficam nos módulos `<app>/tarefas_assincronas.py`, descobertos
+pelo worker (comando executar_tarefas). Com TASKS_EAGER a tarefa roda na
+hora, no próprio processo, o que dispensa o worker em desenvolvimento.
+
+Semântica: entrega "pelo menos uma vez". A reserva é um UPDATE
+condicional, então dois workers não pegam a mesma tarefa, mas se um
+worker morrer a tarefa volta à fila depois do timeout de visibilidade;
+as tarefas devem ser idempotentes.
+"""
+
+import logging
+import time
+import traceback
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from .metricas import registro, tarefa_fila_duracao, tarefas_fila_total
+from .models import TarefaFila
+
+logger = logging.getLogger(__name__)
+
+RESERVAVEIS = [TarefaFila.Status.PENDENTE, TarefaFila.Status.EXECUTANDO]
+
+tarefas_registradas = {}
+
+
+class TarefaAssincrona:
+    """Função registrada na fila; chamá-la diretamente executa na hora."""
+
+    def __init__(self, funcao, nome, fila, prioridade, max_tentativas, timeout):
+        self.funcao = funcao
+        self.nome = nome
+        self.fila = fila
+        self.prioridade = prioridade
+        self.max_tentativas = max_tentativas
+        self.timeout = timeout
+        self.__doc__ = funcao.__doc__
+        self.__name__ = funcao.__name__
+
+    def __call__(self, *args, **kwargs):
+        return self.funcao(*args, **kwargs)
+
+    def __repr__(self):
+        return f'<TarefaAssincrona {self.nome}>'
+
+    def enfileirar(self, *args, atraso=None, prioridade=None, **kwargs):
+        """Agenda a execução; `atraso` (segundos ou timedelta) adia o início."""
+        if settings.TASKS_EAGER:
+            self.funcao(*args, **kwargs)
+            return None
+        if isinstance(atraso, (int, float)):
+            atraso = timedelta(seconds=atraso)
+        return TarefaFila.objects.create(
+            nome=self.nome,
+            args=list(args),
+            kwargs=kwargs,
+            fila=self.fila,
+            prioridade=self.prioridade if prioridade is None else prioridade,
+            max_tentativas=self.max_tentativas,
+            disponivel_em=timezone.now() + (atraso or timedelta()),
+        )
+
+    def enfileirar_lote(self, argumentos, prioridade=None):
+        """Agenda uma execução por tupla de `argumentos`, com um único bulk_create."""
+        argumentos = [list(args) for args in argumentos]
+        if settings.TASKS_EAGER:
+            for args in argumentos:
+                self.funcao(*args)
+            return []
+        agora = timezone.now()
+        return TarefaFila.objects.bulk_create([
+            TarefaFila(
+                nome=self.nome,
+                args=args,
+                kwargs={},
+                fila=self.fila,
+                prioridade=self.prioridade if prioridade is None else prioridade,
+                max_tentativas=self.max_tentativas,
+                disponivel_em=agora,
+            )
+            for args in argumentos
+        ], batch_size=1000)
+
+
+def tarefa_assincrona(funcao=None, *, nome=None, fila='padrao', prioridade=0, max_tentativas=3, timeout=None):
+    """
+    Registra a função como tarefa em segundo plano.
+
+    `timeout` (segundos) substitui TASKS_VISIBILITY_TIMEOUT para tarefas
+    que costumam demorar mais que o padrão.
+    """
+    def registrar(funcao):
+        tarefa = TarefaAssincrona(
+            funcao,
+            nome or f'{funcao.__module__}.{funcao.__qualname__}',
+            fila, prioridade, max_tentativas, timeout,
+        )
+        tarefas_registradas[tarefa.nome] = tarefa
+        return tarefa
+
+    return registrar(funcao) if funcao is not None else registrar
+
+
+def descobrir_tarefas():
+    """Importa os módulos tarefas_assincronas de todos os apps."""
+    autodiscover_modules('tarefas_assincronas')
+    return tarefas_registradas
+
+
+# ------------------------------------------------------------------- worker
+
+def reservar(filas, quantidade):
+    """Reserva até `quantidade` tarefas vencidas, por prioridade e antiguidade."""
+    agora = timezone.now()
+    ids = list(
+        TarefaFila.objects.filter(fila__in=filas, status__in=RESERVAVEIS, disponivel_em__lte=agora)
+        .order_by('-prioridade', 'disponivel_em')
+        .values_list('pk', flat=True)[:quantidade]
+    )
+    if not ids:
+        return []
+
+    token = uuid.uuid4().hex
+    TarefaFila.objects.filter(pk__in=ids, status__in=RESERVAVEIS, disponivel_em__lte=agora).update(
+        status=TarefaFila.Status.EXECUTANDO,
+        reserva=token,
+        tentativas=F('tentativas') + 1,
+        disponivel_em=agora + timedelta(seconds=settings.TASKS_VISIBILITY_TIMEOUT),
+    )
+    tarefas = list(TarefaFila.objects.filter(pk__in=ids, reserva=token).order_by('-prioridade', 'pk'))
+    for tarefa in tarefas:
+        registrada = tarefas_registradas.get(tarefa.nome)
+        if registrada is not None and registrada.timeout:
+            tarefa.disponivel_em = agora + timedelta(seconds=registrada.timeout)
+            _finalizar(tarefa, disponivel_em=tarefa.disponivel_em)
+    return tarefas
+
+
+def _finalizar(tarefa, **campos):
+    # Só grava se a reserva ainda for deste worker (o timeout pode ter expirado)
+    return TarefaFila.objects.filter(pk=tarefa.pk, reserva=tarefa.reserva).update(**campos)
+
+
+def executar(tarefa):
+    """Executa uma tarefa reservada e registra sucesso, nova tentativa ou falha."""
+    registrada = tarefas_registradas.get(tarefa.nome)
+    if registrada is None:
+        _finalizar(tarefa, status=TarefaFila.Status.FALHOU, erro=f'Tarefa "{tarefa.nome}" não registrada.')
+        tarefas_fila_total.inc(tarefa=tarefa.nome, resultado='nao_registrada')
+        return
+    if tarefa.tentativas > tarefa.max_tentativas:
+        # Reservada de novo após o timeout de visibilidade mais vezes que o permitido
+        _finalizar(tarefa, status=TarefaFila.Status.FALHOU, erro=tarefa.erro or 'Timeout de visibilidade esgotado.')
+        tarefas_fila_total.inc(tarefa=tarefa.nome, resultado='falhou')
+        return
+
+    inicio = time.perf_counter()
+    try:
+        registrada.funcao(*tarefa.args, **tarefa.kwargs)
+    except Exception:
+        erro = traceback.format_exc()
+        if tarefa.tentativas < tarefa.max_tentativas:
+            espera = settings.TASKS_RETRY_BACKOFF * 2 ** (tarefa.tentativas - 1)
+            _finalizar(
+                tarefa, status=TarefaFila.Status.PENDENTE, erro=erro,
+                disponivel_em=timezone.now() + timedelta(seconds=espera),
+            )
+            resultado = 'repetir'
+        else:
+            _finalizar(tarefa, status=TarefaFila.Status.FALHOU, erro=erro)
+            resultado = 'falhou'
+        logger.warning('Tarefa %s #%s falhou (tentativa %s): %s', tarefa.nome, tarefa.pk, tarefa.tentativas, erro)
+    else:
+        _finalizar(tarefa, status=TarefaFila.Status.CONCLUIDA, concluido_em=timezone.now(), erro='')
+        resultado = 'sucesso'
+    finally:
+        tarefa_fila_duracao.observar(time.perf_counter() - inicio, tarefa=tarefa.nome)
+    tarefas_fila_total.inc(tarefa=tarefa.nome, resultado=resultado)
+
+
+def executar_em_thread(tarefa):
+    try:
+        executar(tarefa)
+    finally:
+        close_old_connections()
+
+
+def iniciar_processo():
+    """Initializer dos processos do pool (o worker os cria sem conexões abertas)."""
+    descobrir_tarefas()
+
+
+def executar_em_processo(pk, reserva):
+    tarefa = TarefaFila.objects.filter(pk=pk, reserva=reserva).first()
+    try:
+        if tarefa is not None:
+            executar(tarefa)
+    finally:
+        registro.gravar()
+        close_old_connections()
+
+
+def limpar_concluidas(dias=None):
+    """Remove tarefas concluídas há mais de `dias` (padrão: TASKS_KEEP_DAYS)."""
+    limite = timezone.now() - timedelta(days=settings.TASKS_KEEP_DAYS if dias is None else dias)
+    removidas, _ = TarefaFila.objects.filter(
+        status=TarefaFila.Status.CONCLUIDA, concluido_em__lt=limite
+    ).delete()
+    return removidas
@@ -0,0 +1,204 @@
+"""
+Management command que percorre todas as páginas e endpoints AJAX dos apps
+core, academico e calendario, mede tempo, consultas e memória e compara com
+os orçamentos gravados em core/benchmarks/orcamentos.json.
+
+Exemplos:
+    python manage.py benchmark_paginas
+    python manage.py benchmark_paginas --atualizar         # grava novo baseline
+    python manage.py benchmark_paginas --rota calendario:calendario_home
+"""
+
+import json
+import logging
+from pathlib import Path
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from academico.models import EventoAgenda, HorarioAula, MaterialDidatico, Materia, Tarefa
+from calendario.models import EventoCalendario
+from core.benchmark import banco_temporario, formatar_tabela, listar_rotas, medir_requisicao
+from core.carga import PERFIS, GeradorCarga
+
+BASELINE_PADRAO = Path(__file__).resolve().parents[2] / 'benchmarks' / 'orcamentos.json'
+
+MODULOS = ('core.urls', 'academico.urls', 'calendario.urls')
+
+PERGUNTA = {'pergunta': 'Quando é a próxima prova?'}
+
+# Rotas que precisam de método/dados específicos
+ROTAS_ESPECIAIS = {
+    'chat_home': {'metodo': 'post', 'dados': PERGUNTA},
+    'semestre_agente': {'metodo': 'post', 'dados': PERGUNTA},
+    'academico:materia_tutor': {'metodo': 'post', 'dados': PERGUNTA},
+    'academico:tarefa_toggle_status': {'metodo': 'post'},
+}
+
+# Objeto de exemplo usado para preencher o parâmetro <pk> de cada rota
+PK_POR_ROTA = {
+    'semestre_detail': 'semestre',
+    'semestre_agente': 'semestre',
+    'academico:todolist_semestre': 'semestre',
+    'academico:material_download': 'material',
+    'academico:evento_edit': 'evento_agenda',
+    'academico:tarefa_edit': 'tarefa',
+    'academico:tarefa_toggle_status': 'tarefa',
+    'academico:horario_edit': 'horario',
+    'academico:horario_delete': 'horario',
+}
+
+
+class Command(BaseCommand):
+    help = 'Benchmark de todas as páginas com orçamentos de tempo, consultas e memória'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--perfil',
+            choices=sorted(PERFIS),
+            default='pequeno',
+            help='Volume de dados gerado antes das medições (padrão: pequeno)',
+        )
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--repeticoes', type=int, default=5, help='Execuções medidas por rota')
+        parser.add_argument('--baseline', default=str(BASELINE_PADRAO), help='Arquivo JSON de orçamentos')
+        parser.add_argument(
+            '--tolerancia',
+            type=float,
+            default=0.5,
+            help='Folga relativa para tempo e memória antes de acusar regressão (padrão: 0.5 = 50%%)',
+        )
+        parser.add_argument(
+            '--folga-ms',
+            type=float,
+            default=10.0,
+            help='Folga absoluta de tempo para absorver ruído em rotas rápidas (padrão: 10ms)',
+        )
+        parser.add_argument('--atualizar', action='store_true', help='Grava as medições como novo baseline')
+        parser.add_argument('--rota', action='append', help='Mede apenas as rotas informadas')
+
+    def handle(self, *args, **options):
+        caminho = Path(options['baseline'])
+        baseline = json.loads(caminho.read_text()) if caminho.exists() else {}
+
+        # Erros 5xx entram na tabela como falha; não precisamos do traceback no console
+        logger = logging.getLogger('django.request')
+        nivel_original = logger.level
+        logger.setLevel(logging.CRITICAL)
+        try:
+            with banco_temporario():
+                self.stdout.write(f'Gerando dados ({options["perfil"]})...')
+                GeradorCarga(seed=options['seed']).gerar(**PERFIS[options['perfil']])
+                resultados = self._medir_rotas(options)
+        finally:
+            logger.setLevel(nivel_original)
+
+        linhas, regressoes = self._comparar(resultados, baseline, options['tolerancia'], options['folga_ms'])
+        self.stdout.write(formatar_tabela(
+            ['rota', 'status', 'ms', 'Δms', 'consultas', 'Δconsultas', 'KB', 'ΔKB', 'resultado'],
+            linhas
+        ))
+
+        # Um 5xx nunca vira orçamento: o baseline só registra rotas que funcionam
+        erros = sorted(nome for nome, atual in resultados.items() if atual['status'] >= 500)
+        if erros:
+            raise CommandError(f'{len(erros)} rota(s) com erro de servidor: {", ".join(erros)}')
+
+        if options['atualizar']:
+            caminho.parent.mkdir(parents=True, exist_ok=True)
+            caminho.write_text(json.dumps(resultados, indent=2, sort_keys=True, ensure_ascii=False) + '\n')
+            self.stdout.write(self.style.SUCCESS(f'Baseline gravado em {caminho}'))
+        elif regressoes:
+            raise CommandError(f'{regressoes} rota(s) acima do orçamento.')
+
+    def _objetos_exemplo(self):
+        """Escolhe um usuário com dados e objetos de exemplo pertencentes a ele."""
+        materia = (
+            Materia.objects.filter(horarios_aula__isnull=False, tarefas__isnull=False)
+            .select_related('semestre__usuario').order_by('id').first()
+        )
+        usuario = materia.semestre.usuario
+        return usuario, {
+            'materia': materia,
+            'semestre': materia.semestre,
+            'material': MaterialDidatico.objects.filter(materia=materia).first(),
+            'evento_agenda': EventoAgenda.objects.filter(usuario=usuario).first(),
+            'tarefa': Tarefa.objects.filter(usuario=usuario).first(),
+            'horario': HorarioAula.objects.filter(materia=materia).first(),
+            'evento': EventoCalendario.objects.filter(usuario=usuario).first(),
+        }
+
+    def _kwargs(self, nome, padrao, objetos):
+        kwargs = {}
+        for parametro in padrao.pattern.converters:
+            if parametro == 'slug':
+                objeto = objetos['materia']
+                kwargs['slug'] = objeto.slug
+                continue
+            chave = 'evento' if parametro == 'evento_id' else PK_POR_ROTA.get(nome)
+            objeto = objetos.get(chave)
+            if objeto is None:
+                return None
+            kwargs[parametro] = objeto.pk
+        return kwargs
+
+    def _medir_rotas(self, options):
+        usuario, objetos = self._objetos_exemplo()
+        client = Client(raise_request_exception=False)
+        client.force_login(usuario)
+        agora = timezone.now()
+
+        resultados = {}
+        for nome, padrao in listar_rotas(MODULOS):
+            if options['rota'] and nome not in options['rota']:
+                continue
+            kwargs = self._kwargs(nome, padrao, objetos)
+            if kwargs is None:
+                self.stdout.write(f'  (sem dados para {nome}, ignorada)')
+                continue
+
+            especial = ROTAS_ESPECIAIS.get(nome, {})
+            url = reverse(nome, kwargs=kwargs)
+            dados = especial.get('dados')
+            if nome in ('calendario:eventos_json', 'calendario:eventos_feed'):
+                dados = {'start': (agora.replace(day=1)).isoformat(), 'end': agora.isoformat()}
+
+            cache.clear()
+            # POSTs (toggle de tarefa, perguntas ao agente) alteram os dados:
+            # cada execução é desfeita para todas medirem o mesmo estado
+            metodo = especial.get('metodo', 'get')
+            resultados[nome] = medir_requisicao(
+                client, metodo, url, dados, options['repeticoes'], isolar=metodo != 'get'
+            )
+        return resultados
+
+    def _comparar(self, resultados, baseline, tolerancia, folga_ms):
+        linhas = []
+        regressoes = 0
+        for nome, atual in sorted(resultados.items()):
+            anterior = baseline.get(nome)
+            if atual['status'] >= 500:
+                linhas.append([nome, atual['status'], atual['ms'], '-', atual['consultas'], '-', atual['kb'], '-', 'ERRO'])
+                continue
+            if anterior is None:
+                linhas.append([nome, atual['status'], atual['ms'], '-', atual['consultas'], '-', atual['kb'], '-', 'novo'])
+                continue
+
+            acima = (
+                atual['consultas'] > anterior['consultas']
+                or atual['ms'] > anterior['ms'] * (1 + tolerancia) + folga_ms
+                or atual['kb'] > anterior['kb'] * (1 + tolerancia)
+                or atual['status'] != anterior['status']
+            )
+            regressoes += acima
+            linhas.append([
+                nome, atual['status'],
+                atual['ms'], f"{atual['ms'] - anterior['ms']:+.2f}",
+                atual['consultas'], f"{atual['consultas'] - anterior['consultas']:+d}",
+                atual['kb'], f"{atual['kb'] - anterior['kb']:+.1f}",
+                'REGRESSÃO' if acima else 'ok',
+            ])
+        return linhas, regressoes
@@ -0,0 +1,86 @@
+"""
+Management command que mede as consultas por requisição geradas pela
+sessão e pelo carregamento do usuário, para cada SESSION_ENGINE.
+"""
+
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, reset_queries
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from core.benchmark import banco_temporario, formatar_tabela
+
+User = get_user_model()
+
+MIDDLEWARE_PADRAO = 'django.contrib.auth.middleware.AuthenticationMiddleware'
+MIDDLEWARE_CACHE = 'core.middleware.CachedAuthenticationMiddleware'
+
+
+class Command(BaseCommand):
+    help = 'Compara consultas por requisição entre engines de sessão e o cache de usuário'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requisicoes',
+            type=int,
+            default=50,
+            help='Número de requisições medidas por cenário (padrão: 50)',
+        )
+        parser.add_argument(
+            '--url',
+            default='/semestres/',
+            help='URL autenticada usada nas medições (padrão: /semestres/)',
+        )
+
+    def handle(self, *args, **options):
+        with banco_temporario():
+            usuario = User.objects.create_user(
+                username='benchmark', email='benchmark@example.com',
+                password='benchmark', first_name='Bench', last_name='Mark'
+            )
+            linhas = []
+            for nome_engine, engine in settings.SESSION_ENGINES.items():
+                for nome_mw, middleware in (('padrão', MIDDLEWARE_PADRAO), ('cache', MIDDLEWARE_CACHE)):
+                    resultado = self._medir(usuario, engine, middleware, options)
+                    linhas.append([nome_engine, nome_mw, *resultado])
+
+        self.stdout.write(formatar_tabela(
+            ['sessão', 'usuário', 'sessão/req', 'usuário/req', 'total/req', 'ms/req'],
+            linhas
+        ))
+
+    def _medir(self, usuario, engine, middleware, options):
+        lista_middleware = [
+            middleware if m in (MIDDLEWARE_PADRAO, MIDDLEWARE_CACHE) else m
+            for m in settings.MIDDLEWARE
+        ]
+        n = options['requisicoes']
+
+        with override_settings(SESSION_ENGINE=engine, MIDDLEWARE=lista_middleware):
+            cache.clear()
+            client = Client()
+            client.force_login(usuario)
+            # Aquecimento: popula caches de sessão/usuário
+            client.get(options['url'])
+
+            reset_queries()
+            with CaptureQueriesContext(connection) as ctx:
+                inicio = time.perf_counter()
+                for _ in range(n):
+                    client.get(options['url'])
+                duracao = time.perf_counter() - inicio
+
+        sessao = sum(1 for q in ctx.captured_queries if 'django_session' in q['sql'])
+        usuario_q = sum(1 for q in ctx.captured_queries if 'FROM "users_customuser"' in q['sql'])
+        total = len(ctx.captured_queries)
+        return [
+            f'{sessao / n:.2f}',
+            f'{usuario_q / n:.2f}',
+            f'{total / n:.2f}',
+            f'{duracao * 1000 / n:.2f}',
+        ]
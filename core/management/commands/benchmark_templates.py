@@ -0,0 +1,120 @@
+"""
+Management command que mede o tempo de render dos cinco maiores templates
+em três cenários, com o mesmo contexto da view:
+
+    compilando   loader sem cache: lê e compila os templates a cada render
+    em cache     loader em cache (TEMPLATE_CACHE), fragmentos desligados
+    fragmentos   loader em cache + fragmentos {% cache %} já aquecidos
+
+O contexto vem de uma requisição real a cada página (cliente de teste,
+banco temporário com dados de core.carga); só o render é cronometrado.
+
+Exemplos:
+    python manage.py benchmark_templates
+    python manage.py benchmark_templates --perfil medio --repeticoes 50
+"""
+
+import statistics
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.template import Engine, engines
+from django.template.context import make_context
+from django.test import Client
+from django.urls import reverse
+
+from calendario.models import EventoCalendario
+from core.benchmark import banco_temporario, formatar_tabela
+from core.carga import PERFIS, GeradorCarga
+
+# Os cinco maiores templates (em linhas, antes da extração do CSS/JS
+# inline) e a rota que os renderiza; None = rota sem parâmetros
+TEMPLATES = {
+    'calendario/calendario_home.html': ('calendario:calendario_home', None),
+    'calendario/evento_detalhe.html': ('calendario:evento_detalhe', 'evento_id'),
+    'academico/todolist_geral.html': ('academico:todolist_geral', None),
+    'calendario/evento_form.html': ('calendario:evento_criar', None),
+    'academico/materia_form_completo.html': ('academico:materia_create', None),
+}
+
+
+def _motor(em_cache):
+    """Engine com a configuração do projeto e o loader pedido."""
+    base = engines['django'].engine
+    loaders = settings.TEMPLATE_LOADERS
+    return Engine(
+        dirs=base.dirs,
+        context_processors=base.context_processors,
+        loaders=[('django.template.loaders.cached.Loader', loaders)] if em_cache else loaders,
+        libraries=base.libraries,
+        string_if_invalid=base.string_if_invalid,
+    )
+
+
+class Command(BaseCommand):
+    help = 'Tempo de render dos maiores templates: sem cache, loader em cache e fragmentos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--perfil',
+            choices=sorted(PERFIS),
+            default='pequeno',
+            help='Volume de dados gerado antes das medições (padrão: pequeno)',
+        )
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--repeticoes', type=int, default=20, help='Renders medidos por cenário')
+
+    def handle(self, *args, **options):
+        with banco_temporario():
+            self.stdout.write(f'Gerando dados ({options["perfil"]})...')
+            GeradorCarga(seed=options['seed']).gerar(**PERFIS[options['perfil']])
+            linhas = self._medir(options['repeticoes'])
+
+        self.stdout.write(formatar_tabela(
+            ['template', 'KB', 'compilando ms', 'em cache ms', 'fragmentos ms', 'ganho'],
+            linhas
+        ))
+
+    def _contextos(self):
+        """(template, contexto, request) de cada página, a partir de uma requisição real."""
+        evento = EventoCalendario.objects.select_related('usuario').order_by('id').first()
+        client = Client()
+        client.force_login(evento.usuario)
+        for nome, (rota, parametro) in TEMPLATES.items():
+            url = reverse(rota, kwargs={parametro: evento.pk} if parametro else None)
+            resposta = client.get(url)
+            # Com vários templates (extends/include) o primeiro é o da página
+            contextos = resposta.context if isinstance(resposta.context, list) else [resposta.context]
+            yield nome, contextos[0].flatten(), resposta.wsgi_request
+
+    def _cronometrar(self, render, repeticoes, antes=None):
+        tempos = []
+        for _ in range(repeticoes):
+            if antes:
+                antes()
+            inicio = time.perf_counter()
+            render()
+            tempos.append((time.perf_counter() - inicio) * 1000)
+        return round(statistics.median(tempos), 2)
+
+    def _medir(self, repeticoes):
+        compilando, em_cache = _motor(False), _motor(True)
+        linhas = []
+        for nome, contexto, request in self._contextos():
+            def render(motor):
+                return lambda: motor.get_template(nome).render(make_context(dict(contexto), request))
+
+            html = render(em_cache)()
+            ms_compilando = self._cronometrar(render(compilando), repeticoes, antes=cache.clear)
+            ms_em_cache = self._cronometrar(render(em_cache), repeticoes, antes=cache.clear)
+            render(em_cache)()  # aquece os fragmentos
+            ms_fragmentos = self._cronometrar(render(em_cache), repeticoes)
+
+            linhas.append([
+                nome, round(len(html.encode()) / 1024, 1),
+                ms_compilando, ms_em_cache, ms_fragmentos,
+                f'{ms_compilando / ms_fragmentos:.1f}x' if ms_fragmentos else '-',
+            ])
+        return linhas
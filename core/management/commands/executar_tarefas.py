@@ -0,0 +1,98 @@
+"""
+Worker da fila de tarefas em segundo plano (core.fila).
+
+Reserva tarefas vencidas das filas indicadas, por prioridade, e as
+executa num pool de threads (padrão; bom para E/S como e-mail e APIs)
+ou de processos (para trabalho pesado de CPU). Sem tarefas, espera
+TASKS_POLL_INTERVAL segundos; cada verificação é uma consulta pelo
+índice parcial das tarefas reserváveis.
+
+Exemplos:
+    python manage.py executar_tarefas
+    python manage.py executar_tarefas --filas padrao,calendario --concorrencia 4
+    python manage.py executar_tarefas --modo processo
+    python manage.py executar_tarefas --filas imagens --modo processo   # avatares
+    python manage.py executar_tarefas --uma-vez   # esvazia a fila e sai
+"""
+
+import signal
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from core import fila
+from core.metricas import registro
+
+INTERVALO_LIMPEZA = 3600
+
+
+class Command(BaseCommand):
+    help = 'Executa as tarefas em segundo plano da fila no banco'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filas', default='padrao,calendario,imagens', help='Filas atendidas, separadas por vírgula')
+        parser.add_argument('--concorrencia', type=int, help='Tarefas simultâneas (padrão: TASKS_CONCURRENCY)')
+        parser.add_argument('--modo', choices=['thread', 'processo'], default='thread')
+        parser.add_argument('--uma-vez', action='store_true', help='Sai quando não houver tarefas vencidas')
+
+    def handle(self, *args, **options):
+        filas = [nome.strip() for nome in options['filas'].split(',') if nome.strip()]
+        concorrencia = options['concorrencia'] or settings.TASKS_CONCURRENCY
+        registradas = fila.descobrir_tarefas()
+        self.stdout.write(
+            f'Worker ({options["modo"]} x{concorrencia}) nas filas {", ".join(filas)}; '
+            f'{len(registradas)} tarefa(s) registrada(s).'
+        )
+
+        parar = threading.Event()
+        for sinal in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sinal, lambda *_: parar.set())
+
+        if options['modo'] == 'processo':
+            # Os processos nascem agora, antes de qualquer conexão aberta:
+            # conexões SQLite não podem atravessar o fork
+            connections.close_all()
+            executor = ProcessPoolExecutor(concorrencia, initializer=fila.iniciar_processo)
+            executor.submit(int).result()
+        else:
+            executor = ThreadPoolExecutor(concorrencia, thread_name_prefix='tarefa')
+
+        em_andamento = set()
+        proxima_limpeza = 0.0
+        try:
+            while not parar.is_set():
+                close_old_connections()
+                if time.monotonic() >= proxima_limpeza:
+                    fila.limpar_concluidas()
+                    proxima_limpeza = time.monotonic() + INTERVALO_LIMPEZA
+
+                reservadas = []
+                if len(em_andamento) < concorrencia:
+                    reservadas = fila.reservar(filas, concorrencia - len(em_andamento))
+                    for tarefa in reservadas:
+                        if options['modo'] == 'processo':
+                            futuro = executor.submit(fila.executar_em_processo, tarefa.pk, tarefa.reserva)
+                        else:
+                            futuro = executor.submit(fila.executar_em_thread, tarefa)
+                        em_andamento.add(futuro)
+                        if options['verbosity'] > 1:
+                            self.stdout.write(f'-> {tarefa}')
+
+                if em_andamento:
+                    concluidos, em_andamento = wait(
+                        em_andamento, timeout=settings.TASKS_POLL_INTERVAL, return_when=FIRST_COMPLETED
+                    )
+                    for futuro in concluidos:
+                        if futuro.exception() is not None:
+                            self.stderr.write(f'Erro no worker: {futuro.exception()}')
+                elif not reservadas:
+                    if options['uma_vez']:
+                        break
+                    parar.wait(settings.TASKS_POLL_INTERVAL)
+                registro.gravar()
+        finally:
+            executor.shutdown(wait=True)
@@ -0,0 +1,62 @@
+"""
+Management command para gerar dados sintéticos em volume (testes de carga).
+
+Exemplos:
+    python manage.py gerar_carga --perfil pequeno
+    python manage.py gerar_carga --perfil producao --seed 7 --lote 10000
+    python manage.py gerar_carga --perfil medio --tarefas 1000000 --limpar
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.carga import PERFIS, GeradorCarga
+
+
+class Command(BaseCommand):
+    help = 'Gera dados sintéticos em volume com bulk_create (determinístico via --seed)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--perfil',
+            choices=sorted(PERFIS),
+            default='pequeno',
+            help='Perfil de volumes base (padrão: pequeno)',
+        )
+        for chave in PERFIS['pequeno']:
+            parser.add_argument(
+                f'--{chave.replace("_", "-")}',
+                type=int,
+                dest=chave,
+                help=f'Sobrescreve o volume de {chave} do perfil',
+            )
+        parser.add_argument('--seed', type=int, default=42, help='Seed do gerador (padrão: 42)')
+        parser.add_argument('--lote', type=int, default=5000, help='Tamanho do lote de inserção (padrão: 5000)')
+        parser.add_argument(
+            '--limpar',
+            action='store_true',
+            help='Remove a carga gerada anteriormente com a mesma seed',
+        )
+
+    def handle(self, *args, **options):
+        volumes = dict(PERFIS[options['perfil']])
+        for chave in volumes:
+            if options.get(chave) is not None:
+                volumes[chave] = options[chave]
+
+        gerador = GeradorCarga(seed=options['seed'], lote=options['lote'], saida=self.stdout)
+
+        if options['limpar']:
+            self.stdout.write('Removendo carga anterior...')
+            self.stdout.write(f'✓ {gerador.limpar()} registros removidos')
+
+        self.stdout.write(f'Gerando carga "{options["perfil"]}" (seed={options["seed"]})...')
+        inicio = time.perf_counter()
+        resumo = gerador.gerar(**volumes)
+
+        for chave, total in resumo.items():
+            self.stdout.write(f'✓ {total} {chave}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Carga gerada em {time.perf_counter() - inicio:.1f}s'
+        ))
@@ -0,0 +1,69 @@
+"""
+Management command de manutenção do banco SQLite.
+
+Exemplos:
+    python manage.py sqlite_manutencao                 # só relatório
+    python manage.py sqlite_manutencao --optimize      # PRAGMA optimize
+    python manage.py sqlite_manutencao --vacuum        # VACUUM + checkpoint
+    python manage.py sqlite_manutencao --optimize --intervalo 60
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from core.sqlite import ler_pragmas
+
+
+class Command(BaseCommand):
+    help = 'Mostra os pragmas ativos do SQLite e executa PRAGMA optimize/VACUUM'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--optimize',
+            action='store_true',
+            help='Executa PRAGMA optimize (atualiza estatísticas do planejador)',
+        )
+        parser.add_argument(
+            '--vacuum',
+            action='store_true',
+            help='Executa VACUUM e um checkpoint do WAL (bloqueia escritas enquanto roda)',
+        )
+        parser.add_argument(
+            '--intervalo',
+            type=int,
+            default=0,
+            help='Repete a manutenção a cada N minutos (0 = executa uma vez)',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('O banco configurado não é SQLite.')
+
+        while True:
+            self._executar(options)
+            if not options['intervalo']:
+                break
+            time.sleep(options['intervalo'] * 60)
+
+    def _executar(self, options):
+        self.stdout.write('Pragmas ativos:')
+        for nome, valor in ler_pragmas(connection).items():
+            self.stdout.write(f'  {nome:<20} {valor}')
+
+        with connection.cursor() as cursor:
+            if options['optimize']:
+                inicio = time.perf_counter()
+                cursor.execute('PRAGMA optimize')
+                self.stdout.write(
+                    self.style.SUCCESS(f'✓ PRAGMA optimize ({time.perf_counter() - inicio:.2f}s)')
+                )
+
+            if options['vacuum']:
+                inicio = time.perf_counter()
+                cursor.execute('VACUUM')
+                cursor.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+                self.stdout.write(
+                    self.style.SUCCESS(f'✓ VACUUM ({time.perf_counter() - inicio:.2f}s)')
+                )
@@ -0,0 +1,323 @@
+"""
+Registro de métricas (contadores e histogramas) com exposição no formato
+texto do Prometheus.
+
+Cada processo acumula as métricas em memória. Com METRICS_DIR definido,
+o estado de cada processo é gravado periodicamente em
+METRICS_DIR/metricas-<pid>-<token>.json e o endpoint /metrics/ soma os
+arquivos de todos os workers, sem depender de nenhum serviço externo.
+
+O token é novo a cada processo, então um worker que reaproveita o PID de
+outro já encerrado não sobrescreve o arquivo dele (os contadores
+voltariam para trás). Na agregação, os arquivos de processos encerrados
+são somados em metricas-encerrados.json e removidos, sob uma trava de
+arquivo: o diretório não cresce a cada reinício e os totais continuam
+monotônicos. PIDs só valem na mesma máquina, então METRICS_DIR não deve
+ser compartilhado entre hosts.
+"""
+
+import atexit
+import json
+import math
+import os
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem trava, os arquivos encerrados ficam
+    fcntl = None
+
+from django.conf import settings
+
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_CONSULTAS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+ARQUIVO_ENCERRADOS = 'metricas-encerrados.json'
+# metricas-<pid>-<token>.json (ou metricas-<pid>.json, formato anterior)
+ARQUIVO_PROCESSO = re.compile(r'metricas-(\d+)(?:-[0-9a-f]+)?\.json')
+
+
+def _chave(rotulos, valores):
+    return json.dumps([str(valores.get(nome, '')) for nome in rotulos])
+
+
+def _escapar(valor):
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _formatar_rotulos(nomes, valores, extra=None):
+    pares = [f'{nome}="{_escapar(valor)}"' for nome, valor in zip(nomes, valores)]
+    if extra:
+        pares.append(extra)
+    return '{' + ','.join(pares) + '}' if pares else ''
+
+
+def _formatar_numero(valor):
+    if valor == math.inf:
+        return '+Inf'
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+class Metrica:
+    """Base para contadores e histogramas com rótulos."""
+
+    tipo = ''
+
+    def __init__(self, nome, ajuda, rotulos=()):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self._valores = {}
+        self._lock = threading.Lock()
+
+    def exportar(self):
+        with self._lock:
+            return json.loads(json.dumps(self._valores))
+
+
+class Contador(Metrica):
+    """Valor monotônico crescente."""
+
+    tipo = 'counter'
+
+    def inc(self, valor=1, **rotulos):
+        chave = _chave(self.rotulos, rotulos)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0) + valor
+
+    @staticmethod
+    def somar(a, b):
+        return a + b
+
+    def linhas(self, valores):
+        for chave, valor in sorted(valores.items()):
+            yield f'{self.nome}{_formatar_rotulos(self.rotulos, json.loads(chave))} {_formatar_numero(valor)}'
+
+
+class Histograma(Metrica):
+    """Distribuição de observações em buckets cumulativos."""
+
+    tipo = 'histogram'
+
+    def __init__(self, nome, ajuda, rotulos=(), buckets=BUCKETS_LATENCIA):
+        super().__init__(nome, ajuda, rotulos)
+        self.buckets = tuple(buckets)
+
+    def observar(self, valor, **rotulos):
+        chave = _chave(self.rotulos, rotulos)
+        with self._lock:
+            dados = self._valores.get(chave)
+            if dados is None:
+                dados = self._valores[chave] = {'buckets': [0] * len(self.buckets), 'soma': 0.0, 'total': 0}
+            for i, limite in enumerate(self.buckets):
+                if valor <= limite:
+                    dados['buckets'][i] += 1
+                    break
+            dados['soma'] += valor
+            dados['total'] += 1
+
+    @staticmethod
+    def somar(a, b):
+        return {
+            'buckets': [x + y for x, y in zip(a['buckets'], b['buckets'])],
+            'soma': a['soma'] + b['soma'],
+            'total': a['total'] + b['total'],
+        }
+
+    def linhas(self, valores):
+        for chave, dados in sorted(valores.items()):
+            rotulos = json.loads(chave)
+            acumulado = 0
+            for limite, quantidade in zip(self.buckets, dados['buckets']):
+                acumulado += quantidade
+                le = f'le="{_formatar_numero(limite)}"'
+                yield f'{self.nome}_bucket{_formatar_rotulos(self.rotulos, rotulos, le)} {acumulado}'
+            infinito = 'le="+Inf"'
+            yield f'{self.nome}_bucket{_formatar_rotulos(self.rotulos, rotulos, infinito)} {dados["total"]}'
+            yield f'{self.nome}_sum{_formatar_rotulos(self.rotulos, rotulos)} {_formatar_numero(dados["soma"])}'
+            yield f'{self.nome}_count{_formatar_rotulos(self.rotulos, rotulos)} {dados["total"]}'
+
+
+class RegistroMetricas:
+    """Conjunto de métricas do processo, com agregação entre processos via arquivos."""
+
+    def __init__(self):
+        self.metricas = {}
+        self._ultima_gravacao = 0.0
+        self._pid = self._arquivo = None
+
+    def contador(self, nome, ajuda, rotulos=()):
+        return self.metricas.setdefault(nome, Contador(nome, ajuda, rotulos))
+
+    def histograma(self, nome, ajuda, rotulos=(), buckets=BUCKETS_LATENCIA):
+        return self.metricas.setdefault(nome, Histograma(nome, ajuda, rotulos, buckets))
+
+    # ------------------------------------------------------- multiprocesso
+
+    @property
+    def diretorio(self):
+        caminho = getattr(settings, 'METRICS_DIR', '')
+        return Path(caminho) if caminho else None
+
+    def exportar(self):
+        return {nome: metrica.exportar() for nome, metrica in self.metricas.items()}
+
+    def arquivo_processo(self):
+        """Nome do arquivo deste processo (refeito após um fork)."""
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._arquivo = f'metricas-{self._pid}-{uuid.uuid4().hex[:12]}.json'
+        return self._arquivo
+
+    def _somar_estado(self, total, estado):
+        for nome, valores in estado.items():
+            metrica = self.metricas.get(nome)
+            if metrica is None:
+                continue
+            destino = total.setdefault(nome, {})
+            for chave, valor in valores.items():
+                destino[chave] = metrica.somar(destino[chave], valor) if chave in destino else valor
+        return total
+
+    @staticmethod
+    def _ler(arquivo):
+        try:
+            return json.loads(arquivo.read_text())
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _processo_ativo(pid):
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True  # existe, mas é de outro usuário
+        return True
+
+    @contextmanager
+    def _trava(self, diretorio):
+        if fcntl is None:
+            yield
+            return
+        with open(diretorio / '.trava', 'w') as trava:
+            fcntl.flock(trava, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(trava, fcntl.LOCK_UN)
+
+    def _consolidar_encerrados(self, diretorio):
+        """
+        Soma em ARQUIVO_ENCERRADOS os arquivos de processos que já
+        terminaram e os remove (com a trava do diretório já obtida).
+        Retorna quantos arquivos foram consolidados.
+        """
+        if fcntl is None:
+            return 0
+        encerrados = []
+        for arquivo in diretorio.glob('metricas-*.json'):
+            casamento = ARQUIVO_PROCESSO.fullmatch(arquivo.name)
+            if casamento and arquivo.name != self.arquivo_processo() and not self._processo_ativo(int(casamento[1])):
+                encerrados.append(arquivo)
+        if not encerrados:
+            return 0
+        destino = diretorio / ARQUIVO_ENCERRADOS
+        total = self._ler(destino) or {}
+        for arquivo in encerrados:
+            self._somar_estado(total, self._ler(arquivo) or {})
+        temporario = destino.with_suffix('.tmp')
+        temporario.write_text(json.dumps(total))
+        os.replace(temporario, destino)
+        for arquivo in encerrados:
+            arquivo.unlink(missing_ok=True)
+        return len(encerrados)
+
+    def gravar(self, forcar=False):
+        """Grava o estado deste processo em METRICS_DIR (no máximo a cada METRICS_FLUSH_INTERVAL)."""
+        diretorio = self.diretorio
+        if diretorio is None:
+            return
+        agora = time.monotonic()
+        if not forcar and agora - self._ultima_gravacao < settings.METRICS_FLUSH_INTERVAL:
+            return
+        self._ultima_gravacao = agora
+        diretorio.mkdir(parents=True, exist_ok=True)
+        destino = diretorio / self.arquivo_processo()
+        temporario = destino.with_suffix('.tmp')
+        temporario.write_text(json.dumps(self.exportar()))
+        os.replace(temporario, destino)
+
+    def agregar(self):
+        """Soma o estado de todos os processos (ou só deste, sem METRICS_DIR)."""
+        diretorio = self.diretorio
+        if diretorio is None:
+            return self.exportar()
+
+        self.gravar(forcar=True)
+        total = {}
+        # Sob a trava, nenhuma leitura vê um arquivo já somado aos encerrados
+        with self._trava(diretorio):
+            self._consolidar_encerrados(diretorio)
+            for arquivo in diretorio.glob('metricas-*.json'):
+                estado = self._ler(arquivo)
+                if estado is not None:
+                    self._somar_estado(total, estado)
+        return total
+
+    def expor_texto(self):
+        """Formato de exposição texto do Prometheus (versão 0.0.4)."""
+        estado = self.agregar()
+        linhas = []
+        for nome, metrica in sorted(self.metricas.items()):
+            linhas.append(f'# HELP {nome} {metrica.ajuda}')
+            linhas.append(f'# TYPE {nome} {metrica.tipo}')
+            linhas.extend(metrica.linhas(estado.get(nome, {})))
+        return '\n'.join(linhas) + '\n'
+
+
+registro = RegistroMetricas()
+atexit.register(lambda: registro.gravar(forcar=True))
+
+# ----------------------------------------------------------- métricas do app
+
+requisicoes_total = registro.contador(
+    'http_requisicoes_total', 'Requisições HTTP por view, método e status.',
+    ('view', 'metodo', 'status'),
+)
+requisicao_duracao = registro.histograma(
+    'http_requisicao_duracao_segundos', 'Latência das requisições HTTP por view.', ('view',),
+)
+requisicao_consultas = registro.histograma(
+    'http_requisicao_consultas', 'Consultas ao banco por requisição.', ('view',), BUCKETS_CONSULTAS,
+)
+agente_chamadas_total = registro.contador(
+    'agente_chamadas_total', 'Chamadas aos agentes por tipo e resultado.', ('tipo_agente', 'resultado'),
+)
+agente_duracao = registro.histograma(
+    'agente_duracao_segundos', 'Latência das chamadas aos agentes.', ('tipo_agente',),
+)
+material_upload_bytes = registro.contador(
+    'material_upload_bytes_total', 'Bytes recebidos em uploads de materiais.',
+)
+material_download_bytes = registro.contador(
+    'material_download_bytes_total', 'Bytes enviados em downloads de materiais.',
+)
+cache_requisicoes_total = registro.contador(
+    'cache_requisicoes_total', 'Consultas às camadas de cache por resultado (hit/miss).', ('cache', 'resultado'),
+)
+lembretes_total = registro.contador(
+    'lembretes_total', 'Lembretes de eventos processados pelo worker por resultado.', ('resultado',),
+)
+tarefas_fila_total = registro.contador(
+    'tarefas_fila_total', 'Execuções de tarefas em segundo plano por resultado.', ('tarefa', 'resultado'),
+)
+tarefa_fila_duracao = registro.histograma(
+    'tarefa_fila_duracao_segundos', 'Duração das tarefas em segundo plano.', ('tarefa',),
+)
@@ -2,47 +2,71 @@
 Middleware customizado para controle de autenticação.
 """
 
+import random
+import re
+import time
+
 from django.shortcuts import redirect
 from django.urls import reverse
 from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.utils.functional import SimpleLazyObject
+
+from . import metricas, perfilamento
+from .autenticacao import get_usuario_cache
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """
+    AuthenticationMiddleware que carrega request.user a partir do cache,
+    evitando o SELECT do usuário em toda requisição autenticada.
+    """
+    
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_usuario_cache(request))
 
 
 class AuthRequiredMiddleware:
     """
     Middleware que redireciona usuários não logados para a página de apresentação
     quando tentam acessar áreas que requerem autenticação.
+    
+    As rotas públicas vêm de settings.AUTH_PUBLIC_URLS (nomes de URL ou
+    caminhos exatos) e settings.AUTH_PUBLIC_PREFIXES. Elas são verificadas
+    antes de request.user, então arquivos estáticos, media e o health check
+    não carregam sessão nem usuário do banco.
     """
     
     def __init__(self, get_response):
         self.get_response = get_response
-        # URLs que não requerem login (públicas)
-        self.public_urls = [
-            reverse('home'),
-            reverse('login'), 
-            reverse('registro'),
-            '/admin/',  # Django admin tem seu próprio controle
-        ]
-        # Prefixes de URLs públicas
-        self.public_prefixes = [
-            '/static/',
-            '/media/',
-            '/admin/',
-        ]
+        # URLs que não requerem login (públicas) - conjunto para busca O(1)
+        self.public_urls = frozenset(
+            url if url.startswith('/') else reverse(url)
+            for url in settings.AUTH_PUBLIC_URLS
+        )
+        # Prefixos de URLs públicas compilados em uma única regex
+        prefixes = sorted(settings.AUTH_PUBLIC_PREFIXES, key=len, reverse=True)
+        self.public_prefix_re = re.compile(
+            '|'.join(re.escape(prefix) for prefix in prefixes)
+        ) if prefixes else None
+
+    def is_public(self, path):
+        """Verifica se o caminho é público sem consultar o usuário."""
+        if path in self.public_urls:
+            return True
+        return bool(self.public_prefix_re and self.public_prefix_re.match(path))
 
     def __call__(self, request):
-        # Verificar se a URL atual é pública
-        current_url = request.path_info
+        # Se a URL é pública, deixar passar sem resolver o usuário
+        if self.is_public(request.path_info):
+            return self.get_response(request)
         
         # Se usuário está logado, deixar passar
         if request.user.is_authenticated:
-            response = self.get_response(request)
-            return response
-            
-        # Se a URL é pública, deixar passar
-        if (current_url in self.public_urls or 
-            any(current_url.startswith(prefix) for prefix in self.public_prefixes)):
-            response = self.get_response(request)
-            return response
+            return self.get_response(request)
             
         # Se chegou até aqui, usuário não logado tentando acessar área restrita
         # Redirecionar para home (que mostra a página de apresentação)
@@ -53,3 +77,89 @@ class AuthRequiredMiddleware:
         Processa views antes da execução para adicionar informações de contexto.
         """
         return None
+
+
+class PerfilamentoMiddleware:
+    """
+    Middleware opcional de perfilamento (PROFILING_ENABLED).
+    
+    Para uma fração PROFILING_SAMPLE_RATE das requisições mede tempo total,
+    tempo e número de consultas, consultas repetidas e tempo de templates,
+    devolve os valores no cabeçalho Server-Timing e os agrega em
+    core.perfilamento.armazenamento.
+    """
+    
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.taxa = settings.PROFILING_SAMPLE_RATE
+        self.limiar_repeticao = settings.PROFILING_N1_THRESHOLD
+        perfilamento.instrumentar_templates()
+
+    def __call__(self, request):
+        if random.random() >= self.taxa:
+            return self.get_response(request)
+        
+        coleta = perfilamento.ColetaRequisicao()
+        perfilamento.definir_coleta(coleta)
+        try:
+            with connection.execute_wrapper(coleta):
+                response = self.get_response(request)
+        finally:
+            perfilamento.definir_coleta(None)
+        
+        match = getattr(request, 'resolver_match', None)
+        # Rótulo fixo para 404s: o caminho cru criaria uma entrada por URL
+        endpoint = (match.view_name if match else None) or 'nao_resolvida'
+        perfilamento.armazenamento.registrar(
+            endpoint, request.method, response.status_code, coleta, self.limiar_repeticao
+        )
+        
+        response['Server-Timing'] = ', '.join([
+            f'total;dur={coleta.total_ms:.1f}',
+            f'db;dur={coleta.db_ms:.1f};desc="{coleta.num_consultas} consultas"',
+            f'tpl;dur={coleta.template_ms:.1f}',
+        ])
+        return response
+
+
+class ContadorConsultas:
+    """Wrapper de connection.execute_wrapper que apenas conta consultas."""
+    
+    def __init__(self):
+        self.total = 0
+    
+    def __call__(self, execute, sql, params, many, context):
+        self.total += 1
+        return execute(sql, params, many, context)
+
+
+class MetricasMiddleware:
+    """
+    Middleware de métricas (METRICS_ENABLED).
+    
+    Registra, para toda requisição, contagem por view/método/status,
+    latência e número de consultas em core.metricas. O rótulo é o nome da
+    URL (não o caminho), mantendo a cardinalidade das séries limitada.
+    """
+    
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICS_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+    
+    def __call__(self, request):
+        contador = ContadorConsultas()
+        inicio = time.perf_counter()
+        with connection.execute_wrapper(contador):
+            response = self.get_response(request)
+        duracao = time.perf_counter() - inicio
+        
+        match = getattr(request, 'resolver_match', None)
+        view = (match.view_name if match else None) or 'nao_resolvida'
+        metricas.requisicoes_total.inc(view=view, metodo=request.method, status=response.status_code)
+        metricas.requisicao_duracao.observar(duracao, view=view)
+        metricas.requisicao_consultas.observar(contador.total, view=view)
+        metricas.registro.gravar()
+        return response
@@ -0,0 +1,40 @@
+# Generated by Django 5.0.14 on 2026-10-19 03:25
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TarefaFila',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nome', models.CharField(max_length=200, verbose_name='Tarefa')),
+                ('args', models.JSONField(blank=True, default=list, verbose_name='Argumentos')),
+                ('kwargs', models.JSONField(blank=True, default=dict, verbose_name='Argumentos nomeados')),
+                ('fila', models.CharField(default='padrao', max_length=50, verbose_name='Fila')),
+                ('prioridade', models.SmallIntegerField(default=0, help_text='Maior executa primeiro', verbose_name='Prioridade')),
+                ('status', models.CharField(choices=[('pendente', 'Pendente'), ('executando', 'Executando'), ('concluida', 'Concluída'), ('falhou', 'Falhou')], default='pendente', max_length=12, verbose_name='Status')),
+                ('tentativas', models.PositiveSmallIntegerField(default=0, verbose_name='Tentativas')),
+                ('max_tentativas', models.PositiveSmallIntegerField(default=3, verbose_name='Máximo de tentativas')),
+                ('disponivel_em', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Disponível em')),
+                ('reserva', models.CharField(blank=True, max_length=32, verbose_name='Reserva')),
+                ('erro', models.TextField(blank=True, verbose_name='Último erro')),
+                ('criado_em', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('concluido_em', models.DateTimeField(blank=True, null=True, verbose_name='Concluído em')),
+            ],
+            options={
+                'verbose_name': 'Tarefa em Segundo Plano',
+                'verbose_name_plural': 'Tarefas em Segundo Plano',
+                'ordering': ['-criado_em'],
+                'indexes': [models.Index(condition=models.Q(('status__in', ['pendente', 'executando'])), fields=['fila', '-prioridade', 'disponivel_em'], name='tarefafila_reservavel_idx')],
+            },
+        ),
+    ]
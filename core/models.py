@@ -1,3 +1,48 @@
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class TarefaFila(models.Model):
+    """
+    Tarefa em segundo plano da fila em banco (core.fila).
+
+    `disponivel_em` ordena a fila e faz três papéis: atraso inicial,
+    espera entre tentativas e timeout de visibilidade. Uma tarefa
+    reservada por um worker fica invisível até esse instante; se o worker
+    morrer no meio da execução, ela volta a ser reservável sozinha.
+    """
+    
+    class Status(models.TextChoices):
+        PENDENTE = 'pendente', 'Pendente'
+        EXECUTANDO = 'executando', 'Executando'
+        CONCLUIDA = 'concluida', 'Concluída'
+        FALHOU = 'falhou', 'Falhou'
+    
+    nome = models.CharField('Tarefa', max_length=200)
+    args = models.JSONField('Argumentos', default=list, blank=True)
+    kwargs = models.JSONField('Argumentos nomeados', default=dict, blank=True)
+    fila = models.CharField('Fila', max_length=50, default='padrao')
+    prioridade = models.SmallIntegerField('Prioridade', default=0, help_text='Maior executa primeiro')
+    status = models.CharField('Status', max_length=12, choices=Status.choices, default=Status.PENDENTE)
+    tentativas = models.PositiveSmallIntegerField('Tentativas', default=0)
+    max_tentativas = models.PositiveSmallIntegerField('Máximo de tentativas', default=3)
+    disponivel_em = models.DateTimeField('Disponível em', default=timezone.now)
+    reserva = models.CharField('Reserva', max_length=32, blank=True)
+    erro = models.TextField('Último erro', blank=True)
+    criado_em = models.DateTimeField('Criado em', auto_now_add=True)
+    concluido_em = models.DateTimeField('Concluído em', null=True, blank=True)
+    
+    class Meta:
+        verbose_name = 'Tarefa em Segundo Plano'
+        verbose_name_plural = 'Tarefas em Segundo Plano'
+        ordering = ['-criado_em']
+        indexes = [
+            models.Index(
+                fields=['fila', '-prioridade', 'disponivel_em'],
+                condition=models.Q(status__in=['pendente', 'executando']),
+                name='tarefafila_reservavel_idx'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.nome} #{self.pk} ({self.get_status_display()})"
@@ -0,0 +1,287 @@
+"""
+Paginação por chave (keyset/cursor) para listas grandes.
+
+Em vez de COUNT(*) + OFFSET, cada página filtra pelos valores da
+ordenação da última linha vista ("depois de prazo=X, criado_em=Y, id=Z")
+e lê por_pagina + 1 linhas pelo índice, então a página 1000 custa o
+mesmo que a primeira. O cursor é opaco (JSON em base64) e carrega esses
+valores e o sentido (próxima ou anterior):
+
+    paginador = PaginadorCursor(tarefas, 20, ordenacao=['prazo', '-criado_em'])
+    page_obj = paginador.pagina(request.GET.get('cursor'))
+
+Campos que aceitam nulo ficam sempre no fim da ordenação (NULLS LAST),
+qualquer que seja o banco. A chave primária entra como desempate, para
+a ordem ser total. O total é opcional e aproximado: conta no máximo
+`limite` linhas (`{{ page_obj.total }}{% if not page_obj.total_exato %}+`).
+"""
+
+import base64
+import binascii
+import datetime
+import decimal
+import json
+import uuid
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+
+LIMITE_TOTAL = 1000
+
+
+def _campo_modelo(modelo, caminho):
+    campo = None
+    for parte in caminho.split('__'):
+        campo = modelo._meta.get_field(parte)
+        modelo = campo.related_model or modelo
+    return campo
+
+
+def _serializar(valor):
+    # isoformat completo: o DjangoJSONEncoder corta os microssegundos e o
+    # cursor deixaria de bater com o valor gravado
+    if isinstance(valor, (datetime.datetime, datetime.date, datetime.time)):
+        return valor.isoformat()
+    if isinstance(valor, (decimal.Decimal, uuid.UUID)):
+        return str(valor)
+    raise TypeError(f'Valor não serializável no cursor: {valor!r}')
+
+
+def _valor(objeto, caminho):
+    for parte in caminho.split('__'):
+        if objeto is None:
+            return None
+        objeto = getattr(objeto, parte)
+    return objeto
+
+
+class Chave:
+    """Um campo da ordenação: nome, sentido e se aceita nulo."""
+
+    __slots__ = ('campo', 'descendente', 'anulavel')
+
+    def __init__(self, campo, descendente, anulavel):
+        self.campo = campo
+        self.descendente = descendente
+        self.anulavel = anulavel
+
+    def ordem(self, para_tras=False):
+        nulos = {}
+        if self.anulavel:
+            nulos = {'nulls_first': True} if para_tras else {'nulls_last': True}
+        if self.descendente != para_tras:
+            return F(self.campo).desc(**nulos)
+        return F(self.campo).asc(**nulos)
+
+    def depois(self, valor, para_tras=False):
+        """Linhas estritamente depois de `valor` no sentido da leitura (None = nenhuma)."""
+        if valor is None:
+            # Nulos ficam no fim: depois deles não há nada; antes, todos os preenchidos
+            return Q(**{f'{self.campo}__isnull': False}) if para_tras and self.anulavel else None
+        maior = self.descendente == para_tras
+        condicao = Q(**{f'{self.campo}__{"gt" if maior else "lt"}': valor})
+        if self.anulavel and not para_tras:
+            condicao |= Q(**{f'{self.campo}__isnull': True})
+        return condicao
+
+    def a_partir(self, valor, para_tras=False):
+        """Como `depois`, mas inclusivo; serve de faixa para o índice."""
+        if valor is None:
+            return Q(**{f'{self.campo}__isnull': True}) if not para_tras else Q()
+        maior = self.descendente == para_tras
+        condicao = Q(**{f'{self.campo}__{"gte" if maior else "lte"}': valor})
+        if self.anulavel and not para_tras:
+            condicao |= Q(**{f'{self.campo}__isnull': True})
+        return condicao
+
+    def igual(self, valor):
+        if valor is None:
+            return Q(**{f'{self.campo}__isnull': True})
+        return Q(**{self.campo: valor})
+
+
+class PaginaCursor:
+    """Uma página: itens, cursores vizinhos e o total aproximado."""
+
+    def __init__(self, object_list, proximo_cursor, cursor_anterior, paginador):
+        self.object_list = object_list
+        self.proximo_cursor = proximo_cursor
+        self.cursor_anterior = cursor_anterior
+        self.paginador = paginador
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    def has_next(self):
+        return self.proximo_cursor is not None
+
+    def has_previous(self):
+        return self.cursor_anterior is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def total(self):
+        return self.paginador.total[0]
+
+    @property
+    def total_exato(self):
+        return self.paginador.total[1]
+
+
+class PaginadorCursor:
+    """Pagina um queryset pelos valores da ordenação (ver módulo)."""
+
+    def __init__(self, queryset, por_pagina, ordenacao=None, limite_total=LIMITE_TOTAL):
+        ordenacao = list(ordenacao or queryset.query.order_by or queryset.model._meta.ordering)
+        modelo = queryset.model
+        self.chaves = []
+        # Campo do modelo de cada chave, para validar os valores vindos do cursor
+        self._campos = []
+        for nome in ordenacao:
+            campo = nome.lstrip('-')
+            if campo == 'pk':
+                campo = modelo._meta.pk.name
+            campo_modelo = _campo_modelo(modelo, campo)
+            self.chaves.append(Chave(campo, nome.startswith('-'), campo_modelo.null))
+            self._campos.append(campo_modelo)
+        pk = modelo._meta.pk.name
+        if not any(chave.campo == pk for chave in self.chaves):
+            self.chaves.append(Chave(pk, False, False))
+            self._campos.append(modelo._meta.pk)
+        self.queryset = queryset
+        self.por_pagina = por_pagina
+        self.limite_total = limite_total
+        self._total = None
+
+    # ----------------------------------------------------------- cursores
+
+    def _valores(self, objeto):
+        return [_valor(objeto, chave.campo) for chave in self.chaves]
+
+    def _codificar(self, valores, para_tras):
+        dados = {'v': valores}
+        if para_tras:
+            dados['a'] = 1
+        texto = json.dumps(dados, default=_serializar, separators=(',', ':'))
+        return base64.urlsafe_b64encode(texto.encode()).decode().rstrip('=')
+
+    def _decodificar(self, cursor):
+        """(valores, para_trás), ou None se o cursor for inválido."""
+        try:
+            texto = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            dados = json.loads(texto)
+            valores = dados['v']
+        except (ValueError, TypeError, KeyError, binascii.Error):
+            return None
+        if not isinstance(valores, list) or len(valores) != len(self.chaves):
+            return None
+        # O cursor vem do cliente: valor de tipo errado (ou nulo onde a chave
+        # não aceita) serve a primeira página em vez de estourar na consulta
+        convertidos = []
+        for chave, campo, valor in zip(self.chaves, self._campos, valores):
+            if valor is None:
+                if not chave.anulavel:
+                    return None
+                convertidos.append(None)
+                continue
+            if isinstance(valor, (list, dict)):
+                return None
+            try:
+                convertidos.append(campo.to_python(valor))
+            except ValidationError:
+                return None
+        return convertidos, bool(dados.get('a'))
+
+    def _filtro(self, chaves, valores, para_tras):
+        filtro, iguais = Q(), Q()
+        condicoes = []
+        for chave, valor in zip(chaves, valores):
+            depois = chave.depois(valor, para_tras)
+            if depois is not None:
+                condicoes.append(iguais & depois)
+            iguais &= chave.igual(valor)
+        for condicao in condicoes:
+            filtro |= condicao
+        if not condicoes:
+            return Q(pk__in=[])
+        # Faixa redundante na primeira chave: deixa o banco buscar pelo índice
+        # em vez de avaliar o OR linha a linha
+        return chaves[0].a_partir(valores[0], para_tras) & filtro
+
+    def _consultas(self, valores, para_tras):
+        """
+        Consultas a ler em sequência até completar a página. Se a primeira
+        chave aceita nulo, preenchidos e nulos são lidos em consultas
+        separadas (nessa ordem, ou na inversa ao voltar): assim nenhuma
+        delas precisa de "OR campo IS NULL", que impede o uso do índice.
+        """
+        primeira = self.chaves[0]
+        if not primeira.anulavel:
+            consulta = self.queryset.order_by(*(chave.ordem(para_tras) for chave in self.chaves))
+            yield consulta if valores is None else consulta.filter(self._filtro(self.chaves, valores, para_tras))
+            return
+
+        chaves = [Chave(primeira.campo, primeira.descendente, False)] + self.chaves[1:]
+        ordem = [chave.ordem(para_tras) for chave in chaves]
+        regioes = [True, False] if para_tras else [False, True]
+        cursor_nulo = valores is not None and valores[0] is None
+        for nulos in regioes:
+            if valores is not None and nulos != cursor_nulo:
+                # Regiões antes da do cursor (no sentido da leitura) ficam de fora
+                if regioes.index(nulos) < regioes.index(cursor_nulo):
+                    continue
+                filtro = Q()
+            elif valores is not None:
+                filtro = self._filtro(chaves, valores, para_tras)
+            else:
+                filtro = Q()
+            yield self.queryset.filter(filtro, **{f'{primeira.campo}__isnull': nulos}).order_by(*ordem)
+
+    # ------------------------------------------------------------- páginas
+
+    def pagina(self, cursor=None):
+        """A página indicada pelo cursor (a primeira, se ausente ou inválido)."""
+        decodificado = self._decodificar(cursor) if cursor else None
+        valores, para_tras = decodificado or (None, False)
+
+        itens = []
+        for consulta in self._consultas(valores, para_tras):
+            itens.extend(consulta[:self.por_pagina + 1 - len(itens)])
+            if len(itens) > self.por_pagina:
+                break
+        ha_mais = len(itens) > self.por_pagina
+        itens = itens[:self.por_pagina]
+        if para_tras:
+            itens.reverse()
+
+        # Voltando, sempre há próxima página; avançando, a anterior existe se veio de um cursor
+        proximo = anterior = None
+        if para_tras:
+            proximo = self._codificar(self._valores(itens[-1]) if itens else valores, False)
+            if ha_mais:
+                anterior = self._codificar(self._valores(itens[0]), True)
+        else:
+            if ha_mais:
+                proximo = self._codificar(self._valores(itens[-1]), False)
+            if valores is not None:
+                anterior = self._codificar(self._valores(itens[0]) if itens else valores, True)
+        return PaginaCursor(itens, proximo, anterior, self)
+
+    @property
+    def total(self):
+        """(quantidade, exata?) contando no máximo `limite_total` linhas."""
+        if self._total is None:
+            if self.limite_total is None:
+                self._total = (self.queryset.count(), True)
+            else:
+                contadas = self.queryset.order_by()[:self.limite_total + 1].count()
+                self._total = (min(contadas, self.limite_total), contadas <= self.limite_total)
+        return self._total
@@ -0,0 +1,194 @@
+"""
+Perfilamento de requisições em produção.
+
+Coleta, para uma amostra das requisições, tempo total, tempo de banco,
+número de consultas, consultas repetidas (assinaturas de N+1) e tempo de
+renderização de templates. Os dados ficam num armazenamento em memória
+por processo, com janela deslizante, exibido na página de perfilamento.
+Os agregados por endpoint, por SQL e de N+1 guardam no máximo
+LIMITE_CHAVES entradas cada, descartando as usadas há mais tempo.
+"""
+
+import re
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+
+from django.template.backends.django import Template as DjangoTemplate
+
+_local = threading.local()
+
+_RE_STRING = re.compile(r"'(?:[^']|'')*'")
+_RE_NUMERO = re.compile(r'\b\d+(?:\.\d+)?\b')
+_RE_LISTA = re.compile(r'\((?:\s*(?:\?|%s)\s*,)+\s*(?:\?|%s)\s*\)')
+_RE_ESPACOS = re.compile(r'\s+')
+
+LIMITE_CHAVES = 500
+
+
+def normalizar_sql(sql):
+    """Substitui literais por ? e colapsa listas IN, agrupando consultas iguais."""
+    sql = _RE_STRING.sub('?', sql)
+    sql = _RE_NUMERO.sub('?', sql)
+    sql = _RE_LISTA.sub('(...)', sql)
+    return _RE_ESPACOS.sub(' ', sql).strip()
+
+
+class ColetaRequisicao:
+    """Métricas de uma única requisição amostrada."""
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.db_ms = 0.0
+        self.template_ms = 0.0
+        self.consultas = Counter()
+        self.consultas_ms = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        """Wrapper de connection.execute_wrapper que cronometra cada consulta."""
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duracao = (time.perf_counter() - inicio) * 1000
+            assinatura = normalizar_sql(sql)
+            self.db_ms += duracao
+            self.consultas[assinatura] += 1
+            self.consultas_ms[assinatura] += duracao
+
+    @property
+    def total_ms(self):
+        return (time.perf_counter() - self.inicio) * 1000
+
+    @property
+    def num_consultas(self):
+        return sum(self.consultas.values())
+
+    def repetidas(self, limiar):
+        """Assinaturas executadas `limiar` vezes ou mais (provável N+1)."""
+        return {sql: n for sql, n in self.consultas.items() if n >= limiar}
+
+
+def _recente(mapa, chave, novo, limite):
+    """
+    Item `chave` de `mapa` (criado com novo() se ausente), marcado como o
+    mais recente; acima de `limite` itens, o usado há mais tempo sai.
+    """
+    if chave in mapa:
+        mapa.move_to_end(chave)
+        return mapa[chave]
+    item = mapa[chave] = novo()
+    if len(mapa) > limite:
+        mapa.popitem(last=False)
+    return item
+
+
+class ArmazenamentoPerfil:
+    """Agregados por endpoint e por SQL normalizado (LRU), protegidos por lock."""
+
+    def __init__(self, tamanho_janela=1000, limite_chaves=LIMITE_CHAVES):
+        self._lock = threading.Lock()
+        self.recentes = deque(maxlen=tamanho_janela)
+        self.limite_chaves = limite_chaves
+        self.endpoints = OrderedDict()
+        self.sql = OrderedDict()
+        self.repetidas = OrderedDict()
+
+    def registrar(self, endpoint, metodo, status, coleta, limiar_repeticao):
+        total_ms = coleta.total_ms
+        repetidas = coleta.repetidas(limiar_repeticao)
+        amostra = {
+            'endpoint': endpoint,
+            'metodo': metodo,
+            'status': status,
+            'total_ms': round(total_ms, 2),
+            'db_ms': round(coleta.db_ms, 2),
+            'template_ms': round(coleta.template_ms, 2),
+            'consultas': coleta.num_consultas,
+            'repetidas': len(repetidas),
+            'quando': time.time(),
+        }
+
+        with self._lock:
+            self.recentes.append(amostra)
+
+            dados = _recente(self.endpoints, endpoint, lambda: {
+                'endpoint': endpoint, 'requisicoes': 0, 'total_ms': 0.0,
+                'max_ms': 0.0, 'db_ms': 0.0, 'consultas': 0,
+            }, self.limite_chaves)
+            dados['requisicoes'] += 1
+            dados['total_ms'] += total_ms
+            dados['max_ms'] = max(dados['max_ms'], total_ms)
+            dados['db_ms'] += coleta.db_ms
+            dados['consultas'] += coleta.num_consultas
+
+            for assinatura, n in coleta.consultas.items():
+                item = _recente(self.sql, assinatura, lambda: {
+                    'sql': assinatura, 'execucoes': 0, 'total_ms': 0.0,
+                }, self.limite_chaves)
+                item['execucoes'] += n
+                item['total_ms'] += coleta.consultas_ms[assinatura]
+
+            for assinatura in repetidas:
+                item = _recente(self.repetidas, (endpoint, assinatura), lambda: {'ocorrencias': 0}, self.limite_chaves)
+                item['ocorrencias'] += 1
+
+    def endpoints_lentos(self, n=20):
+        with self._lock:
+            itens = [
+                {**dados, 'media_ms': dados['total_ms'] / dados['requisicoes'],
+                 'media_consultas': dados['consultas'] / dados['requisicoes']}
+                for dados in self.endpoints.values()
+            ]
+        return sorted(itens, key=lambda item: item['media_ms'], reverse=True)[:n]
+
+    def sql_lentos(self, n=20):
+        with self._lock:
+            itens = list(self.sql.values())
+        return sorted(itens, key=lambda item: item['total_ms'], reverse=True)[:n]
+
+    def suspeitas_n_mais_1(self, n=20):
+        with self._lock:
+            itens = [
+                {'endpoint': endpoint, 'sql': sql, 'ocorrencias': item['ocorrencias']}
+                for (endpoint, sql), item in self.repetidas.items()
+            ]
+        return sorted(itens, key=lambda item: item['ocorrencias'], reverse=True)[:n]
+
+    def limpar(self):
+        with self._lock:
+            self.recentes.clear()
+            self.endpoints.clear()
+            self.sql.clear()
+            self.repetidas.clear()
+
+
+armazenamento = ArmazenamentoPerfil()
+
+
+def coleta_atual():
+    """Retorna a coleta da requisição corrente (ou None se não amostrada)."""
+    return getattr(_local, 'coleta', None)
+
+
+def definir_coleta(coleta):
+    _local.coleta = coleta
+
+
+_render_original = DjangoTemplate.render
+
+
+def _render_cronometrado(self, context=None, request=None):
+    coleta = coleta_atual()
+    if coleta is None:
+        return _render_original(self, context, request)
+    inicio = time.perf_counter()
+    try:
+        return _render_original(self, context, request)
+    finally:
+        coleta.template_ms += (time.perf_counter() - inicio) * 1000
+
+
+def instrumentar_templates():
+    """Cronometra a renderização de templates (só afeta requisições amostradas)."""
+    DjangoTemplate.render = _render_cronometrado
@@ -0,0 +1,22 @@
+"""
+Sinais do app core.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .autenticacao import invalidar_usuario_cache
+from .sqlite import aplicar_pragmas
+
+User = get_user_model()
+
+
+@receiver([post_save, post_delete], sender=User)
+def usuario_alterado(sender, instance, **kwargs):
+    """Invalida o usuário em cache quando o registro muda."""
+    invalidar_usuario_cache(instance.pk)
+
+
+connection_created.connect(aplicar_pragmas, dispatch_uid='core.sqlite.aplicar_pragmas')
@@ -0,0 +1,41 @@
+"""
+Ajustes de desempenho para instalações que usam SQLite.
+"""
+
+from django.conf import settings
+
+
+def aplicar_pragmas(sender, connection, **kwargs):
+    """
+    Aplica settings.SQLITE_PRAGMAS em cada nova conexão SQLite.
+
+    Conectado ao sinal connection_created em core.signals.
+    """
+    if connection.vendor != 'sqlite':
+        return
+
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    if not pragmas:
+        return
+
+    with connection.cursor() as cursor:
+        for nome, valor in pragmas.items():
+            cursor.execute(f'PRAGMA {nome} = {valor}')
+
+
+PRAGMAS_RELATORIO = [
+    'journal_mode', 'synchronous', 'busy_timeout', 'temp_store',
+    'cache_size', 'mmap_size', 'page_size', 'page_count',
+    'freelist_count', 'wal_autocheckpoint',
+]
+
+
+def ler_pragmas(connection):
+    """Retorna os valores atuais dos pragmas em PRAGMAS_RELATORIO."""
+    valores = {}
+    with connection.cursor() as cursor:
+        for nome in PRAGMAS_RELATORIO:
+            cursor.execute(f'PRAGMA {nome}')
+            linha = cursor.fetchone()
+            valores[nome] = linha[0] if linha else None
+    return valores
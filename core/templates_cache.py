@@ -0,0 +1,51 @@
+"""
+Pré-compilação dos templates no loader em cache.
+
+Com o loader em cache (TEMPLATE_CACHE) cada template é lido e compilado
+uma vez por processo, na primeira requisição que o usa. precompilar()
+percorre os diretórios de templates e carrega todos de uma vez; o
+assistente_estudo/wsgi.py chama-a ao subir (TEMPLATE_PRECOMPILE), para
+que a primeira requisição de cada worker não pague a compilação.
+"""
+
+import logging
+import time
+from pathlib import Path
+
+from django.template import TemplateDoesNotExist, TemplateSyntaxError, engines
+from django.template.utils import get_app_template_dirs
+
+logger = logging.getLogger(__name__)
+
+
+def nomes_templates(extensoes=('.html', '.txt')):
+    """Nomes ('academico/todolist_geral.html') dos templates do projeto e dos apps."""
+    motor = engines['django'].engine
+    nomes = set()
+    for diretorio in [*motor.dirs, *get_app_template_dirs('templates')]:
+        raiz = Path(diretorio)
+        for arquivo in raiz.rglob('*'):
+            if arquivo.suffix in extensoes:
+                nomes.add(arquivo.relative_to(raiz).as_posix())
+    return sorted(nomes)
+
+
+def precompilar():
+    """Carrega todos os templates no loader em cache; retorna (compilados, segundos)."""
+    motor = engines['django'].engine
+    inicio = time.perf_counter()
+    compilados = 0
+    for nome in nomes_templates():
+        try:
+            motor.get_template(nome)
+        except TemplateSyntaxError as erro:
+            # A página quebraria na requisição; melhor aparecer no log ao subir
+            logger.warning('Template %s com erro de sintaxe: %s', nome, erro)
+            continue
+        except TemplateDoesNotExist as erro:
+            logger.debug('Template %s não pré-compilado: %s', nome, erro)
+            continue
+        compilados += 1
+    duracao = time.perf_counter() - inicio
+    logger.info('%d templates pré-compilados em %.2fs', compilados, duracao)
+    return compilados, duracao
@@ -0,0 +1 @@
+# Arquivo necessário para registrar template tags customizadas
@@ -0,0 +1,21 @@
+from django import template
+
+register = template.Library()
+
+
+def _url_cursor(request, cursor):
+    parametros = request.GET.copy()
+    parametros.pop('page', None)
+    parametros['cursor'] = cursor
+    return f'?{parametros.urlencode()}'
+
+
+@register.inclusion_tag('core/paginacao_cursor.html', takes_context=True)
+def paginacao_cursor(context, page_obj):
+    """Links anterior/próxima de uma página de core.paginacao, mantendo os filtros da URL"""
+    request = context['request']
+    return {
+        'page_obj': page_obj,
+        'url_anterior': _url_cursor(request, page_obj.cursor_anterior) if page_obj.has_previous() else None,
+        'url_proxima': _url_cursor(request, page_obj.proximo_cursor) if page_obj.has_next() else None,
+    }
@@ -22,4 +22,13 @@ urlpatterns = [
     
     # Evento form placeholder
     path('evento/form/', views.evento_form, name='evento_form'),
+    
+    # Perfilamento (apenas staff)
+    path('perfilamento/', views.perfilamento, name='perfilamento'),
+    
+    # Health check (público, sem banco)
+    path('health/', views.health, name='health'),
+    
+    # Métricas Prometheus (token Bearer ou staff)
+    path('metrics/', views.metricas, name='metricas'),
 ]
@@ -5,17 +5,22 @@ Views para o app core - páginas principais do sistema.
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse
 from django.views.decorators.http import require_POST
 from django.utils import timezone
 from datetime import timedelta
 from django.db.models import Count, Q
+from django.conf import settings
+from django.utils.crypto import constant_time_compare
 
 from academico.models import (
     Semestre, Materia, EventoAgenda, 
     Tarefa, AcessoMateria
 )
 from agentes.servicos import servico_agente
+from .metricas import registro as registro_metricas
+from .perfilamento import armazenamento
 
 
 def home(request):
@@ -244,3 +249,50 @@ def evento_form(request):
     # Por enquanto, redireciona para a home
     messages.info(request, 'Formulário de eventos em desenvolvimento.')
     return redirect('home')
+
+
+def health(request):
+    """Health check para balanceadores; não consulta o banco."""
+    return JsonResponse({'status': 'ok'})
+
+
+@staff_member_required
+def perfilamento(request):
+    """Relatório de endpoints e consultas mais lentos (apenas staff)."""
+    
+    if request.method == 'POST':
+        armazenamento.limpar()
+        messages.success(request, 'Dados de perfilamento limpos.')
+        return redirect('perfilamento')
+    
+    context = {
+        'ativo': settings.PROFILING_ENABLED,
+        'taxa_amostragem': settings.PROFILING_SAMPLE_RATE,
+        'endpoints': armazenamento.endpoints_lentos(),
+        'consultas': armazenamento.sql_lentos(),
+        'suspeitas': armazenamento.suspeitas_n_mais_1(),
+        'recentes': list(armazenamento.recentes)[-50:][::-1],
+        'titulo_pagina': 'Perfilamento'
+    }
+    
+    return render(request, 'core/perfilamento.html', context)
+
+
+def metricas(request):
+    """
+    Exposição das métricas no formato texto do Prometheus.
+    
+    Aceita o cabeçalho "Authorization: Bearer <METRICS_TOKEN>" (para o
+    coletor) ou um usuário staff logado.
+    """
+    token = settings.METRICS_TOKEN
+    autorizacao = request.headers.get('Authorization', '')
+    if token and constant_time_compare(autorizacao, f'Bearer {token}'):
+        pass
+    elif not (request.user.is_authenticated and request.user.is_staff):
+        return HttpResponseForbidden('Acesso negado.')
+    
+    return HttpResponse(
+        registro_metricas.expor_texto(),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
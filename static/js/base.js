@@ -0,0 +1,22 @@
+// Scripts de templates/base.html
+
+// Função para mostrar aviso sobre eventos em breve
+function mostrarEventoEmBreve() {
+    alert('📅 Funcionalidade de criação de eventos estará disponível em breve!\n\nPor enquanto, você pode:\n• Visualizar eventos na agenda\n• Usar os agentes de IA para consultas');
+}
+
+// Função para mostrar aviso sobre chat em breve
+function mostrarChatEmBreve() {
+    alert('🤖 O Chat com IA estará disponível em breve!\n\nPor enquanto, use os agentes específicos:\n• Agente do Semestre (em cada semestre)\n• Tutor da Matéria (em cada matéria)');
+}
+
+// Auto-hide alerts após 5 segundos
+document.addEventListener('DOMContentLoaded', function() {
+    setTimeout(function() {
+        var alerts = document.querySelectorAll('.alert');
+        alerts.forEach(function(alert) {
+            var bsAlert = new bootstrap.Alert(alert);
+            bsAlert.close();
+        });
+    }, 5000);
+});
@@ -289,6 +289,191 @@ function copyToClipboard(text) {
     }
 }
 
+// Preenche um <template> com os campos de um item JSON. Diretivas nos elementos:
+// data-campo="x" (texto), data-atributos="href:url_x value:id",
+// data-classe="x" (acrescenta as classes do campo x) e
+// data-se="x y" / data-se-nao="x y" (mantém o elemento só se todos os campos forem verdadeiros/falsos)
+function preencherTemplate(template, item) {
+    const fragmento = template.content.cloneNode(true);
+    const campos = valor => valor.split(/\s+/).filter(Boolean);
+    fragmento.querySelectorAll('[data-se]').forEach(el => {
+        if (!campos(el.dataset.se).every(campo => item[campo])) el.remove();
+    });
+    fragmento.querySelectorAll('[data-se-nao]').forEach(el => {
+        if (campos(el.dataset.seNao).some(campo => item[campo])) el.remove();
+    });
+    fragmento.querySelectorAll('[data-campo]').forEach(el => {
+        el.textContent = item[el.dataset.campo] ?? '';
+    });
+    fragmento.querySelectorAll('[data-atributos]').forEach(el => {
+        campos(el.dataset.atributos).forEach(par => {
+            const [atributo, campo] = par.split(':');
+            el.setAttribute(atributo, item[campo] ?? '');
+        });
+    });
+    fragmento.querySelectorAll('[data-classe]').forEach(el => {
+        campos(el.dataset.classe).forEach(campo => {
+            if (item[campo]) el.classList.add(...campos(String(item[campo])));
+        });
+    });
+    return fragmento;
+}
+
+// Opções dos filtros (semestres, matérias...) mudam pouco: ficam em sessionStorage
+const CACHE_FILTROS_TTL = 5 * 60 * 1000;
+const opcoesEmAndamento = {};
+
+function carregarOpcoesFiltros(url) {
+    const chave = `filtros:${url}`;
+    try {
+        const salvo = JSON.parse(sessionStorage.getItem(chave));
+        if (salvo && Date.now() - salvo.em < CACHE_FILTROS_TTL) {
+            return Promise.resolve(salvo.dados);
+        }
+    } catch (e) {
+        // Cache ilegível: busca de novo
+    }
+    if (!opcoesEmAndamento[url]) {
+        opcoesEmAndamento[url] = makeAjaxRequest(url)
+            .then(dados => {
+                try {
+                    sessionStorage.setItem(chave, JSON.stringify({ em: Date.now(), dados }));
+                } catch (e) {
+                    // Sem espaço ou sessionStorage indisponível: segue sem cache
+                }
+                return dados;
+            })
+            .finally(() => { delete opcoesEmAndamento[url]; });
+    }
+    return opcoesEmAndamento[url];
+}
+
+function limparCacheFiltros() {
+    Object.keys(sessionStorage)
+        .filter(chave => chave.startsWith('filtros:'))
+        .forEach(chave => sessionStorage.removeItem(chave));
+}
+
+// <select data-opcoes="materias" data-opcoes-filtro="semestre"> é refeito com as
+// opções em cache cujo semestre_id é o valor do campo "semestre" do formulário
+function atualizarOpcoesDependentes(form, alterado) {
+    const dependentes = Array.from(form.querySelectorAll('select[data-opcoes]'))
+        .filter(select => form.elements[select.dataset.opcoesFiltro] === alterado);
+    if (!dependentes.length || !form.dataset.filtrosUrl) {
+        return Promise.resolve();
+    }
+    return carregarOpcoesFiltros(form.dataset.filtrosUrl).then(opcoes => {
+        dependentes.forEach(select => {
+            const filtro = select.dataset.opcoesFiltro;
+            const detalhe = select.dataset.opcoesDetalhe;
+            const atual = select.value;
+            select.replaceChildren(select.options[0]);
+            (opcoes[select.dataset.opcoes] || [])
+                .filter(opcao => !alterado.value || String(opcao[`${filtro}_id`]) === alterado.value)
+                .forEach(opcao => {
+                    const rotulo = detalhe && opcao[detalhe] ? `${opcao.nome} (${opcao[detalhe]})` : opcao.nome;
+                    select.add(new Option(rotulo, opcao.id));
+                });
+            select.value = Array.from(select.options).some(opcao => opcao.value === atual) ? atual : '';
+        });
+    }).catch(() => {
+        // Sem as opções, o filtro continua com a lista completa
+    });
+}
+
+// Lista com rolagem infinita alimentada por um endpoint JSON paginado por cursor.
+// O contêiner declara data-lista-url, data-lista-template (id do <template> do item),
+// data-proximo-cursor (da página renderizada no servidor) e, opcionalmente,
+// data-lista-form (filtros, aplicados sem recarregar a página) e data-lista-vazio
+// (elemento mostrado quando não há itens). Dispara "lista:atualizada" a cada carga.
+function setupListaIncremental(lista) {
+    const url = lista.dataset.listaUrl;
+    const template = document.getElementById(lista.dataset.listaTemplate);
+    const form = lista.dataset.listaForm ? document.getElementById(lista.dataset.listaForm) : null;
+    const vazio = lista.dataset.listaVazio ? document.getElementById(lista.dataset.listaVazio) : null;
+    let cursor = lista.dataset.proximoCursor || null;
+    let emAndamento = null;
+
+    // Os links de paginação dão lugar à rolagem
+    lista.parentElement.querySelectorAll(':scope > [data-paginacao-cursor]').forEach(nav => { nav.hidden = true; });
+    const sentinela = document.createElement('div');
+    sentinela.className = 'lista-sentinela';
+    lista.after(sentinela);
+
+    function parametros() {
+        const params = form ? new URLSearchParams(new FormData(form)) : new URLSearchParams(location.search);
+        params.delete('cursor');
+        return params;
+    }
+
+    function carregar(reiniciar) {
+        if (emAndamento) {
+            if (!reiniciar) return;
+            emAndamento.abort();
+        }
+        if (!reiniciar && !cursor) return;
+        const params = parametros();
+        if (reiniciar) {
+            history.replaceState(null, '', `${location.pathname}?${params}`);
+        } else {
+            params.set('cursor', cursor);
+        }
+        const controle = new AbortController();
+        emAndamento = controle;
+        lista.setAttribute('aria-busy', 'true');
+
+        makeAjaxRequest(`${url}?${params}`, { signal: controle.signal })
+            .then(dados => {
+                if (reiniciar) lista.replaceChildren();
+                dados.itens.forEach(item => lista.appendChild(preencherTemplate(template, item)));
+                cursor = dados.proximo_cursor;
+                if (vazio) vazio.hidden = lista.children.length > 0;
+                lista.dispatchEvent(new CustomEvent('lista:atualizada', {
+                    detail: { reiniciada: reiniciar, itens: dados.itens }
+                }));
+            })
+            .catch(error => {
+                if (error.name !== 'AbortError') {
+                    showToast('Erro ao carregar a lista', 'error');
+                }
+            })
+            .finally(() => {
+                if (emAndamento !== controle) return;
+                emAndamento = null;
+                lista.removeAttribute('aria-busy');
+                // Se a sentinela continuar visível, a próxima página vem em seguida
+                observador.unobserve(sentinela);
+                if (cursor) observador.observe(sentinela);
+            });
+    }
+
+    const observador = new IntersectionObserver(entries => {
+        if (entries.some(entry => entry.isIntersecting)) carregar(false);
+    }, { rootMargin: '300px 0px' });
+    if (cursor) observador.observe(sentinela);
+
+    if (form) {
+        const recarregar = () => carregar(true);
+        form.addEventListener('submit', e => {
+            e.preventDefault();
+            recarregar();
+        });
+        form.addEventListener('change', e => {
+            if (e.target.type === 'search') return;
+            atualizarOpcoesDependentes(form, e.target).then(recarregar);
+        });
+        form.querySelectorAll('input[type="search"]').forEach(campo => {
+            setupLiveSearch(campo, recarregar, 500);
+        });
+    }
+
+    return { recarregar: () => carregar(true) };
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    document.querySelectorAll('[data-lista-url]').forEach(setupListaIncremental);
+});
+
 // Exportar funções para uso global
 window.AssistenteEstudos = {
     makeAjaxRequest,
@@ -299,5 +484,9 @@ window.AssistenteEstudos = {
     setupFilePreview,
     setupLiveSearch,
     copyToClipboard,
-    debounce
+    debounce,
+    preencherTemplate,
+    carregarOpcoesFiltros,
+    limparCacheFiltros,
+    setupListaIncremental
 };
@@ -0,0 +1,307 @@
+// Scripts de templates/calendario/calendario_home.html
+
+// Dados da página vêm dos atributos data-* da própria tag <script>
+const calendarioConfig = document.currentScript.dataset;
+
+document.addEventListener('DOMContentLoaded', function() {
+    console.log('Calendário carregado com sucesso!');
+
+    // Verificar se o Bootstrap está carregado
+    if (typeof bootstrap === 'undefined') {
+        console.warn('Bootstrap não encontrado, usando fallbacks');
+    }
+
+    // Efeitos nos dias do calendário
+    const calendarDays = document.querySelectorAll('.calendar-day');
+    calendarDays.forEach(day => {
+        if (!day.classList.contains('other-month')) {
+            day.style.cursor = 'pointer';
+            day.addEventListener('mouseenter', function() { 
+                if (!this.style.transform.includes('translateY')) {
+                    this.style.transform = 'translateY(-3px)'; 
+                }
+            });
+            day.addEventListener('mouseleave', function() { 
+                this.style.transform = 'translateY(0)'; 
+            });
+        }
+    });
+
+    // Navegação por teclado
+    document.addEventListener('keydown', function(e) {
+        if (e.key === 'ArrowLeft' && e.ctrlKey) {
+            e.preventDefault();
+            const prevBtn = document.querySelector('a[href*="prev"]') || 
+                           document.querySelector('.calendar-nav a:first-child');
+            if (prevBtn) prevBtn.click();
+        } else if (e.key === 'ArrowRight' && e.ctrlKey) {
+            e.preventDefault();
+            const nextBtn = document.querySelector('a[href*="next"]') || 
+                           document.querySelector('.calendar-nav a:last-child');
+            if (nextBtn) nextBtn.click();
+        } else if (e.key === 'n' && e.ctrlKey) {
+            e.preventDefault();
+            window.location = calendarioConfig.urlCriar;
+        }
+    });
+
+    // Animação de entrada para os cards
+    const statCards = document.querySelectorAll('.stat-card');
+    statCards.forEach((card, index) => {
+        card.style.opacity = '0';
+        card.style.transform = 'translateY(30px)';
+        setTimeout(() => {
+            card.style.transition = 'all 0.6s ease';
+            card.style.opacity = '1';
+            card.style.transform = 'translateY(0)';
+        }, index * 100);
+    });
+
+    // Configurar modal
+    const modalEl = document.getElementById('dayModal');
+    if (modalEl) {
+        // Garantir que o modal esteja no body
+        if (modalEl.parentElement !== document.body) {
+            document.body.appendChild(modalEl);
+        }
+
+        // Criar instância do modal se Bootstrap estiver disponível
+        if (typeof bootstrap !== 'undefined') {
+            new bootstrap.Modal(modalEl, { 
+                backdrop: true, 
+                keyboard: true, 
+                focus: true 
+            });
+        }
+    }
+
+    // Clique em event-item não deve abrir o modal do dia
+    document.addEventListener('click', function(e) {
+        if (e.target.closest('.event-item')) {
+            e.stopPropagation();
+        }
+    });
+
+    // Fechar modal com ESC (fallback)
+    document.addEventListener('keydown', function(e) {
+        if (e.key === 'Escape') {
+            const modal = document.getElementById('dayModal');
+            if (modal && typeof bootstrap !== 'undefined') {
+                const instance = bootstrap.Modal.getInstance(modal);
+                if (instance) instance.hide();
+            } else if (modal) {
+                modal.style.display = 'none';
+                document.body.classList.remove('modal-open');
+                // Remover backdrops
+                document.querySelectorAll('.modal-backdrop').forEach(b => b.remove());
+            }
+        }
+    });
+
+    // Acessibilidade: foca o botão fechar ao abrir
+    if (modalEl) {
+        modalEl.addEventListener('shown.bs.modal', function() {
+            const closeBtn = this.querySelector('.btn-close');
+            if (closeBtn) closeBtn.focus();
+        });
+    }
+
+    // Alternância de visualizações
+    const viewButtons = document.querySelectorAll('.view-btn');
+    const monthlyView = document.getElementById('monthlyView');
+    const weeklyView = document.getElementById('weeklyView');
+
+    viewButtons.forEach(btn => {
+        btn.addEventListener('click', function(e) {
+            e.preventDefault();
+
+            // Atualizar botões ativos
+            viewButtons.forEach(b => b.classList.remove('active'));
+            this.classList.add('active');
+
+            // Alternar visualizações
+            if (this.textContent.trim().includes('Mensal')) {
+                if (monthlyView) monthlyView.classList.add('active');
+                if (weeklyView) weeklyView.classList.remove('active');
+            } else {
+                if (weeklyView) weeklyView.classList.add('active');
+                if (monthlyView) monthlyView.classList.remove('active');
+            }
+        });
+    });
+});
+
+// Variáveis para controlar cliques
+let clickCount = 0;
+let clickTimer = null;
+
+// Função para mostrar modal do dia
+function showDayModal(dayElement) {
+    if (!dayElement || dayElement.classList.contains('other-month')) {
+        return;
+    }
+
+    clickCount++;
+    if (clickCount === 1) {
+        clickTimer = setTimeout(() => {
+            if (clickCount === 1) {
+                openDayModal(dayElement);
+            }
+            clickCount = 0;
+        }, 300); // janela para duplo clique
+    } else if (clickCount === 2) {
+        clearTimeout(clickTimer);
+        clickCount = 0;
+        editDay(dayElement);
+    }
+}
+
+// Abre o modal com dados do dia
+function openDayModal(dayElement) {
+    console.log('Abrindo modal para:', dayElement);
+
+    // Limpar backdrops fantasmas
+    document.querySelectorAll('.modal-backdrop').forEach(b => b.remove());
+    document.body.classList.remove('modal-open');
+    document.body.style.removeProperty('padding-right');
+
+    const date = dayElement.getAttribute('data-date') || 'Data não disponível';
+    const day = dayElement.getAttribute('data-day') || dayElement.querySelector('.day-number')?.textContent || 'Dia';
+
+    // Título do modal
+    const modalTitle = `${day} de ${calendarioConfig.nomeMes} de ${calendarioConfig.ano}`;
+    const titleEl = document.getElementById('modalDayTitle');
+    if (titleEl) titleEl.textContent = modalTitle;
+
+    // Lista de eventos
+    const eventsList = document.getElementById('modalEventsList');
+    const noEvents = document.getElementById('modalNoEvents');
+
+    if (eventsList) eventsList.innerHTML = '';
+
+    const events = dayElement.querySelectorAll('.event-item');
+
+    if (events.length > 0) {
+        if (noEvents) noEvents.style.display = 'none';
+        if (eventsList) eventsList.style.display = 'block';
+
+        events.forEach(evento => {
+            const eventCard = document.createElement('div');
+            eventCard.className = 'card mb-2';
+            eventCard.style.background = 'rgba(255, 255, 255, 0.05)';
+            eventCard.style.border = '1px solid rgba(255, 107, 53, 0.3)';
+
+            const title = evento.textContent.trim();
+            const type = evento.className.includes('event-AULA') ? 'AULA' :
+                        evento.className.includes('event-PROVA') ? 'PROVA' :
+                        evento.className.includes('event-TRABALHO') ? 'TRABALHO' :
+                        evento.className.includes('event-ESTUDO') ? 'ESTUDO' :
+                        evento.className.includes('event-REUNIAO') ? 'REUNIÃO' : 'OUTRO';
+
+            const badgeColor = type === 'AULA' ? '#28a745' :
+                             type === 'PROVA' ? '#dc3545' :
+                             type === 'TRABALHO' ? '#ffc107' :
+                             type === 'ESTUDO' ? '#17a2b8' :
+                             type === 'REUNIÃO' ? '#9B59B6' : '#FF6B35';
+
+            eventCard.innerHTML = `
+                <div class="card-body py-2">
+                    <div class="d-flex justify-content-between align-items-center">
+                        <div>
+                            <h6 class="mb-1 text-white">${title}</h6>
+                            <small class="text-muted">
+                                <i class="bi bi-clock me-1"></i>Horário: Ver detalhes
+                            </small>
+                        </div>
+                        <span class="badge" style="background-color: ${badgeColor};">${type}</span>
+                    </div>
+                </div>
+            `;
+            if (eventsList) eventsList.appendChild(eventCard);
+        });
+    } else {
+        if (eventsList) eventsList.style.display = 'none';
+        if (noEvents) noEvents.style.display = 'block';
+    }
+
+    // Botão criar evento
+    const createBtn = document.getElementById('btnCreateEvent');
+    if (createBtn) {
+        createBtn.onclick = () => {
+            const modal = document.getElementById('dayModal');
+            if (modal && typeof bootstrap !== 'undefined') {
+                const instance = bootstrap.Modal.getInstance(modal);
+                if (instance) instance.hide();
+            } else if (modal) {
+                modal.style.display = 'none';
+                document.body.classList.remove('modal-open');
+                document.querySelectorAll('.modal-backdrop').forEach(b => b.remove());
+            }
+
+            setTimeout(() => {
+                window.location.href = `${calendarioConfig.urlCriar}?date=${date}`;
+            }, 250);
+        };
+    }
+
+    // Mostrar modal
+    const modal = document.getElementById('dayModal');
+    if (modal) {
+        if (typeof bootstrap !== 'undefined') {
+            let instance = bootstrap.Modal.getInstance(modal);
+            if (!instance) {
+                instance = new bootstrap.Modal(modal, { 
+                    backdrop: true, 
+                    keyboard: true, 
+                    focus: true 
+                });
+            }
+            instance.show();
+        } else {
+            // Fallback sem Bootstrap
+            modal.style.display = 'block';
+            modal.classList.add('show');
+            document.body.classList.add('modal-open');
+
+            // Criar backdrop
+            const backdrop = document.createElement('div');
+            backdrop.className = 'modal-backdrop fade show';
+            backdrop.onclick = () => {
+                modal.style.display = 'none';
+                modal.classList.remove('show');
+                document.body.classList.remove('modal-open');
+                backdrop.remove();
+            };
+            document.body.appendChild(backdrop);
+        }
+    }
+}
+
+// Duplo clique = criar/editar
+function editDay(dayElement) {
+    if (!dayElement || dayElement.classList.contains('other-month')) {
+        return;
+    }
+
+    const date = dayElement.getAttribute('data-date');
+    const url = date ? 
+        `${calendarioConfig.urlCriar}?date=${date}` : 
+        `${calendarioConfig.urlCriar}`;
+
+    window.location.href = url;
+}
+
+// Função para criar evento em horário específico (visualização semanal)
+function createEventAtTime(hora, diaIndex) {
+    console.log('Criando evento para hora:', hora, 'dia:', diaIndex);
+
+    // Fallback para visualização mensal/geral
+    const today = new Date();
+    const year = Number(calendarioConfig.ano);
+    const month = String(Number(calendarioConfig.mes)).padStart(2, '0');
+    const day = String(today.getDate()).padStart(2, '0');
+    const horaStr = String(hora).padStart(2, '0');
+
+    const dateTimeString = `${year}-${month}-${day}T${horaStr}:00`;
+    window.location.href = `${calendarioConfig.urlCriar}?datetime=${dateTimeString}`;
+}
@@ -0,0 +1,129 @@
+// Scripts de templates/calendario/evento_detalhe.html
+
+// Dados da página vêm dos atributos data-* da própria tag <script>
+const eventoConfig = document.currentScript.dataset;
+
+// Funções para controle do modal
+function showDeleteModal() {
+    const modal = document.getElementById('confirmDeleteModal');
+    const backdrop = document.getElementById('modalBackdrop');
+
+    if (modal && backdrop) {
+        backdrop.style.display = 'block';
+        modal.classList.add('show');
+        document.body.style.overflow = 'hidden';
+    }
+}
+
+function hideDeleteModal() {
+    const modal = document.getElementById('confirmDeleteModal');
+    const backdrop = document.getElementById('modalBackdrop');
+
+    if (modal && backdrop) {
+        backdrop.style.display = 'none';
+        modal.classList.remove('show');
+        document.body.style.overflow = '';
+    }
+}
+
+// Função para excluir o evento via AJAX
+function deleteEvento() {
+    const deleteBtn = document.getElementById('confirmDeleteBtn');
+    const originalText = deleteBtn.innerHTML;
+
+    // Mostrar loading
+    deleteBtn.innerHTML = '<i class="fas fa-spinner fa-spin me-1"></i> Excluindo...';
+    deleteBtn.disabled = true;
+
+    // Obter o CSRF token
+    const csrfToken = document.querySelector('[name=csrfmiddlewaretoken]')?.value || 
+                     document.querySelector('meta[name=csrf-token]')?.getAttribute('content') ||
+                     getCookie('csrftoken');
+
+    fetch(eventoConfig.urlExcluir, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-CSRFToken': csrfToken,
+            'X-Requested-With': 'XMLHttpRequest'
+        },
+        credentials: 'same-origin'
+    })
+    .then(response => {
+        if (response.ok) {
+            // Sucesso - redirecionar para o calendário
+            window.location.href = eventoConfig.urlCalendario;
+        } else {
+            throw new Error('Erro ao excluir evento');
+        }
+    })
+    .catch(error => {
+        console.error('Erro:', error);
+        alert('Erro ao excluir o evento. Tente novamente.');
+
+        // Restaurar botão
+        deleteBtn.innerHTML = originalText;
+        deleteBtn.disabled = false;
+    });
+}
+
+// Função para obter CSRF token do cookie
+function getCookie(name) {
+    let cookieValue = null;
+    if (document.cookie && document.cookie !== '') {
+        const cookies = document.cookie.split(';');
+        for (let i = 0; i < cookies.length; i++) {
+            const cookie = cookies[i].trim();
+            if (cookie.substring(0, name.length + 1) === (name + '=')) {
+                cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
+                break;
+            }
+        }
+    }
+    return cookieValue;
+}
+
+// Fechar modal com ESC
+document.addEventListener('keydown', function(e) {
+    if (e.key === 'Escape') {
+        hideDeleteModal();
+    }
+});
+
+document.addEventListener('DOMContentLoaded', function() {
+    // Countdown timer para eventos futuros
+    const countdownElement = document.getElementById('countdown');
+    if (countdownElement) {
+        const eventoDate = new Date(eventoConfig.dataInicio);
+
+        function updateCountdown() {
+            const now = new Date();
+            const timeDiff = eventoDate - now;
+
+            if (timeDiff > 0) {
+                const days = Math.floor(timeDiff / (1000 * 60 * 60 * 24));
+                const hours = Math.floor((timeDiff % (1000 * 60 * 60 * 24)) / (1000 * 60 * 60));
+                const minutes = Math.floor((timeDiff % (1000 * 60 * 60)) / (1000 * 60));
+                const seconds = Math.floor((timeDiff % (1000 * 60)) / 1000);
+
+                let countdownText = '';
+                if (days > 0) {
+                    countdownText = `${days}d ${hours}h ${minutes}m`;
+                } else if (hours > 0) {
+                    countdownText = `${hours}h ${minutes}m ${seconds}s`;
+                } else {
+                    countdownText = `${minutes}m ${seconds}s`;
+                }
+
+                countdownElement.textContent = countdownText;
+            } else {
+                countdownElement.textContent = 'Evento em andamento!';
+                countdownElement.parentElement.querySelector('p').textContent = 'O evento já começou';
+            }
+        }
+
+        // Atualizar imediatamente e depois a cada segundo
+        updateCountdown();
+        setInterval(updateCountdown, 1000);
+    }
+});
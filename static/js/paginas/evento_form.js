@@ -0,0 +1,137 @@
+// Scripts de templates/calendario/evento_form.html
+
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.getElementById('eventoForm');
+    const tipoEventoSelect = document.getElementById('id_tipo_evento');
+    const corInput = document.getElementById('id_cor_personalizada');
+    const colorPreview = document.getElementById('colorPreview');
+    const tipoPreview = document.getElementById('tipoPreview');
+    const lembreteCheck = document.getElementById('id_lembrete');
+    const lembreteConfig = document.getElementById('lembreteConfig');
+    const temRecorrencia = document.getElementById('temRecorrencia');
+    const recorrenciaFields = document.getElementById('recorrenciaFields');
+
+    // Debug: verificar se data foi pré-preenchida
+    const dataInicio = document.getElementById('id_data_inicio');
+    const dataFim = document.getElementById('id_data_fim');
+
+    console.log('🗓️ Valores de data carregados:');
+    console.log('Data início:', dataInicio?.value);
+    console.log('Data fim:', dataFim?.value);
+    console.log('URL params:', window.location.search);
+
+    // Cores dos tipos de evento
+    const coresTipos = {
+        'prova': '#DC3545',
+        'aula': '#28A745',
+        'trabalho': '#FFC107',
+        'estudo': '#007BFF',
+        'reuniao': '#6F42C1',
+        'outro': '#FF7A00'
+    };
+
+    // Sistema de cores predefinidas
+    const colorOptions = document.querySelectorAll('.color-option');
+
+    colorOptions.forEach(option => {
+        option.addEventListener('click', function() {
+            const cor = this.dataset.color;
+            corInput.value = cor;
+            updateColorPreview();
+
+            // Atualizar seleção visual
+            colorOptions.forEach(opt => opt.classList.remove('selected'));
+            this.classList.add('selected');
+        });
+    });
+
+    // Definir cor inicial baseada no tipo de evento
+    function setInitialColor() {
+        if (tipoEventoSelect && tipoEventoSelect.value) {
+            const cor = coresTipos[tipoEventoSelect.value] || '#FF7A00';
+            corInput.value = cor;
+            updateColorPreview();
+
+            // Marcar a cor correspondente
+            colorOptions.forEach(opt => {
+                opt.classList.remove('selected');
+                if (opt.dataset.color === cor) {
+                    opt.classList.add('selected');
+                }
+            });
+        }
+    }
+
+    // Atualizar preview da cor
+    function updateColorPreview() {
+        const cor = corInput.value || coresTipos[tipoEventoSelect.value] || '#FF7A00';
+        colorPreview.style.backgroundColor = cor;
+    }
+
+    // Atualizar preview do tipo
+    function updateTipoPreview() {
+        const selectedOption = tipoEventoSelect.options[tipoEventoSelect.selectedIndex];
+        const tipo = tipoEventoSelect.value;
+        const cor = coresTipos[tipo] || '#FF7A00';
+
+        if (selectedOption.text !== '---------') {
+            tipoPreview.textContent = selectedOption.text;
+            tipoPreview.style.backgroundColor = cor;
+            tipoPreview.style.color = tipo === 'trabalho' ? '#000' : '#fff';
+            tipoPreview.style.display = 'inline-block';
+        } else {
+            tipoPreview.style.display = 'none';
+        }
+    }
+
+    // Event listeners
+    if (corInput) {
+        corInput.addEventListener('input', updateColorPreview);
+    }
+
+    if (tipoEventoSelect) {
+        tipoEventoSelect.addEventListener('change', function() {
+            updateTipoPreview();
+            setInitialColor();
+        });
+        updateTipoPreview();
+        setInitialColor();
+    }
+
+    if (lembreteCheck) {
+        lembreteCheck.addEventListener('change', function() {
+            lembreteConfig.style.display = this.checked ? 'block' : 'none';
+        });
+
+        // Estado inicial
+        if (lembreteCheck.checked) {
+            lembreteConfig.style.display = 'block';
+        }
+    }
+
+    if (temRecorrencia) {
+        temRecorrencia.addEventListener('change', function() {
+            recorrenciaFields.style.display = this.checked ? 'block' : 'none';
+        });
+    }
+
+    // Validação do formulário
+    form.addEventListener('submit', function(e) {
+        const dataInicio = new Date(document.getElementById('id_data_inicio').value);
+        const dataFim = new Date(document.getElementById('id_data_fim').value);
+
+        if (dataFim <= dataInicio) {
+            e.preventDefault();
+            alert('A data de término deve ser posterior à data de início.');
+            return false;
+        }
+
+        // Validar duração máxima (12 horas)
+        const duracao = (dataFim - dataInicio) / (1000 * 60 * 60); // em horas
+        if (duracao > 12) {
+            e.preventDefault();
+            alert('O evento não pode durar mais de 12 horas.');
+            return false;
+        }
+    });
+});
@@ -0,0 +1,66 @@
+// Scripts de templates/academico/materia_form_completo.html
+
+document.addEventListener('DOMContentLoaded', function() {
+    // Funcionalidade para adicionar novos horários
+    const addButton = document.getElementById('add-horario');
+    const container = document.getElementById('horarios-container');
+    const totalForms = document.getElementById('id_horarios_aula-TOTAL_FORMS');
+    let formIndex = parseInt(totalForms.value);
+
+    addButton.addEventListener('click', function() {
+        // Clonar o último formulário
+        const lastForm = container.querySelector('.horario-form:last-child');
+        const newForm = lastForm.cloneNode(true);
+
+        // Atualizar indices do formulário
+        const regex = /horarios_aula-\d+-/g;
+        newForm.innerHTML = newForm.innerHTML.replace(regex, `horarios_aula-${formIndex}-`);
+
+        // Limpar valores dos campos
+        newForm.querySelectorAll('input, select, textarea').forEach(field => {
+            if (field.type !== 'hidden') {
+                field.value = '';
+            }
+        });
+
+        // Atualizar o número do horário
+        const numberElement = newForm.querySelector('.horario-number');
+        const headerElement = newForm.querySelector('.horario-header span');
+        numberElement.textContent = formIndex + 1;
+        headerElement.textContent = `Horário ${formIndex + 1}`;
+
+        // Atualizar o data-form-index
+        newForm.setAttribute('data-form-index', formIndex);
+
+        // Adicionar ao container
+        container.appendChild(newForm);
+
+        // Atualizar contador
+        formIndex++;
+        totalForms.value = formIndex;
+    });
+
+    // Validação em tempo real para horários
+    document.addEventListener('change', function(e) {
+        if (e.target.type === 'time') {
+            const form = e.target.closest('.horario-form');
+            const horaInicio = form.querySelector('[name$="-hora_inicio"]');
+            const horaFim = form.querySelector('[name$="-hora_fim"]');
+
+            if (horaInicio.value && horaFim.value) {
+                if (horaInicio.value >= horaFim.value) {
+                    horaFim.setCustomValidity('A hora de fim deve ser posterior à hora de início');
+                    horaFim.reportValidity();
+                } else {
+                    horaFim.setCustomValidity('');
+                }
+            }
+        }
+    });
+
+    // Auto-focus no primeiro campo
+    const firstField = document.querySelector('form input[type="text"], form select');
+    if (firstField) {
+        firstField.focus();
+    }
+});
@@ -0,0 +1,124 @@
+// Scripts de templates/academico/todolist_geral.html
+
+document.addEventListener('DOMContentLoaded', function() {
+    // Animação de fade-in para as tarefas
+    const tarefaCards = document.querySelectorAll('.tarefa-card');
+    tarefaCards.forEach((card, index) => {
+        card.style.opacity = '0';
+        card.style.transform = 'translateY(20px)';
+
+        setTimeout(() => {
+            card.style.transition = 'all 0.4s ease-out';
+            card.style.opacity = '1';
+            card.style.transform = 'translateY(0)';
+        }, index * 50);
+    });
+
+    // Os filtros recarregam só a lista (tarefas_json), via setupListaIncremental do main.js
+});
+
+// Ações em lote: uma requisição para todas as tarefas selecionadas
+document.addEventListener('DOMContentLoaded', function() {
+    const painel = document.getElementById('acoesLote');
+    if (!painel) return;
+    const lista = document.getElementById('listaTarefas');
+    const caixas = () => Array.from(lista.querySelectorAll('.selecionar-tarefa'));
+    const selecionadas = () => caixas().filter(caixa => caixa.checked).map(caixa => Number(caixa.value));
+    const botoes = painel.querySelectorAll('[data-operacao]');
+
+    function atualizarSelecao() {
+        const total = selecionadas().length;
+        document.getElementById('totalSelecionadas').textContent = `${total} selecionada(s)`;
+        botoes.forEach(botao => { botao.disabled = total === 0; });
+    }
+
+    document.getElementById('selecionarTodas').addEventListener('change', function() {
+        caixas().forEach(caixa => { caixa.checked = this.checked; });
+        atualizarSelecao();
+    });
+    // Delegado: os cards das páginas seguintes chegam depois, pelo JSON
+    lista.addEventListener('change', function(e) {
+        if (e.target.matches('.selecionar-tarefa')) atualizarSelecao();
+    });
+    lista.addEventListener('lista:atualizada', function(e) {
+        if (e.detail.reiniciada) document.getElementById('selecionarTodas').checked = false;
+        painel.classList.toggle('d-none', lista.children.length === 0);
+        atualizarSelecao();
+    });
+
+    botoes.forEach(botao => botao.addEventListener('click', function() {
+        const operacao = this.dataset.operacao;
+        const ids = selecionadas();
+        const corpo = {ids: ids, operacao: operacao};
+        if (operacao === 'reagendar') {
+            corpo.prazo = document.getElementById('novoPrazo').value;
+            if (!corpo.prazo) {
+                AssistenteEstudos.showToast('Escolha o novo prazo', 'warning');
+                return;
+            }
+        }
+        if (operacao === 'excluir' && !confirm(`Excluir ${ids.length} tarefa(s)?`)) return;
+
+        fetch(painel.dataset.url, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': painel.querySelector('[name=csrfmiddlewaretoken]').value,
+                'X-Requested-With': 'XMLHttpRequest'
+            },
+            body: JSON.stringify(corpo)
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (!data.sucesso) {
+                AssistenteEstudos.showToast(data.erro || 'Erro ao atualizar tarefas', 'error');
+                return;
+            }
+            AssistenteEstudos.showToast(data.mensagem, 'success');
+            Object.entries(data.stats).forEach(([chave, valor]) => {
+                const campo = document.querySelector(`[data-stat="${chave}"]`);
+                if (campo) campo.textContent = valor;
+            });
+            // Tarefas que saíram do filtro atual somem da lista; nos demais casos recarrega
+            const status = document.getElementById('status').value;
+            const saiu = operacao === 'excluir'
+                || (operacao === 'concluir' && status === 'pendente')
+                || (operacao === 'reabrir' && status === 'concluida');
+            if (!saiu) {
+                location.reload();
+                return;
+            }
+            ids.forEach(id => lista.querySelector(`[data-tarefa="${id}"]`)?.remove());
+            document.getElementById('selecionarTodas').checked = false;
+            atualizarSelecao();
+        })
+        .catch(error => {
+            console.error('Erro:', error);
+            AssistenteEstudos.showToast('Erro ao processar solicitação', 'error');
+        });
+    }));
+});
+
+// Função para toggle do status da tarefa
+function toggleTarefa(tarefaId) {
+    fetch(`/academico/tarefas/${tarefaId}/toggle/`, {
+        method: 'POST',
+        headers: {
+            'X-CSRFToken': document.querySelector('[name=csrfmiddlewaretoken]').value,
+            'X-Requested-With': 'XMLHttpRequest'
+        }
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.sucesso) {
+            // Recarregar a página para atualizar a visualização
+            location.reload();
+        } else {
+            AssistenteEstudos.showToast('Erro ao atualizar tarefa', 'error');
+        }
+    })
+    .catch(error => {
+        console.error('Erro:', error);
+        AssistenteEstudos.showToast('Erro ao processar solicitação', 'error');
+    });
+}
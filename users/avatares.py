@@ -0,0 +1,158 @@
+"""
+Processamento dos avatares: validação, reencode e variantes redimensionadas.
+
+No upload (sinal pre_save de CustomUser) a imagem é validada, girada
+conforme o EXIF, reduzida a AVATAR_MAX_DIMENSION e regravada em JPEG sem
+metadados, com o nome derivado do conteúdo. As variantes quadradas de
+AVATAR_SIZES, em WebP e JPEG (para navegadores sem WebP), são geradas
+depois pelo worker (users.tarefas_assincronas.gerar_variantes_avatar) em
+avatars/variantes/<usuário>/<hash>-<tamanho>.<ext> e anotadas em
+CustomUser.avatar_variantes:
+
+    {"32": {"webp": "avatars/variantes/7/3fa1c2d4e5b6a7f8-32.webp",
+            "jpg": "avatars/variantes/7/9c0d1e2f3a4b5c6d-32.jpg"}, ...}
+
+Como o nome muda junto com o conteúdo, as variantes podem ser servidas
+com cache longo e `immutable` (pelo servidor web; com DEBUG, por
+users.views.variante_avatar). Nos templates, a tag {% avatar usuario 32 %}
+escolhe a variante (users.templatetags).
+"""
+
+import hashlib
+import io
+import posixpath
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils.translation import gettext_lazy as _
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+FORMATOS_ACEITOS = {'JPEG', 'PNG', 'WEBP', 'GIF'}
+
+# Extensão -> (formato do Pillow, opções de gravação); a ordem é a de preferência
+FORMATOS_VARIANTES = {
+    'webp': ('WEBP', {'quality': 80, 'method': 6}),
+    'jpg': ('JPEG', {'quality': 85, 'optimize': True, 'progressive': True}),
+}
+
+DIRETORIO_VARIANTES = 'avatars/variantes'
+
+
+def _hash(conteudo):
+    return hashlib.sha256(conteudo).hexdigest()[:16]
+
+
+def _abrir(arquivo):
+    arquivo.seek(0)
+    imagem = Image.open(arquivo)
+    imagem.load()
+    return imagem
+
+
+def validar_avatar(arquivo):
+    """Validador do campo avatar: tamanho do arquivo, formato e dimensões."""
+    if arquivo.size > settings.AVATAR_MAX_UPLOAD_SIZE:
+        raise ValidationError(
+            _('O avatar deve ter no máximo %(limite)d MB.'),
+            params={'limite': settings.AVATAR_MAX_UPLOAD_SIZE // (1024 * 1024)},
+            code='avatar_grande',
+        )
+    try:
+        arquivo.seek(0)
+        imagem = Image.open(arquivo)
+        formato, (largura, altura) = imagem.format, imagem.size
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+        raise ValidationError(_('Envie uma imagem válida.'), code='avatar_invalido')
+    finally:
+        arquivo.seek(0)
+    if formato not in FORMATOS_ACEITOS:
+        raise ValidationError(
+            _('Formato não aceito: use JPEG, PNG, WebP ou GIF.'), code='avatar_formato',
+        )
+    if largura * altura > settings.AVATAR_MAX_PIXELS:
+        raise ValidationError(_('A imagem tem dimensões grandes demais.'), code='avatar_dimensoes')
+
+
+def _rgb(imagem):
+    """Imagem em RGB, com a transparência sobre fundo branco."""
+    imagem = ImageOps.exif_transpose(imagem)
+    if imagem.mode in ('RGBA', 'LA', 'P'):
+        imagem = imagem.convert('RGBA')
+        fundo = Image.new('RGB', imagem.size, (255, 255, 255))
+        fundo.paste(imagem, mask=imagem.getchannel('A'))
+        return fundo
+    return imagem.convert('RGB')
+
+
+def _codificar(imagem, formato, **opcoes):
+    saida = io.BytesIO()
+    imagem.save(saida, formato, **opcoes)
+    return saida.getvalue()
+
+
+def reencodar(arquivo):
+    """
+    Regrava o upload como JPEG de no máximo AVATAR_MAX_DIMENSION px, sem
+    EXIF (que pode trazer localização) e com nome pelo hash do conteúdo.
+    """
+    imagem = _rgb(_abrir(arquivo))
+    limite = settings.AVATAR_MAX_DIMENSION
+    imagem.thumbnail((limite, limite), Image.LANCZOS)
+    conteudo = _codificar(imagem, 'JPEG', quality=90, optimize=True)
+    return ContentFile(conteudo, name=f'{_hash(conteudo)}.jpg')
+
+
+def diretorio_variantes(usuario_id):
+    return f'{DIRETORIO_VARIANTES}/{usuario_id}'
+
+
+def gerar_variantes(usuario):
+    """
+    Gera as variantes do avatar atual de `usuario` e retorna o dicionário
+    a gravar em avatar_variantes. Arquivos já existentes (mesmo hash) são
+    reaproveitados, então repetir a geração não regrava nada.
+    """
+    with usuario.avatar.open('rb') as arquivo:
+        original = _rgb(_abrir(arquivo))
+
+    diretorio = diretorio_variantes(usuario.pk)
+    variantes = {}
+    for tamanho in sorted(settings.AVATAR_SIZES):
+        lado = min(tamanho, *original.size)
+        quadrada = ImageOps.fit(original, (lado, lado), Image.LANCZOS)
+        variantes[str(tamanho)] = {}
+        for extensao, (formato, opcoes) in FORMATOS_VARIANTES.items():
+            conteudo = _codificar(quadrada, formato, **opcoes)
+            nome = f'{diretorio}/{_hash(conteudo)}-{tamanho}.{extensao}'
+            if not default_storage.exists(nome):
+                default_storage.save(nome, ContentFile(conteudo))
+            variantes[str(tamanho)][extensao] = nome
+    return variantes
+
+
+def remover_variantes_antigas(usuario_id, variantes):
+    """Apaga do diretório do usuário as variantes que não estão em `variantes`."""
+    diretorio = diretorio_variantes(usuario_id)
+    manter = {nome for formatos in variantes.values() for nome in formatos.values()}
+    try:
+        _, arquivos = default_storage.listdir(diretorio)
+    except FileNotFoundError:
+        return 0
+    removidos = 0
+    for arquivo in arquivos:
+        nome = posixpath.join(diretorio, arquivo)
+        if nome not in manter:
+            default_storage.delete(nome)
+            removidos += 1
+    return removidos
+
+
+def escolher(variantes, tamanho):
+    """Menor variante com lado >= `tamanho` (ou a maior, se nenhuma chega lá)."""
+    if not variantes:
+        return None
+    tamanhos = sorted(int(chave) for chave in variantes)
+    escolhido = next((t for t in tamanhos if t >= tamanho), tamanhos[-1])
+    return variantes[str(escolhido)]
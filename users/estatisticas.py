@@ -0,0 +1,159 @@
+"""
+Contadores do PerfilUsuario (matérias, eventos e tarefas concluídas)
+mantidos de forma incremental.
+
+Os sinais de users.signals somam ou subtraem das colunas do perfil com
+um UPDATE atômico (campo = campo + n), sem ler o perfil nem contar as
+tabelas. Operações que disparam muitos sinais de uma vez (replanejamento,
+operações em lote nas tarefas) rodam dentro de em_lote(), que acumula os
+ajustes e grava um UPDATE por usuário no fim do bloco. Nas exclusões
+(inclusive em cascata) os sinais usam ajustar_na_exclusao(), que soma os
+ajustes da mesma exclusão e grava um UPDATE por usuário no commit dela,
+onde quer que a exclusão tenha começado (view, admin, queryset). Gravações com
+bulk_create/update(), que não disparam sinais, chamam ajustar() ou
+ajustar_por_usuario() diretamente.
+
+recalcular() refaz todos os contadores com três agregações agrupadas
+(comando reconciliar_estatisticas), para corrigir desvios como cargas
+feitas fora da aplicação.
+"""
+
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models import Count, F
+
+from .models import PerfilUsuario
+
+CAMPOS = ('total_materias', 'total_eventos', 'total_tarefas_concluidas')
+
+# Ajustes pendentes de uma exclusão, guardados no `origin` dela
+PENDENTES_EXCLUSAO = '_estatisticas_exclusao'
+
+_local = threading.local()
+
+
+def _gravar(usuario_id, deltas):
+    valores = {campo: F(campo) + valor for campo, valor in deltas.items() if valor}
+    if usuario_id is None or not valores:
+        return 0
+    return PerfilUsuario.objects.filter(usuario_id=usuario_id).update(**valores)
+
+
+def ajustar(usuario_id, **deltas):
+    """Soma `deltas` (ex.: total_eventos=-1) aos contadores do perfil do usuário."""
+    pendentes = getattr(_local, 'pendentes', None)
+    if pendentes is None:
+        return _gravar(usuario_id, deltas)
+    pendentes[usuario_id].update(deltas)
+    return 0
+
+
+def ajustar_por_usuario(campo, usuario_ids, sinal=1):
+    """Soma ao `campo` de cada usuário quantas vezes ele aparece em `usuario_ids`."""
+    for usuario_id, quantidade in Counter(usuario_ids).items():
+        ajustar(usuario_id, **{campo: sinal * quantidade})
+
+
+def mover(campo, antes, depois):
+    """Tira 1 do usuário `antes` e soma 1 ao `depois` (None = nenhum)."""
+    if antes == depois:
+        return
+    if antes is not None:
+        ajustar(antes, **{campo: -1})
+    if depois is not None:
+        ajustar(depois, **{campo: 1})
+
+
+def ajustar_concluidas(tarefas, sinal):
+    """
+    Para update() de status, que não dispara sinais: soma `sinal` (+1 ao
+    concluir, -1 ao reabrir) por tarefa de `tarefas` no contador do dono.
+    Chamar antes do update, com o queryset das tarefas que mudam de estado.
+    """
+    por_usuario = tarefas.order_by().values('usuario').annotate(total=Count('pk')).values_list('usuario', 'total')
+    for usuario_id, total in por_usuario:
+        ajustar(usuario_id, total_tarefas_concluidas=sinal * total)
+
+
+def ajustar_na_exclusao(origin, usuario_id, **deltas):
+    """
+    ajustar() para os sinais post_delete. Os ajustes com o mesmo `origin`
+    (a instância ou o queryset que começou a exclusão, o mesmo para todas
+    as linhas removidas em cascata) são somados e gravados no commit da
+    exclusão, um UPDATE por usuário; se ela for desfeita, nada é gravado.
+    """
+    if origin is None or getattr(_local, 'pendentes', None) is not None or not hasattr(origin, '__dict__'):
+        return ajustar(usuario_id, **deltas)
+    pendentes = origin.__dict__.get(PENDENTES_EXCLUSAO)
+    if pendentes is not None:
+        pendentes[usuario_id].update(deltas)
+        return 0
+    pendentes = origin.__dict__[PENDENTES_EXCLUSAO] = defaultdict(Counter)
+    pendentes[usuario_id].update(deltas)
+
+    def gravar():
+        for usuario, valores in origin.__dict__.pop(PENDENTES_EXCLUSAO).items():
+            _gravar(usuario, valores)
+
+    transaction.on_commit(gravar)
+    return 0
+
+
+@contextmanager
+def em_lote():
+    """Acumula os ajustes feitos no bloco e grava um UPDATE por usuário ao sair."""
+    if getattr(_local, 'pendentes', None) is not None:
+        # Bloco aninhado: o externo grava
+        yield
+        return
+    _local.pendentes = defaultdict(Counter)
+    try:
+        yield
+        pendentes = _local.pendentes
+    finally:
+        _local.pendentes = None
+    for usuario_id, deltas in pendentes.items():
+        _gravar(usuario_id, deltas)
+
+
+def _contagens(consulta, campo_usuario, usuarios):
+    if usuarios is not None:
+        consulta = consulta.filter(**{f'{campo_usuario}__in': usuarios})
+    return dict(
+        consulta.order_by().values(campo_usuario).annotate(total=Count('pk'))
+        .values_list(campo_usuario, 'total')
+    )
+
+
+def recalcular(usuarios=None, lote=1000):
+    """
+    Recalcula os contadores de todos os perfis (ou dos ids em `usuarios`)
+    com uma agregação agrupada por tabela e grava só os que mudaram.
+    Retorna (perfis verificados, perfis corrigidos).
+    """
+    from academico.models import Materia, Tarefa
+    from calendario.models import EventoCalendario
+
+    contagens = (
+        _contagens(Materia.objects.all(), 'semestre__usuario', usuarios),
+        _contagens(EventoCalendario.objects.all(), 'usuario', usuarios),
+        _contagens(Tarefa.objects.filter(status='CONCLUIDA'), 'usuario', usuarios),
+    )
+
+    perfis = PerfilUsuario.objects.only('pk', 'usuario_id', *CAMPOS).order_by('pk')
+    if usuarios is not None:
+        perfis = perfis.filter(usuario_id__in=usuarios)
+
+    verificados, corrigidos = 0, []
+    for perfil in perfis.iterator(chunk_size=lote):
+        verificados += 1
+        valores = [contagem.get(perfil.usuario_id, 0) for contagem in contagens]
+        if [getattr(perfil, campo) for campo in CAMPOS] != valores:
+            for campo, valor in zip(CAMPOS, valores):
+                setattr(perfil, campo, valor)
+            corrigidos.append(perfil)
+    PerfilUsuario.objects.bulk_update(corrigidos, CAMPOS, batch_size=lote)
+    return verificados, len(corrigidos)
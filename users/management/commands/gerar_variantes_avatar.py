@@ -0,0 +1,38 @@
+"""
+Management command que enfileira a geração das variantes de avatar
+(users.avatares) dos usuários que ainda não as têm, como os avatares
+enviados antes do pipeline ou depois de mudar AVATAR_SIZES.
+
+Exemplos:
+    python manage.py gerar_variantes_avatar
+    python manage.py gerar_variantes_avatar --todos   # regera todas
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from users.tarefas_assincronas import gerar_variantes_avatar
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Enfileira a geração das variantes de avatar que faltam'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--todos', action='store_true', help='Inclui usuários que já têm variantes')
+
+    def handle(self, *args, **options):
+        tamanhos = {str(tamanho) for tamanho in settings.AVATAR_SIZES}
+        usuarios = User.objects.exclude(avatar='').exclude(avatar__isnull=True)
+        pendentes = [
+            usuario_id
+            for usuario_id, variantes in usuarios.values_list('pk', 'avatar_variantes').iterator()
+            if options['todos'] or set(variantes or {}) != tamanhos
+        ]
+        gerar_variantes_avatar.enfileirar_lote((usuario_id,) for usuario_id in pendentes)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(pendentes)} avatar(es) enfileirado(s) na fila imagens.'
+        ))
@@ -0,0 +1,37 @@
+"""
+Management command que recalcula os contadores do PerfilUsuario
+(total_materias, total_eventos, total_tarefas_concluidas).
+
+Os contadores são mantidos pelos sinais (users.estatisticas); este
+comando corrige desvios de cargas feitas fora da aplicação, com uma
+agregação agrupada por tabela para todos os usuários de uma vez.
+
+Exemplos:
+    python manage.py reconciliar_estatisticas
+    python manage.py reconciliar_estatisticas --usuario 12 --usuario 15
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from users.estatisticas import recalcular
+
+
+class Command(BaseCommand):
+    help = 'Recalcula os contadores de matérias, eventos e tarefas concluídas dos perfis'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--usuario', type=int, action='append', help='Id do usuário (repetível; padrão: todos)')
+        parser.add_argument('--lote', type=int, default=1000, help='Perfis por lote de leitura/gravação')
+
+    def handle(self, *args, **options):
+        inicio = time.perf_counter()
+        with transaction.atomic():
+            verificados, corrigidos = recalcular(usuarios=options['usuario'], lote=options['lote'])
+        duracao = time.perf_counter() - inicio
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{verificados} perfil(is) verificado(s), {corrigidos} corrigido(s) em {duracao:.2f}s.'
+        ))
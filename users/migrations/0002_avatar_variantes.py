@@ -0,0 +1,24 @@
+# Generated by Django 5.0.14 on 2026-10-19 04:02
+
+import users.avatares
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='avatar_variantes',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Variantes do Avatar'),
+        ),
+        migrations.AlterField(
+            model_name='customuser',
+            name='avatar',
+            field=models.ImageField(blank=True, null=True, upload_to='avatars/%Y/%m/', validators=[users.avatares.validar_avatar], verbose_name='Avatar'),
+        ),
+    ]
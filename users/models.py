@@ -2,6 +2,8 @@ from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from .avatares import validar_avatar
+
 class CustomUser(AbstractUser):
     """Modelo de usuário personalizado para o sistema."""
     
@@ -14,7 +16,15 @@ class CustomUser(AbstractUser):
         _('Avatar'),
         upload_to='avatars/%Y/%m/',
         null=True,
-        blank=True
+        blank=True,
+        validators=[validar_avatar]
+    )
+    # Variantes redimensionadas do avatar (users.avatares), geradas pelo worker
+    avatar_variantes = models.JSONField(
+        _('Variantes do Avatar'),
+        default=dict,
+        blank=True,
+        editable=False
     )
     
     # Configurações de preferências
@@ -100,24 +110,17 @@ class PerfilUsuario(models.Model):
         return f"Perfil de {self.usuario.get_full_name()}"
     
     def atualizar_estatisticas(self):
-        """Atualiza as estatísticas do perfil."""
-        from academico.models import Materia, Tarefa
-        from calendario.models import EventoCalendario
-        
-        self.total_materias = Materia.objects.filter(
-            semestre__usuario=self.usuario
-        ).count()
-        
-        self.total_eventos = EventoCalendario.objects.filter(
-            usuario=self.usuario
-        ).count()
+        """
+        Recalcula as estatísticas do perfil a partir das tabelas.
         
-        self.total_tarefas_concluidas = Tarefa.objects.filter(
-            usuario=self.usuario,
-            status='CONCLUIDA'
-        ).count()
+        No dia a dia os contadores são mantidos pelos sinais
+        (users.estatisticas); isto serve para perfis recém-criados e
+        correções pontuais.
+        """
+        from .estatisticas import CAMPOS, recalcular
         
-        self.save(update_fields=['total_materias', 'total_eventos', 'total_tarefas_concluidas'])
+        recalcular(usuarios=[self.usuario_id])
+        self.refresh_from_db(fields=CAMPOS)
 
 class Semestre(models.Model):
     # ...existing code...
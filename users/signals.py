@@ -0,0 +1,129 @@
+"""
+Sinais do app users: contadores do PerfilUsuario (ver users.estatisticas)
+e processamento do avatar enviado (ver users.avatares).
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from academico.donos import dono_semestre
+from academico.models import Materia, Tarefa
+from calendario.models import EventoCalendario
+from . import avatares
+from .estatisticas import ajustar, ajustar_na_exclusao, mover
+from .models import CustomUser, PerfilUsuario
+from .tarefas_assincronas import gerar_variantes_avatar
+
+# Estado gravado antes do save, para comparar no post_save
+ANTERIOR = '_estatisticas_anterior'
+AVATAR_ALTERADO = '_avatar_alterado'
+
+
+# ------------------------------------------------------------------- avatar
+
+@receiver(pre_save, sender=CustomUser)
+def avatar_antes(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Regrava o avatar recém-enviado; as variantes antigas deixam de valer."""
+    if raw or (update_fields is not None and 'avatar' not in update_fields):
+        return
+    arquivo = instance.avatar
+    if arquivo and not arquivo._committed:
+        instance.avatar = avatares.reencodar(arquivo)
+    elif arquivo or not instance.avatar_variantes:
+        return
+    instance.avatar_variantes = {}
+    instance.__dict__[AVATAR_ALTERADO] = True
+
+
+@receiver(post_save, sender=CustomUser)
+def avatar_salvo(sender, instance, raw=False, **kwargs):
+    if instance.__dict__.pop(AVATAR_ALTERADO, False):
+        gerar_variantes_avatar.enfileirar(instance.pk)
+
+
+@receiver(post_save, sender=PerfilUsuario)
+def perfil_criado(sender, instance, created, raw=False, **kwargs):
+    """Perfil novo começa com as contagens atuais do usuário."""
+    if created and not raw:
+        instance.atualizar_estatisticas()
+
+
+# ------------------------------------------------------------------ matérias
+
+@receiver(pre_save, sender=Materia)
+def materia_antes(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Só interessa a troca de semestre (que pode trocar o dono)
+    if raw or instance.pk is None or (update_fields is not None and 'semestre' not in update_fields):
+        return
+    setattr(instance, ANTERIOR, Materia.objects.filter(pk=instance.pk).values_list(
+        'semestre_id', 'semestre__usuario_id'
+    ).first())
+
+
+@receiver(post_save, sender=Materia)
+def materia_salva(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    anterior = instance.__dict__.pop(ANTERIOR, None)
+    if created or anterior is None:
+        if created:
+            ajustar(instance.semestre.usuario_id, total_materias=1)
+        return
+    semestre_id, dono = anterior
+    if semestre_id != instance.semestre_id:
+        mover('total_materias', dono, instance.semestre.usuario_id)
+
+
+@receiver(post_delete, sender=Materia)
+def materia_removida(sender, instance, origin=None, **kwargs):
+    # Na cascata do semestre/usuário o dono vem do origin, sem consulta
+    ajustar_na_exclusao(origin, dono_semestre(instance.semestre_id, origin), total_materias=-1)
+
+
+# ------------------------------------------------------------------- eventos
+
+@receiver(post_save, sender=EventoCalendario)
+def evento_salvo(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        ajustar(instance.usuario_id, total_eventos=1)
+
+
+@receiver(post_delete, sender=EventoCalendario)
+def evento_removido(sender, instance, origin=None, **kwargs):
+    ajustar_na_exclusao(origin, instance.usuario_id, total_eventos=-1)
+
+
+# ------------------------------------------------------------------- tarefas
+
+def _concluida_por(status, usuario_id):
+    """Usuário em cujo contador a tarefa entra (None se não concluída)."""
+    return usuario_id if status == 'CONCLUIDA' else None
+
+
+@receiver(pre_save, sender=Tarefa)
+def tarefa_antes(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and not {'status', 'usuario'} & set(update_fields):
+        return
+    setattr(instance, ANTERIOR, Tarefa.objects.filter(pk=instance.pk).values_list(
+        'status', 'usuario_id'
+    ).first())
+
+
+@receiver(post_save, sender=Tarefa)
+def tarefa_salva(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if ANTERIOR not in instance.__dict__ and not created:
+        return
+    anterior = instance.__dict__.pop(ANTERIOR, None)
+    antes = _concluida_por(*anterior) if anterior and not created else None
+    mover('total_tarefas_concluidas', antes, _concluida_por(instance.status, instance.usuario_id))
+
+
+@receiver(post_delete, sender=Tarefa)
+def tarefa_removida(sender, instance, origin=None, **kwargs):
+    dono = _concluida_por(instance.status, instance.usuario_id)
+    if dono is not None:
+        ajustar_na_exclusao(origin, dono, total_tarefas_concluidas=-1)
@@ -0,0 +1,30 @@
+"""
+Tarefas em segundo plano do app users (core.fila).
+"""
+
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+
+from core.autenticacao import invalidar_usuario_cache
+from core.fila import tarefa_assincrona
+from . import avatares
+
+User = get_user_model()
+
+
+@tarefa_assincrona(fila='imagens')
+def gerar_variantes_avatar(usuario_id):
+    """Gera as variantes do avatar atual e apaga as do avatar anterior."""
+    usuario = User.objects.filter(pk=usuario_id).only('pk', 'avatar', 'avatar_variantes').first()
+    if usuario is None:
+        return
+    variantes = avatares.gerar_variantes(usuario) if usuario.avatar else {}
+    if variantes != usuario.avatar_variantes:
+        # Só grava se o avatar não mudou durante a geração (o novo upload
+        # enfileira outra tarefa); update() não dispara sinais
+        mesmo_avatar = Q(avatar=usuario.avatar.name) if usuario.avatar else Q(avatar='') | Q(avatar__isnull=True)
+        gravou = User.objects.filter(mesmo_avatar, pk=usuario_id).update(avatar_variantes=variantes)
+        if not gravou:
+            return
+        invalidar_usuario_cache(usuario_id)
+    avatares.remover_variantes_antigas(usuario_id, variantes)
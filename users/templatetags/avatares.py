@@ -0,0 +1,27 @@
+from django import template
+from django.core.files.storage import default_storage
+
+from users.avatares import escolher
+
+register = template.Library()
+
+
+def _urls(variantes, tamanho):
+    """{'webp': (url 1x, url 2x ou None), 'jpg': (...)} para `tamanho` px."""
+    uma, dupla = escolher(variantes, tamanho), escolher(variantes, tamanho * 2)
+    return {
+        extensao: (default_storage.url(nome), default_storage.url(dupla[extensao]) if dupla != uma else None)
+        for extensao, nome in uma.items()
+    }
+
+
+@register.inclusion_tag('users/avatar.html')
+def avatar(usuario, tamanho=32, classe=''):
+    """Avatar de `tamanho` px pela menor variante que serve (e a de 2x para telas densas)"""
+    contexto = {'usuario': usuario, 'tamanho': tamanho, 'classe': classe}
+    if usuario.avatar_variantes:
+        contexto['variantes'] = _urls(usuario.avatar_variantes, tamanho)
+    elif usuario.avatar:
+        # Variantes ainda na fila: o original já regravado, no tamanho pedido
+        contexto['original'] = usuario.avatar.url
+    return contexto
@@ -0,0 +1,188 @@
+import io
+import tempfile
+from datetime import date, datetime, timedelta
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+
+from academico.models import Materia, Semestre, Tarefa
+from calendario.models import EventoCalendario
+from . import avatares
+from .estatisticas import CAMPOS, recalcular
+from .models import CustomUser, PerfilUsuario
+
+INICIO = datetime(2026, 10, 20, 10, tzinfo=ZoneInfo('America/Sao_Paulo'))
+
+
+class ContadoresPerfilTests(TestCase):
+    """Contadores do perfil mantidos pelos sinais, sem recontar as tabelas."""
+
+    def setUp(self):
+        self.usuario = CustomUser.objects.create_user('ana', 'ana@exemplo.com', 'senha')
+        self.perfil = PerfilUsuario.objects.create(usuario=self.usuario)
+
+    def _semestre(self, materias, eventos_por_materia=1):
+        semestre = Semestre.objects.create(
+            usuario=self.usuario, nome='2026/1', ano=2026, periodo='1',
+            data_inicio=date(2026, 2, 1), data_fim=date(2026, 6, 30),
+        )
+        for i in range(materias):
+            materia = Materia.objects.create(semestre=semestre, nome=f'Matéria {i}', slug=f'materia-{semestre.pk}-{i}')
+            Tarefa.objects.create(materia=materia, usuario=self.usuario, titulo='Lista', status='CONCLUIDA')
+            Tarefa.objects.create(materia=materia, usuario=self.usuario, titulo='Leitura')
+            for _ in range(eventos_por_materia):
+                EventoCalendario.objects.create(
+                    usuario=self.usuario, materia=materia, titulo='Aula extra',
+                    data_inicio=INICIO, data_fim=INICIO + timedelta(hours=1),
+                )
+        return semestre
+
+    def _contadores(self):
+        self.perfil.refresh_from_db(fields=CAMPOS)
+        return [getattr(self.perfil, campo) for campo in CAMPOS]
+
+    def test_criacao_e_mudanca_de_status(self):
+        semestre = self._semestre(2)
+        self.assertEqual(self._contadores(), [2, 2, 2])
+
+        tarefa = Tarefa.objects.filter(status='PENDENTE').first()
+        tarefa.status = 'CONCLUIDA'
+        tarefa.save()
+        self.assertEqual(self._contadores(), [2, 2, 3])
+        tarefa.status = 'PENDENTE'
+        tarefa.save(update_fields=['status'])
+        self.assertEqual(self._contadores(), [2, 2, 2])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            semestre.materias.first().delete()
+        self.assertEqual(self._contadores(), [1, 1, 1])
+
+    def test_exclusao_em_cascata_grava_um_update_por_usuario(self):
+        semestre = self._semestre(6, eventos_por_materia=3)
+        self.assertEqual(self._contadores(), [6, 18, 6])
+
+        with CaptureQueriesContext(connection) as consultas:
+            with self.captureOnCommitCallbacks(execute=True):
+                semestre.delete()
+        self.assertEqual(self._contadores(), [0, 0, 0])
+
+        sql = [consulta['sql'] for consulta in consultas]
+        self.assertEqual(len([s for s in sql if s.startswith('UPDATE "users_perfilusuario"')]), 1)
+        self.assertFalse([s for s in sql if s.startswith('SELECT "academico_semestre"."usuario_id"')])
+
+    def test_exclusao_desfeita_nao_altera_os_contadores(self):
+        semestre = self._semestre(2)
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            semestre.delete()
+        # Sem commit, nada gravado: os callbacks descartados equivalem ao rollback
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(self._contadores(), [2, 2, 2])
+
+    def test_recalcular_bate_com_os_contadores(self):
+        self._semestre(3)
+        esperado = self._contadores()
+        PerfilUsuario.objects.filter(pk=self.perfil.pk).update(total_materias=99, total_eventos=0)
+        self.assertEqual(recalcular(usuarios=[self.usuario.pk]), (1, 1))
+        self.assertEqual(self._contadores(), esperado)
+
+
+def imagem(formato='JPEG', tamanho=(40, 20), modo='RGB', cor=(200, 30, 30), **opcoes):
+    saida = io.BytesIO()
+    Image.new(modo, tamanho, cor).save(saida, formato, **opcoes)
+    return SimpleUploadedFile(f'avatar.{formato.lower()}', saida.getvalue())
+
+
+def abrir(arquivo):
+    arquivo.seek(0)
+    return Image.open(io.BytesIO(arquivo.read()))
+
+
+class ProcessamentoAvatarTests(SimpleTestCase):
+    """Validação e reencode do upload do avatar."""
+
+    def test_reencode_remove_exif_e_aplica_a_orientacao(self):
+        exif = Image.Exif()
+        exif[0x0112] = 6           # Orientation: girar 90°
+        exif[0x010E] = 'Casa da Ana'  # ImageDescription
+        resultado = abrir(avatares.reencodar(imagem(exif=exif.tobytes())))
+        self.assertEqual((resultado.format, resultado.size), ('JPEG', (20, 40)))
+        self.assertEqual(dict(resultado.getexif()), {})
+        self.assertNotIn('exif', resultado.info)
+
+    @override_settings(AVATAR_MAX_DIMENSION=16)
+    def test_reencode_reduz_ao_limite(self):
+        self.assertEqual(abrir(avatares.reencodar(imagem())).size, (16, 8))
+
+    def test_transparencia_vira_fundo_branco(self):
+        casos = {
+            'RGBA': imagem('PNG', modo='RGBA', cor=(0, 0, 0, 0)),
+            'P': imagem('PNG', modo='P', cor=0, transparency=0),
+        }
+        for modo, arquivo in casos.items():
+            with self.subTest(modo=modo):
+                resultado = abrir(avatares.reencodar(arquivo)).convert('RGB')
+                vermelho, verde, azul = resultado.getpixel((10, 10))
+                self.assertGreater(min(vermelho, verde, azul), 250)
+
+    def _codigo_erro(self, arquivo):
+        with self.assertRaises(ValidationError) as contexto:
+            avatares.validar_avatar(arquivo)
+        return contexto.exception.code
+
+    @override_settings(AVATAR_MAX_PIXELS=100)
+    def test_rejeita_dimensoes_acima_do_limite(self):
+        self.assertEqual(self._codigo_erro(imagem()), 'avatar_dimensoes')
+        avatares.validar_avatar(imagem(tamanho=(10, 10)))
+
+    def test_rejeita_bomba_de_descompressao(self):
+        # Acima do dobro de MAX_IMAGE_PIXELS o Pillow recusa abrir a imagem
+        with mock.patch.object(Image, 'MAX_IMAGE_PIXELS', 100):
+            self.assertEqual(self._codigo_erro(imagem()), 'avatar_invalido')
+
+    def test_rejeita_formato_e_conteudo_invalidos(self):
+        self.assertEqual(self._codigo_erro(imagem('BMP')), 'avatar_formato')
+        self.assertEqual(self._codigo_erro(SimpleUploadedFile('avatar.png', b'nada')), 'avatar_invalido')
+
+
+@override_settings(TASKS_EAGER=True, AVATAR_SIZES=[32, 64])
+class VariantesAvatarTests(TestCase):
+    """Variantes geradas pelo worker; as do avatar anterior são apagadas."""
+
+    def setUp(self):
+        midia = tempfile.TemporaryDirectory()
+        self.addCleanup(midia.cleanup)
+        configuracao = override_settings(MEDIA_ROOT=midia.name)
+        configuracao.enable()
+        self.addCleanup(configuracao.disable)
+        self.usuario = CustomUser.objects.create_user('ana', 'ana@exemplo.com', 'senha')
+
+    def _enviar(self, cor):
+        self.usuario.avatar = imagem(tamanho=(80, 60), cor=cor)
+        self.usuario.save()
+        self.usuario.refresh_from_db()
+        return self.usuario.avatar_variantes
+
+    def _arquivos(self):
+        diretorio = avatares.diretorio_variantes(self.usuario.pk)
+        return {f'{diretorio}/{nome}' for nome in default_storage.listdir(diretorio)[1]}
+
+    def test_troca_de_avatar_mantem_so_as_variantes_atuais(self):
+        primeiras = self._enviar((200, 30, 30))
+        self.assertEqual(sorted(primeiras), ['32', '64'])
+        self.assertEqual(set(primeiras['32']), {'webp', 'jpg'})
+
+        atuais = self._enviar((30, 30, 200))
+        esperados = {nome for formatos in atuais.values() for nome in formatos.values()}
+        self.assertEqual(len(esperados), 4)
+        self.assertEqual(self._arquivos(), esperados)
+
+        self.assertEqual(avatares.remover_variantes_antigas(self.usuario.pk, atuais), 0)
+        self.assertEqual(avatares.remover_variantes_antigas(self.usuario.pk, {}), 4)
+        self.assertEqual(self._arquivos(), set())
@@ -0,0 +1,24 @@
+"""
+Views do app users.
+"""
+
+from django.conf import settings
+from django.utils.cache import patch_cache_control
+from django.views.static import serve
+
+from .avatares import DIRETORIO_VARIANTES
+
+
+def variante_avatar(request, caminho):
+    """
+    Serve uma variante do avatar com cache longo e `immutable`: o nome traz
+    o hash do conteúdo, então um avatar novo sempre tem outra URL.
+
+    Só é roteada com DEBUG, como o resto de MEDIA_URL. Em produção quem
+    entrega os arquivos é o servidor web, que deve mandar o mesmo
+    cabeçalho para avatars/variantes/ (ex.: nginx `expires max;` com
+    `add_header Cache-Control "public, immutable";`).
+    """
+    resposta = serve(request, caminho, document_root=settings.MEDIA_ROOT / DIRETORIO_VARIANTES)
+    patch_cache_control(resposta, public=True, max_age=settings.AVATAR_CACHE_MAX_AGE, immutable=True)
+    return resposta